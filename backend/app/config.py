@@ -10,6 +10,16 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///./dashboard.db"
+    todo_change_retention_days: int = 30  # Days todo changes are kept for delta syncs
+    todo_archive_after_days: int = 30  # Days a completed todo stays live before archiving; 0 keeps them
+    todo_archive_chunk_size: int = 500  # Todos moved per archiving transaction
+    database_read_pool_size: int = 8  # Read-only connections, and threads running queries on them
+    database_write_batch_size: int = 64  # Most queued writes committed together
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"  # Durable in WAL mode short of an OS crash or power loss
+    sqlite_cache_size: int = -65536  # Page cache per connection; negative is KiB (64 MiB)
+    sqlite_mmap_size: int = 268435456  # Bytes of the database file read through mmap
+    sqlite_busy_timeout: int = 5000  # Milliseconds to wait on a lock before failing
 
     # Telegram Bot
     telegram_bot_token: str = ""
@@ -19,11 +29,25 @@ class Settings(BaseSettings):
     google_client_id: str = ""
     google_client_secret: str = ""
     google_calendar_id: str = "primary"
+    google_calendar_ids: str = ""  # Comma-separated; when set, replaces google_calendar_id
+    google_token_refresh_margin: int = 300  # Seconds before expiry to refresh the access token
+    calendar_cache_ttl: int = 30  # Seconds an event lookup is served without refetching
+    calendar_cache_stale_ttl: int = 300  # Seconds a stale lookup may be served while refreshing
+    calendar_sync_days: int = 90  # Days ahead kept in the local event store
+    calendar_time_zone: str = "UTC"  # IANA zone all-day events and naive query times are anchored to
+    calendar_executor_workers: int = 4  # Threads reserved for blocking Google calls
+    calendar_fanout_workers: int = 4  # Calendars synced concurrently per request
+    calendar_webhook_url: str = ""  # Public HTTPS URL of /api/calendar/notifications; enables push
+    calendar_watch_ttl: int = 604800  # Seconds a push channel is requested to live
+    calendar_poll_interval: int = 300  # Seconds between syncs of calendars without a push channel
+    calendar_request_timeout: float = 15.0  # Seconds before a calendar request gives up
 
     # Application
     backend_host: str = "0.0.0.0"
     backend_port: int = 8000
     frontend_url: str = "http://localhost:5173"
+    metrics_enabled: bool = False  # Serve /metrics and record request, query, Google and bot timings
+    fast_json_responses: bool = False  # Encode todo and event lists directly, skipping response-model validation
 
     @property
     def authorized_user_ids(self) -> list[int]:
@@ -32,6 +56,12 @@ class Settings(BaseSettings):
             return []
         return [int(uid.strip()) for uid in self.authorized_users.split(",") if uid.strip()]
 
+    @property
+    def calendar_ids(self) -> list[str]:
+        """Parse calendars to show, falling back to the single google_calendar_id."""
+        ids = [cid.strip() for cid in self.google_calendar_ids.split(",") if cid.strip()]
+        return ids or [self.google_calendar_id]
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
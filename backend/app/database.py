@@ -1,17 +1,91 @@
 """Database setup and session management."""
 
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from .config import get_settings
+from .services.metrics import record_query
 
 settings = get_settings()
 
-# Create engine - use check_same_thread=False for SQLite with FastAPI
-connect_args = {"check_same_thread": False} if "sqlite" in settings.database_url else {}
-engine = create_engine(settings.database_url, connect_args=connect_args)
+# Execution option that makes a connection start its transaction with
+# BEGIN IMMEDIATE, taking the write lock up front. A deferred transaction
+# that reads before writing can fail with "database is locked" on upgrade
+# without waiting out busy_timeout.
+BEGIN_IMMEDIATE = "sqlite_begin_immediate"
+
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def apply_sqlite_profile(engine: Engine, read_only: bool = False):
+    """Set the production pragmas on every new connection of an engine."""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        # Leave transaction control to the begin hook below; pysqlite's own
+        # implicit BEGIN breaks SAVEPOINT and never takes the lock early
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout = {settings.sqlite_busy_timeout}")
+        if not read_only:
+            cursor.execute(f"PRAGMA journal_mode = {settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous = {settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA cache_size = {settings.sqlite_cache_size}")
+        cursor.execute(f"PRAGMA mmap_size = {settings.sqlite_mmap_size}")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(connection):
+        immediate = connection.get_execution_options().get(BEGIN_IMMEDIATE, False)
+        connection.exec_driver_sql("BEGIN IMMEDIATE" if immediate else "BEGIN")
+
+
+def instrument_engine(engine: Engine, name: str):
+    """Record the duration of every statement run on an engine in the metrics."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(connection, cursor, statement, parameters, context, executemany):
+        context.query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(connection, cursor, statement, parameters, context, executemany):
+        record_query(name, time.perf_counter() - context.query_started)
+
+
+if _is_sqlite(settings.database_url):
+    # check_same_thread=False lets FastAPI's threadpool share pooled connections
+    engine = create_engine(settings.database_url, connect_args={"check_same_thread": False})
+    apply_sqlite_profile(engine)
+
+    if engine.url.database in (None, "", ":memory:"):
+        # Every connection to an in-memory database is a database of its own
+        read_engine = engine
+    else:
+        # WAL lets these read while the writer commits
+        read_engine = create_engine(
+            settings.database_url,
+            connect_args={"check_same_thread": False},
+            pool_size=settings.database_read_pool_size,
+        )
+        apply_sqlite_profile(read_engine, read_only=True)
+else:
+    engine = create_engine(settings.database_url)
+    read_engine = engine
+
+if settings.metrics_enabled:
+    instrument_engine(engine, "write")
+    if read_engine is not engine:
+        instrument_engine(read_engine, "read")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
 
@@ -26,5 +100,9 @@ def get_db():
 
 
 def init_db():
-    """Initialize database tables."""
+    """Initialize database tables and bring existing ones up to date."""
+    from . import models  # noqa: F401 - register every table on Base.metadata
+    from .migrations import run_migrations
+
     Base.metadata.create_all(bind=engine)
+    run_migrations(engine)
@@ -2,15 +2,23 @@
 
 import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import get_settings
 from .database import init_db
-from .routers import todos, calendar
+from .routers import todos, calendar, dashboard, stream
+from .services.archive import run_archiver
+from .services.change_log import run_compaction
+from .services.event_bus import event_bus
+from .services.executor import shutdown_executors
+from .services.google_auth import credential_manager
+from .services.metrics import CONTENT_TYPE, MetricsMiddleware, registry
 from .services.telegram_bot import telegram_bot
+from .services.write_queue import write_queue
 from .schemas import HealthResponse
 
 settings = get_settings()
@@ -22,23 +30,60 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Seconds taken by each startup phase, reported by run.py --profile-startup
+startup_timings: dict[str, float] = {}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
     logger.info("Starting Household Productivity Dashboard...")
+    start = time.perf_counter()
     init_db()
+    startup_timings["init_db"] = time.perf_counter() - start
     logger.info("Database initialized.")
 
+    # Everything below runs in the background, so the server starts
+    # answering right away; the Telegram and Google client libraries are
+    # first imported by these tasks rather than at startup
+    start = time.perf_counter()
+
+    # Deliver change events on this loop
+    event_bus.bind(asyncio.get_running_loop())
+
     # Start Telegram bot in background
     asyncio.create_task(telegram_bot.start())
 
+    # Keep the Google access token fresh
+    token_refresher = asyncio.create_task(credential_manager.run_refresher())
+
+    # Drop todo changes older than the delta sync retention window
+    change_log_compactor = asyncio.create_task(run_compaction())
+
+    # Move long-completed todos out of the live table
+    todo_archiver = asyncio.create_task(run_archiver())
+
+    # Keep push channels open, polling calendars that have none
+    calendar_watcher = asyncio.create_task(calendar.watch_manager.run())
+
+    # Rebuild the dashboard snapshot as todos and calendars change
+    dashboard_builder = asyncio.create_task(dashboard.dashboard_service.run())
+    startup_timings["start background tasks"] = time.perf_counter() - start
+
     yield
 
     # Shutdown
     logger.info("Shutting down...")
+    event_bus.close()
+    token_refresher.cancel()
+    calendar_watcher.cancel()
+    dashboard_builder.cancel()
+    change_log_compactor.cancel()
+    todo_archiver.cancel()
     await telegram_bot.stop()
+    write_queue.stop()
+    shutdown_executors()
 
 
 app = FastAPI(
@@ -61,11 +106,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+if settings.metrics_enabled:
+    # Added last so it wraps everything else, CORS preflights included
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(todos.router)
 app.include_router(calendar.router)
+app.include_router(dashboard.router)
+app.include_router(stream.router)
 
 
 @app.get("/")
@@ -81,12 +133,15 @@ async def root():
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint."""
-    from .services.google_calendar import GoogleCalendarService
-
-    calendar_service = GoogleCalendarService()
-
     return HealthResponse(
         status="healthy",
         telegram_bot=bool(settings.telegram_bot_token),
-        google_calendar=calendar_service.is_authenticated()
+        google_calendar=credential_manager.has_credentials()
     )
+
+
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Request, database, Google API and bot metrics in the Prometheus text format."""
+        return Response(content=registry.render(), media_type=CONTENT_TYPE)
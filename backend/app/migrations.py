@@ -0,0 +1,98 @@
+"""Schema migrations for databases created by earlier versions.
+
+create_all only creates missing tables, so anything added to an existing
+table (indexes, columns) needs a step here. Steps run once, in order, and
+are recorded in schema_migrations. They must also be safe on a fresh
+database, where create_all has already built the current schema.
+"""
+
+import logging
+from datetime import datetime
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn
+
+from .models import SchemaMigration, Todo
+
+logger = logging.getLogger(__name__)
+
+
+def _create_index(connection: Connection, table, name: str):
+    """Create one of a table's declared indexes if it doesn't exist yet."""
+    index = next(index for index in table.indexes if index.name == name)
+    index.create(connection, checkfirst=True)
+
+
+def _add_column(connection: Connection, table, name: str):
+    """Add one of a table's declared columns if it doesn't exist yet.
+
+    The column needs a server default if it is NOT NULL, to fill existing rows.
+    """
+    if name in {column["name"] for column in inspect(connection).get_columns(table.name)}:
+        return
+    ddl = CreateColumn(table.c[name]).compile(dialect=connection.dialect)
+    connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+
+
+def add_todo_listing_indexes(connection: Connection):
+    _create_index(connection, Todo.__table__, "ix_todos_created_at_id")
+    _create_index(connection, Todo.__table__, "ix_todos_completed_created_at_id")
+
+
+def add_todo_updated_at_index(connection: Connection):
+    _create_index(connection, Todo.__table__, "ix_todos_updated_at")
+
+
+def add_todo_version(connection: Connection):
+    _add_column(connection, Todo.__table__, "version")
+
+
+def add_todo_search(connection: Connection):
+    """Index todo titles with FTS5 and keep the index in step with triggers."""
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in (
+        # External content: the index stores tokens only and reads titles
+        # back from todos. Prefix indexes make short prefix queries cheap.
+        "CREATE VIRTUAL TABLE IF NOT EXISTS todos_fts USING fts5("
+        "title, content='todos', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER IF NOT EXISTS todos_fts_insert AFTER INSERT ON todos BEGIN "
+        "INSERT INTO todos_fts (rowid, title) VALUES (new.id, new.title); END",
+        "CREATE TRIGGER IF NOT EXISTS todos_fts_delete AFTER DELETE ON todos BEGIN "
+        "INSERT INTO todos_fts (todos_fts, rowid, title) VALUES ('delete', old.id, old.title); END",
+        "CREATE TRIGGER IF NOT EXISTS todos_fts_update AFTER UPDATE OF title ON todos BEGIN "
+        "INSERT INTO todos_fts (todos_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+        "INSERT INTO todos_fts (rowid, title) VALUES (new.id, new.title); END",
+        # Index the todos that predate the triggers
+        "INSERT INTO todos_fts (todos_fts) VALUES ('rebuild')",
+    ):
+        connection.exec_driver_sql(statement)
+
+
+# (name, step) pairs, applied in order; never rename or reorder applied steps
+MIGRATIONS = [
+    ("0001_todo_listing_indexes", add_todo_listing_indexes),
+    ("0002_todo_updated_at_index", add_todo_updated_at_index),
+    ("0003_todo_version", add_todo_version),
+    ("0004_todo_search", add_todo_search),
+]
+
+
+def run_migrations(engine: Engine):
+    """Apply every migration step that has not run yet."""
+    with engine.begin() as connection:
+        if not inspect(connection).has_table(SchemaMigration.__tablename__):
+            SchemaMigration.__table__.create(connection)
+        applied = {
+            row.name for row in connection.execute(SchemaMigration.__table__.select())
+        }
+        for name, step in MIGRATIONS:
+            if name in applied:
+                continue
+            logger.info(f"Applying migration {name}")
+            step(connection)
+            connection.execute(
+                SchemaMigration.__table__.insert().values(name=name, applied_at=datetime.utcnow())
+            )
@@ -1,7 +1,7 @@
 """SQLAlchemy database models."""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index, UniqueConstraint, column, table
 
 from .database import Base
 
@@ -10,13 +10,68 @@ class Todo(Base):
     """Todo item model."""
 
     __tablename__ = "todos"
+    __table_args__ = (
+        # Keyset paging newest first, unfiltered and by completion status
+        Index("ix_todos_created_at_id", "created_at", "id"),
+        Index("ix_todos_completed_created_at_id", "completed", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     completed = Column(Boolean, default=False)
     created_by = Column(String, default="web")  # Telegram username or "web"
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped by every write
+
+
+# FTS5 index of Todo.title, kept in step with todos by triggers. Not on
+# Base.metadata: create_all can't build virtual tables, so migration 0004
+# creates it (SQLite only). rank is FTS5's bm25 score, lower is better.
+todo_search = table(
+    "todos_fts",
+    column("rowid", Integer),
+    column("title", String),
+    column("rank"),
+)
+
+
+class TodoChangeRecord(Base):
+    """One insert, update or delete of a todo, for delta syncs.
+
+    version only ever increases, even across compaction, so clients can
+    ask for everything after the last version they saw.
+    """
+
+    __tablename__ = "todo_changes"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    version = Column(Integer, primary_key=True)
+    todo_id = Column(Integer, nullable=False, index=True)
+    op = Column(String, nullable=False)  # "insert", "update" or "delete"
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+
+class ArchivedTodo(Base):
+    """A completed todo moved out of todos by the retention job.
+
+    Keeps the todo's original ID in todo_id; SQLite may hand that ID out
+    again once the todo is gone, so the archive has keys of its own.
+    """
+
+    __tablename__ = "archived_todos"
+    __table_args__ = (
+        # Keyset paging, most recently completed first
+        Index("ix_archived_todos_completed_at_id", "completed_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    todo_id = Column(Integer, nullable=False, index=True)
+    title = Column(String, nullable=False)
+    created_by = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=False)  # The todo's last update, normally its completion
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
 
 class User(Base):
@@ -28,3 +83,88 @@ class User(Base):
     telegram_id = Column(String, unique=True, index=True)
     telegram_username = Column(String, nullable=True)
     is_authorized = Column(Boolean, default=False)
+
+
+class CalendarEventColumns:
+    """Columns of a stored calendar event, shared with the full sync staging table."""
+
+    id = Column(Integer, primary_key=True)
+    calendar_id = Column(String, nullable=False)
+    event_id = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    start = Column(DateTime, nullable=False)
+    end = Column(DateTime, nullable=False)
+    all_day = Column(Boolean, default=False)
+    location = Column(String, nullable=True)
+    description = Column(Text, nullable=True)
+    recurrence = Column(Text, nullable=True)  # RRULE/RDATE/EXDATE lines, masters only
+    time_zone = Column(String, nullable=True)  # IANA zone a series recurs in
+    recurring_event_id = Column(String, nullable=True)  # Master of a modified occurrence
+    original_start = Column(DateTime, nullable=True)  # Occurrence a modification replaces
+    cancelled = Column(Boolean, default=False)
+
+
+class CalendarEventRecord(CalendarEventColumns, Base):
+    """Locally synced Google Calendar event.
+
+    Timed events store naive UTC start/end; all-day events store naive
+    midnight dates, matching what the calendar service parses. Recurring
+    series are stored once, as a master row with its recurrence rules and
+    first occurrence, and expanded locally. Modified occurrences are stored
+    as their own rows pointing at the master; cancelled occurrences are kept
+    as tombstones so expansion can skip them.
+    """
+
+    __tablename__ = "calendar_events"
+    __table_args__ = (
+        UniqueConstraint("calendar_id", "event_id", name="uq_calendar_events_calendar_event"),
+        Index("ix_calendar_events_calendar_start", "calendar_id", "start"),
+        Index("ix_calendar_events_calendar_master", "calendar_id", "recurring_event_id"),
+    )
+
+
+class CalendarEventStagingRecord(CalendarEventColumns, Base):
+    """Events a running full sync has fetched so far.
+
+    Pages are written here as they arrive and swapped into calendar_events
+    once the last one is in, so readers never see a half-synced calendar
+    and the sync never holds every page in memory.
+    """
+
+    __tablename__ = "calendar_events_staging"
+    __table_args__ = (
+        UniqueConstraint("calendar_id", "event_id", name="uq_calendar_events_staging_calendar_event"),
+    )
+
+
+class CalendarSyncState(Base):
+    """Incremental sync bookkeeping for a Google calendar."""
+
+    __tablename__ = "calendar_sync_state"
+
+    calendar_id = Column(String, primary_key=True)
+    sync_token = Column(String, nullable=True)
+    full_synced_at = Column(DateTime, nullable=True)
+    synced_until = Column(DateTime, nullable=True)  # End of the fully synced window
+    synced_at = Column(DateTime, nullable=True)
+
+
+class CalendarWatchChannel(Base):
+    """Google Calendar push notification channel."""
+
+    __tablename__ = "calendar_watch_channels"
+
+    channel_id = Column(String, primary_key=True)
+    calendar_id = Column(String, nullable=False, index=True)
+    resource_id = Column(String, nullable=False)
+    token = Column(String, nullable=False)  # Echoed back by Google to authenticate notifications
+    expires_at = Column(DateTime, nullable=False)
+
+
+class SchemaMigration(Base):
+    """A schema migration step that has been applied."""
+
+    __tablename__ = "schema_migrations"
+
+    name = Column(String, primary_key=True)
+    applied_at = Column(DateTime, default=datetime.utcnow)
@@ -1,10 +1,29 @@
 """Google Calendar integration endpoints."""
 
-from fastapi import APIRouter, HTTPException, Request
+import asyncio
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from fastapi.responses import RedirectResponse
 
-from ..schemas import CalendarEventsResponse
+from ..schemas import (
+    CalendarEventsResponse,
+    ConflictsResponse,
+    EventConflict,
+    FreeBusyResponse,
+    TimeSlot,
+)
+from ..services.calendar_store import InvalidCursorError
+from ..services.calendar_watch import (
+    CalendarWatchManager,
+    InvalidChannelTokenError,
+    UnknownChannelError,
+)
+from ..services.executor import calendar_executor, database_executor, run_blocking
+from ..services.serialization import json_response
 from ..services.google_calendar import GoogleCalendarService
+from ..services.versioning import etag_matches, make_etag
 from ..config import get_settings
 
 router = APIRouter(prefix="/api/calendar", tags=["calendar"])
@@ -12,6 +31,35 @@ settings = get_settings()
 
 # Initialize calendar service
 calendar_service = GoogleCalendarService()
+watch_manager = CalendarWatchManager(calendar_service)
+
+
+def _not_modified(request: Request, response: Response, generation: int | None) -> Response | None:
+    """Answer 304 if the client already holds this cache generation, else tag response."""
+    if generation is None:
+        return None
+    etag = make_etag("calendar", generation)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return None
+
+
+def _events_response(response: Response, events, next_cursor: str | None = None):
+    """Wrap events, serializing them once here when fast_json_responses is on."""
+    content = CalendarEventsResponse(events=events, calendar_connected=True, next_cursor=next_cursor)
+    if settings.fast_json_responses:
+        # The events are already validated models; skip FastAPI's second pass
+        return json_response(content, response)
+    return content
+
+
+async def _run_calendar_call(func, *args):
+    """Run a blocking calendar call on the dedicated executor."""
+    return await run_blocking(
+        calendar_executor, func, *args, timeout=settings.calendar_request_timeout
+    )
 
 
 @router.get("/auth")
@@ -31,42 +79,174 @@ async def auth():
 async def callback(code: str, request: Request):
     """Handle OAuth2 callback from Google."""
     try:
-        calendar_service.handle_callback(code)
+        await _run_calendar_call(calendar_service.handle_callback, code)
         return RedirectResponse(url=f"{settings.frontend_url}?calendar_connected=true")
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out completing OAuth with Google")
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to complete OAuth: {str(e)}")
 
 
 @router.get("/events", response_model=CalendarEventsResponse)
-async def get_events(days: int = 7):
-    """Get calendar events for the next N days."""
+async def get_events(
+    request: Request,
+    response: Response,
+    days: int = Query(7, ge=1, le=3650),
+    limit: int | None = Query(None, ge=1, le=2500),
+    cursor: str | None = None,
+):
+    """Get calendar events for the next N days.
+
+    Pass limit to page through long windows; follow next_cursor from each
+    response until it is null.
+    """
     if not calendar_service.is_authenticated():
         return CalendarEventsResponse(events=[], calendar_connected=False)
 
     try:
-        events = calendar_service.get_upcoming_events(days=days)
-        return CalendarEventsResponse(events=events, calendar_connected=True)
+        if limit is None and cursor is None:
+            cached = _not_modified(request, response, calendar_service.upcoming_events_generation(days))
+            if cached is not None:
+                return cached
+            events = await _run_calendar_call(calendar_service.get_upcoming_events, days)
+            # A reload that found nothing new keeps its generation
+            cached = _not_modified(request, response, calendar_service.upcoming_events_generation(days))
+            if cached is not None:
+                return cached
+            return _events_response(response, events)
+
+        events, next_cursor = await _run_calendar_call(
+            calendar_service.get_upcoming_events_page, days, limit or 250, cursor
+        )
+        return _events_response(response, events, next_cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out fetching events from Google")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch events: {str(e)}")
 
 
 @router.get("/today", response_model=CalendarEventsResponse)
-async def get_today_events():
+async def get_today_events(request: Request, response: Response):
     """Get today's calendar events."""
     if not calendar_service.is_authenticated():
         return CalendarEventsResponse(events=[], calendar_connected=False)
 
+    cached = _not_modified(request, response, calendar_service.today_events_generation())
+    if cached is not None:
+        return cached
+    try:
+        events = await _run_calendar_call(calendar_service.get_today_events)
+        cached = _not_modified(request, response, calendar_service.today_events_generation())
+        if cached is not None:
+            return cached
+        return _events_response(response, events)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out fetching events from Google")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch events: {str(e)}")
+
+
+def _query_range(time_from: datetime, time_to: datetime) -> tuple[datetime, datetime]:
+    """Validate a from/to query range, reading naive times in the household zone."""
+    zone = ZoneInfo(settings.calendar_time_zone)
+    if time_from.tzinfo is None:
+        time_from = time_from.replace(tzinfo=zone)
+    if time_to.tzinfo is None:
+        time_to = time_to.replace(tzinfo=zone)
+    if time_to <= time_from:
+        raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+    if time_to - time_from > timedelta(days=366):
+        raise HTTPException(status_code=400, detail="Range cannot exceed 366 days")
+    return time_from.astimezone(timezone.utc), time_to.astimezone(timezone.utc)
+
+
+async def _get_index(time_from: datetime, time_to: datetime):
+    """Load the interval index for a range, mapping upstream failures to HTTP errors."""
     try:
-        events = calendar_service.get_today_events()
-        return CalendarEventsResponse(events=events, calendar_connected=True)
+        return await _run_calendar_call(calendar_service.get_event_index, time_from, time_to)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out fetching events from Google")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch events: {str(e)}")
 
 
+@router.get("/freebusy", response_model=FreeBusyResponse)
+async def get_freebusy(
+    time_from: datetime = Query(alias="from"),
+    time_to: datetime = Query(alias="to"),
+    min_minutes: int = Query(0, ge=0),
+):
+    """Get merged busy periods and free gaps between from and to."""
+    if not calendar_service.is_authenticated():
+        return FreeBusyResponse(busy=[], free=[], calendar_connected=False)
+
+    time_from, time_to = _query_range(time_from, time_to)
+    index = await _get_index(time_from, time_to)
+    return FreeBusyResponse(
+        busy=[TimeSlot(start=a, end=b) for a, b in index.busy(time_from, time_to)],
+        free=[
+            TimeSlot(start=a, end=b)
+            for a, b in index.free(time_from, time_to, timedelta(minutes=min_minutes))
+        ],
+    )
+
+
+@router.get("/overlaps", response_model=CalendarEventsResponse)
+async def get_overlaps(
+    time_from: datetime = Query(alias="from"),
+    time_to: datetime = Query(alias="to"),
+):
+    """Get events overlapping a proposed slot."""
+    if not calendar_service.is_authenticated():
+        return CalendarEventsResponse(events=[], calendar_connected=False)
+
+    time_from, time_to = _query_range(time_from, time_to)
+    index = await _get_index(time_from, time_to)
+    return CalendarEventsResponse(events=index.overlapping(time_from, time_to))
+
+
+@router.get("/conflicts", response_model=ConflictsResponse)
+async def get_conflicts(
+    time_from: datetime = Query(alias="from"),
+    time_to: datetime = Query(alias="to"),
+):
+    """Get pairs of events that overlap each other between from and to."""
+    if not calendar_service.is_authenticated():
+        return ConflictsResponse(conflicts=[], calendar_connected=False)
+
+    time_from, time_to = _query_range(time_from, time_to)
+    index = await _get_index(time_from, time_to)
+    return ConflictsResponse(
+        conflicts=[
+            EventConflict(first=a, second=b, overlap=TimeSlot(start=start, end=end))
+            for a, b, start, end in index.conflicts(time_from, time_to)
+        ]
+    )
+
+
+@router.post("/notifications", status_code=204)
+async def notifications(request: Request):
+    """Receive a Google Calendar push notification."""
+    try:
+        # Unknown channel IDs cost a database lookup; keep it off the event loop
+        await run_blocking(database_executor, watch_manager.handle_notification, request.headers)
+    except UnknownChannelError:
+        raise HTTPException(status_code=404, detail="Unknown channel")
+    except InvalidChannelTokenError:
+        raise HTTPException(status_code=403, detail="Invalid channel token")
+    return Response(status_code=204)
+
+
 @router.get("/status")
 async def calendar_status():
     """Check if Google Calendar is connected."""
     return {
         "connected": calendar_service.is_authenticated(),
-        "calendar_id": settings.google_calendar_id if calendar_service.is_authenticated() else None
+        "calendar_id": settings.google_calendar_id if calendar_service.is_authenticated() else None,
+        "calendar_ids": settings.calendar_ids if calendar_service.is_authenticated() else [],
+        "sync_errors": calendar_service.sync_errors,
+        "push_calendars": sorted(calendar_service.pushed_calendars),
+        "cache": calendar_service.cache.stats(),
     }
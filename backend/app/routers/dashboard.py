@@ -0,0 +1,26 @@
+"""Aggregated dashboard endpoint."""
+
+from fastapi import APIRouter, Request, Response
+
+from ..schemas import DashboardResponse
+from ..services.dashboard import DashboardService
+from ..services.versioning import etag_matches, make_etag
+from .calendar import calendar_service
+
+router = APIRouter(prefix="/api", tags=["dashboard"])
+
+dashboard_service = DashboardService(calendar_service)
+
+
+@router.get("/dashboard", response_model=DashboardResponse)
+async def get_dashboard(request: Request):
+    """Get todos, today's events and upcoming events in one response.
+
+    Served from a snapshot kept current in the background. Answers 304
+    when If-None-Match holds the current version.
+    """
+    body, version = await dashboard_service.get()
+    headers = {"ETag": make_etag("dashboard", version), "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,56 @@
+"""Server-Sent Events stream of dashboard changes."""
+
+import json
+
+from fastapi import APIRouter, Header
+from fastapi.responses import StreamingResponse
+
+from ..services.event_bus import event_bus
+
+router = APIRouter(prefix="/api", tags=["stream"])
+
+# Seconds between keep-alive comments on an idle stream, short enough to
+# stop proxies from timing the connection out
+KEEPALIVE_INTERVAL = 15
+
+# Milliseconds browsers wait before reconnecting a dropped stream
+RETRY_INTERVAL = 5000
+
+
+async def _event_stream(last_event_id: int | None):
+    subscription = event_bus.subscribe(last_event_id)
+    try:
+        yield f"retry: {RETRY_INTERVAL}\n\n"
+        while True:
+            try:
+                event = await subscription.next(KEEPALIVE_INTERVAL)
+            except EOFError:
+                return
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {event.id}\nevent: {event.type}\ndata: {json.dumps(event.data)}\n\n"
+    finally:
+        event_bus.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def stream(last_event_id: str | None = Header(None)):
+    """Stream todo and calendar changes as Server-Sent Events.
+
+    Events are todo.created, todo.updated and todo.deleted carrying the
+    todo, calendar.changed, dashboard.changed when the dashboard's
+    calendar part was rebuilt, and resync when the client missed events
+    and should refetch everything. Reconnecting with Last-Event-ID replays
+    recent events the client missed.
+    """
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        # Unreadable position: start with a resync
+        resume_from = 0
+    return StreamingResponse(
+        _event_stream(resume_from),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,70 +1,272 @@
 """Todo CRUD endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+import base64
+from datetime import datetime
 
-from ..database import get_db
-from ..models import Todo
-from ..schemas import TodoCreate, TodoUpdate, TodoResponse
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from ..config import get_settings
+from ..schemas import (
+    ArchivedTodoResponse,
+    TodoBatchCreate,
+    TodoBatchDelete,
+    TodoBatchResponse,
+    TodoBatchResult,
+    TodoBatchUpdate,
+    TodoChangesResponse,
+    TodoCreate,
+    TodoResponse,
+    TodoStats,
+    TodoUpdate,
+)
+from ..services.archive import get_stats, query_archive_page
+from ..services.change_log import get_changes
+from ..services.event_bus import publish_todo
+from ..services.executor import run_read
+from ..services.serialization import TODO_COLUMNS, encode_todo_rows, json_response
+from ..services.todo_repository import (
+    TodoNotFoundError,
+    TodoRepository,
+    TodoVersionConflictError,
+)
+from ..services.versioning import etag_matches, todo_changes
+from ..services.write_queue import write_queue
 
 router = APIRouter(prefix="/api/todos", tags=["todos"])
+settings = get_settings()
+
+
+def _encode(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> str:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return base64.urlsafe_b64decode(padded).decode()
+
+
+def encode_cursor(todo) -> str:
+    """Encode the keyset position just after todo as an opaque cursor."""
+    return _encode(f"{todo.created_at.isoformat()}|{todo.id}")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor into (created_at, id)."""
+    try:
+        created_at, todo_id = _decode(cursor).split("|")
+        return datetime.fromisoformat(created_at), int(todo_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def decode_search_cursor(cursor: str) -> int:
+    """Decode a search cursor into the offset of the next match."""
+    try:
+        kind, offset = _decode(cursor).split("|")
+        if kind != "search" or int(offset) < 0:
+            raise ValueError(cursor)
+        return int(offset)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _conflict(e: TodoVersionConflictError) -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail=f"Todo was changed by someone else and is now at version {e.current.version}; reload it and try again",
+    )
 
 
 @router.get("", response_model=list[TodoResponse])
-def get_todos(
+async def get_todos(
+    request: Request,
+    response: Response,
     completed: bool | None = None,
-    db: Session = Depends(get_db)
+    limit: int | None = Query(None, ge=1, le=500),
+    cursor: str | None = None,
 ):
-    """Get all todos, optionally filtered by completion status."""
-    query = db.query(Todo)
-    if completed is not None:
-        query = query.filter(Todo.completed == completed)
-    return query.order_by(Todo.created_at.desc()).all()
+    """Get todos newest first, optionally filtered by completion status.
+
+    Pass limit to page through them; the X-Next-Cursor response header holds
+    the cursor for the next page and is absent on the last one. Answers
+    304 without querying when If-None-Match matches the current version.
+    With fast_json_responses on, rows are encoded straight from the query.
+    """
+    # Read the version first, so a write racing this query can only make
+    # the ETag older than the data, never newer
+    etag = todo_changes.etag()
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+    after = decode_cursor(cursor) if cursor else None
+    if after is not None and limit is None:
+        limit = 100
+    columns = TODO_COLUMNS if settings.fast_json_responses else None
+    todos, has_more = await run_read(
+        lambda db: TodoRepository(db).query_page(completed, limit, after, columns)
+    )
+    if has_more:
+        response.headers["X-Next-Cursor"] = encode_cursor(todos[-1])
+    if columns:
+        return json_response(encode_todo_rows(todos), response)
+    return todos
 
 
 @router.post("", response_model=TodoResponse, status_code=201)
-def create_todo(todo: TodoCreate, db: Session = Depends(get_db)):
+async def create_todo(todo: TodoCreate):
     """Create a new todo."""
-    db_todo = Todo(title=todo.title, created_by=todo.created_by)
-    db.add(db_todo)
-    db.commit()
-    db.refresh(db_todo)
-    return db_todo
+    created = await write_queue.run(lambda db: TodoRepository(db).create(todo.title, todo.created_by))
+    publish_todo("created", created)
+    return created
+
+
+@router.get("/changes", response_model=TodoChangesResponse)
+async def get_todo_changes(since: int = Query(0, ge=0)):
+    """Get inserts, updates and deletes of todos after a version.
+
+    Start with since=0, which asks for a full resync: fetch /api/todos, then
+    pass the returned version as since on every later call.
+    """
+    return await run_read(lambda db: get_changes(db, since))
+
+
+@router.get("/search", response_model=list[TodoResponse])
+async def search_todos(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    completed: bool | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+):
+    """Search todo titles, best match first.
+
+    Each word of q matches title words it starts, so "gro mil" finds "Buy
+    groceries and milk". Paged like GET /api/todos, via X-Next-Cursor.
+    """
+    offset = decode_search_cursor(cursor) if cursor else 0
+    todos, has_more = await run_read(
+        lambda db: TodoRepository(db).search(q, completed, limit, offset)
+    )
+    if has_more:
+        response.headers["X-Next-Cursor"] = _encode(f"search|{offset + limit}")
+    return todos
+
+
+@router.get("/archive", response_model=list[ArchivedTodoResponse])
+async def get_archived_todos(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: str | None = None,
+):
+    """Get archived todos, most recently completed first.
+
+    Paged like GET /api/todos, via X-Next-Cursor.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    todos, has_more = await run_read(lambda db: query_archive_page(db, limit, after))
+    if has_more:
+        last = todos[-1]
+        response.headers["X-Next-Cursor"] = _encode(f"{last.completed_at.isoformat()}|{last.id}")
+    return todos
+
+
+@router.get("/stats", response_model=TodoStats)
+async def get_todo_stats():
+    """Get how many todos are live, by status, and how many are archived."""
+    return await run_read(get_stats)
+
+
+@router.post("/batch", response_model=TodoBatchResponse, status_code=201)
+async def create_todos(batch: TodoBatchCreate):
+    """Create several todos in one transaction and one INSERT."""
+    created = await write_queue.run(lambda db: TodoRepository(db).create_many(batch.items))
+    for todo in created:
+        publish_todo("created", todo)
+    return TodoBatchResponse(
+        results=[TodoBatchResult(id=todo.id, status=201, todo=todo) for todo in created]
+    )
+
+
+@router.patch("/batch", response_model=TodoBatchResponse)
+async def update_todos(batch: TodoBatchUpdate):
+    """Update several todos in one transaction.
+
+    Items naming a missing todo get a 404 result, and items whose version
+    no longer matches get a 409; the rest are applied.
+    """
+    results = await write_queue.run(lambda db: TodoRepository(db).update_many(batch.items))
+    published = set()
+    for item, result in zip(batch.items, results):
+        if result.status == 200 and item.id not in published and (item.title is not None or item.completed is not None):
+            published.add(item.id)
+            publish_todo("updated", result.todo)
+    return TodoBatchResponse(results=results)
+
+
+@router.delete("/batch", response_model=TodoBatchResponse)
+async def delete_todos(batch: TodoBatchDelete):
+    """Delete several todos in one transaction and one DELETE.
+
+    IDs that don't exist, or repeat an ID already deleted, get a 404 result.
+    """
+    deleted = await write_queue.run(lambda db: TodoRepository(db).delete_many(batch.ids))
+    for todo_id in deleted:
+        publish_todo("deleted", todo_id)
+    results = []
+    for todo_id in batch.ids:
+        if todo_id in deleted:
+            deleted.discard(todo_id)
+            results.append(TodoBatchResult(id=todo_id, status=204))
+        else:
+            results.append(TodoBatchResult(id=todo_id, status=404, detail="Todo not found"))
+    return TodoBatchResponse(results=results)
 
 
 @router.get("/{todo_id}", response_model=TodoResponse)
-def get_todo(todo_id: int, db: Session = Depends(get_db)):
+async def get_todo(todo_id: int):
     """Get a specific todo by ID."""
-    todo = db.query(Todo).filter(Todo.id == todo_id).first()
+    todo = await run_read(lambda db: TodoRepository(db).get(todo_id))
     if not todo:
         raise HTTPException(status_code=404, detail="Todo not found")
     return todo
 
 
 @router.put("/{todo_id}", response_model=TodoResponse)
-def update_todo(todo_id: int, todo_update: TodoUpdate, db: Session = Depends(get_db)):
-    """Update a todo."""
-    todo = db.query(Todo).filter(Todo.id == todo_id).first()
-    if not todo:
-        raise HTTPException(status_code=404, detail="Todo not found")
+async def update_todo(todo_id: int, todo_update: TodoUpdate):
+    """Update a todo.
 
-    if todo_update.title is not None:
-        todo.title = todo_update.title
-    if todo_update.completed is not None:
-        todo.completed = todo_update.completed
+    Pass the version last read to have the update refused with 409 if the
+    todo changed in the meantime.
+    """
+    values = todo_update.model_dump(exclude_none=True, exclude={"version"})
+    try:
+        todo = await write_queue.run(
+            lambda db: TodoRepository(db).update(todo_id, values, expected_version=todo_update.version)
+        )
+    except TodoNotFoundError:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    except TodoVersionConflictError as e:
+        raise _conflict(e)
 
-    db.commit()
-    db.refresh(todo)
+    if values:
+        publish_todo("updated", todo)
     return todo
 
 
 @router.delete("/{todo_id}", status_code=204)
-def delete_todo(todo_id: int, db: Session = Depends(get_db)):
+async def delete_todo(
+    todo_id: int,
+    version: int | None = Query(None, description="Version last read; 409 if the todo changed since"),
+):
     """Delete a todo."""
-    todo = db.query(Todo).filter(Todo.id == todo_id).first()
-    if not todo:
+    try:
+        await write_queue.run(lambda db: TodoRepository(db).delete(todo_id, expected_version=version))
+    except TodoNotFoundError:
         raise HTTPException(status_code=404, detail="Todo not found")
+    except TodoVersionConflictError as e:
+        raise _conflict(e)
 
-    db.delete(todo)
-    db.commit()
+    publish_todo("deleted", todo_id)
     return None
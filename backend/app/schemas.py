@@ -1,7 +1,10 @@
 """Pydantic schemas for request/response validation."""
 
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+# Most operations one batch request may carry
+MAX_BATCH_SIZE = 1000
 
 
 # Todo Schemas
@@ -19,6 +22,7 @@ class TodoUpdate(BaseModel):
     """Schema for updating a todo."""
     title: str | None = None
     completed: bool | None = None
+    version: int | None = None  # Version last seen; the update fails with 409 if it changed
 
 
 class TodoResponse(TodoBase):
@@ -28,11 +32,83 @@ class TodoResponse(TodoBase):
     created_by: str
     created_at: datetime
     updated_at: datetime
+    version: int
 
     class Config:
         from_attributes = True
 
 
+class ArchivedTodoResponse(BaseModel):
+    """Schema for an archived todo."""
+    id: int
+    todo_id: int  # ID the todo had while it was live
+    title: str
+    created_by: str | None
+    created_at: datetime | None
+    completed_at: datetime
+    archived_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TodoStats(BaseModel):
+    """Sizes of the live and archived todo sets."""
+    hot: int  # Rows in todos, what every listing and poll works over
+    pending: int
+    completed: int
+    archived: int
+    archive_after_days: int  # 0 when archiving is off
+
+
+class TodoBatchCreate(BaseModel):
+    """Schema for creating several todos at once."""
+    items: list[TodoCreate] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TodoBatchUpdateItem(TodoUpdate):
+    """One update within a batch."""
+    id: int
+
+
+class TodoBatchUpdate(BaseModel):
+    """Schema for updating several todos at once."""
+    items: list[TodoBatchUpdateItem] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TodoBatchDelete(BaseModel):
+    """Schema for deleting several todos at once."""
+    ids: list[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TodoBatchResult(BaseModel):
+    """Outcome of one operation in a batch, in request order."""
+    id: int
+    status: int  # HTTP status the single-item route would have returned
+    todo: TodoResponse | None = None
+    detail: str | None = None
+
+
+class TodoBatchResponse(BaseModel):
+    """Schema for batch operation response."""
+    results: list[TodoBatchResult]
+
+
+class TodoChange(BaseModel):
+    """A todo's net change after some version."""
+    version: int  # Latest change to this todo
+    op: str  # "insert", "update" or "delete"
+    todo_id: int
+    todo: TodoResponse | None = None  # Current state; None once deleted
+
+
+class TodoChangesResponse(BaseModel):
+    """Schema for a delta sync of todos."""
+    version: int  # Pass as since on the next call
+    changes: list[TodoChange]
+    full_resync: bool = False  # since is too old; refetch /api/todos, then sync from version
+
+
 # Calendar Schemas
 class CalendarEvent(BaseModel):
     """Schema for calendar event."""
@@ -43,12 +119,50 @@ class CalendarEvent(BaseModel):
     all_day: bool = False
     location: str | None = None
     description: str | None = None
+    calendar_id: str | None = None  # Source calendar
 
 
 class CalendarEventsResponse(BaseModel):
     """Schema for calendar events response."""
     events: list[CalendarEvent]
     calendar_connected: bool = True
+    next_cursor: str | None = None
+
+
+class TimeSlot(BaseModel):
+    """A span of time."""
+    start: datetime
+    end: datetime
+
+
+class FreeBusyResponse(BaseModel):
+    """Schema for free/busy response."""
+    busy: list[TimeSlot]
+    free: list[TimeSlot]
+    calendar_connected: bool = True
+
+
+class EventConflict(BaseModel):
+    """Two events that overlap."""
+    first: CalendarEvent
+    second: CalendarEvent
+    overlap: TimeSlot
+
+
+class ConflictsResponse(BaseModel):
+    """Schema for conflicts response."""
+    conflicts: list[EventConflict]
+    calendar_connected: bool = True
+
+
+# Dashboard
+class DashboardResponse(BaseModel):
+    """Everything the dashboard shows, as of generated_at."""
+    todos: list[TodoResponse]  # Live todos, newest first
+    today: list[CalendarEvent]
+    upcoming: list[CalendarEvent]  # Not yet ended, within the next 7 days
+    calendar_connected: bool
+    generated_at: datetime
 
 
 # Health Check
@@ -0,0 +1,128 @@
+"""Retention job moving long-completed todos out of the live table."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import DateTime, delete, func, literal, or_, select
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import ArchivedTodo, Todo
+from ..schemas import TodoStats
+from .change_log import record_todo_changes
+from .event_bus import publish_todo
+from .executor import run_read
+from .write_queue import write_queue
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Seconds between archiving runs
+ARCHIVE_INTERVAL = 3600
+
+
+def archive_chunk(db: Session, cutoff: datetime, limit: int) -> list[int]:
+    """Move up to limit todos completed before cutoff into the archive.
+
+    Returns the IDs moved. The copy, the delete and their change log
+    entries run in the caller's transaction, so a chunk moves entirely or
+    not at all; delta sync clients see the moved todos as deleted.
+    """
+    ids = db.scalars(
+        select(Todo.id)
+        .where(Todo.completed.is_(True), Todo.updated_at < cutoff)
+        .order_by(Todo.updated_at, Todo.id)
+        .limit(limit)
+    ).all()
+    if not ids:
+        return []
+
+    db.execute(
+        ArchivedTodo.__table__.insert().from_select(
+            ["todo_id", "title", "created_by", "created_at", "completed_at", "archived_at"],
+            select(
+                Todo.id,
+                Todo.title,
+                Todo.created_by,
+                Todo.created_at,
+                Todo.updated_at,
+                literal(datetime.utcnow(), DateTime),
+            ).where(Todo.id.in_(ids)),
+        )
+    )
+    db.execute(delete(Todo).where(Todo.id.in_(ids)).execution_options(synchronize_session=False))
+    record_todo_changes(db, "delete", ids)
+    return ids
+
+
+async def archive_completed(older_than: timedelta, chunk_size: int) -> int:
+    """Archive every todo completed more than older_than ago.
+
+    Each chunk is its own trip through the write queue, so web and bot
+    writes interleave with a large first run instead of waiting it out.
+    Returns the number of todos archived.
+    """
+    cutoff = datetime.utcnow() - older_than
+    archived = 0
+    while True:
+        ids = await write_queue.run(lambda db: archive_chunk(db, cutoff, chunk_size))
+        for todo_id in ids:
+            publish_todo("deleted", todo_id)
+        archived += len(ids)
+        if len(ids) < chunk_size:
+            return archived
+
+
+def query_archive_page(
+    db: Session,
+    limit: int,
+    after: tuple[datetime, int] | None = None,
+) -> tuple[list[ArchivedTodo], bool]:
+    """Get archived todos most recently completed first, resuming after a keyset position."""
+    query = db.query(ArchivedTodo)
+    if after is not None:
+        completed_at, archive_id = after
+        query = query.filter(
+            ArchivedTodo.completed_at <= completed_at,
+            or_(ArchivedTodo.completed_at < completed_at, ArchivedTodo.id < archive_id),
+        )
+    todos = (
+        query.order_by(ArchivedTodo.completed_at.desc(), ArchivedTodo.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    return todos[:limit], len(todos) > limit
+
+
+def get_stats(db: Session) -> TodoStats:
+    """Count live todos by status, and archived ones."""
+    hot, completed = db.query(func.count(Todo.id), func.count(Todo.id).filter(Todo.completed.is_(True))).one()
+    archived = db.query(func.count(ArchivedTodo.id)).scalar()
+    return TodoStats(
+        hot=hot,
+        pending=hot - completed,
+        completed=completed,
+        archived=archived,
+        archive_after_days=max(settings.todo_archive_after_days, 0),
+    )
+
+
+async def run_archiver():
+    """Archive long-completed todos periodically until cancelled."""
+    if settings.todo_archive_after_days <= 0:
+        logger.info("Todo archiving is off (TODO_ARCHIVE_AFTER_DAYS=0).")
+        return
+    while True:
+        try:
+            archived = await archive_completed(
+                timedelta(days=settings.todo_archive_after_days), settings.todo_archive_chunk_size
+            )
+            if archived:
+                stats = await run_read(get_stats)
+                logger.info(f"Archived {archived} completed todos; {stats.hot} todos remain live")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Todo archiving failed: {e}")
+        await asyncio.sleep(ARCHIVE_INTERVAL)
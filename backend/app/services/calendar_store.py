@@ -0,0 +1,351 @@
+"""Local SQLite-backed store of synced calendar events."""
+
+import base64
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from sqlalchemy import and_, insert, or_, select
+
+from ..database import SessionLocal
+from ..models import CalendarEventRecord, CalendarEventStagingRecord, CalendarSyncState
+from ..schemas import CalendarEvent
+from .recurrence import expand, instance_id, to_utc_naive as _to_utc_naive
+from .write_queue import WriteQueue, write_queue
+
+
+@dataclass
+class SyncedEvent:
+    """A Google event as stored locally, before recurrence expansion."""
+    event: CalendarEvent
+    recurrence: list[str] | None = None
+    time_zone: str | None = None
+    recurring_event_id: str | None = None
+    original_start: datetime | None = None
+    cancelled: bool = False
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def event_sort_key(event: CalendarEvent) -> tuple[datetime, str, str]:
+    """Order events by start, then ID, then source calendar."""
+    return _to_utc_naive(event.start), event.id, event.calendar_id or ""
+
+
+def encode_cursor(event: CalendarEvent) -> str:
+    """Encode the keyset position just after event as an opaque cursor."""
+    start, event_id, calendar_id = event_sort_key(event)
+    raw = f"{start.isoformat()}|{calendar_id}|{event_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str, str]:
+    """Decode a cursor into (start, event_id, calendar_id).
+
+    Raises InvalidCursorError if malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        start, calendar_id, event_id = base64.urlsafe_b64decode(padded).decode().split("|", 2)
+        return datetime.fromisoformat(start), event_id, calendar_id
+    except Exception as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+class CalendarStoreWriter:
+    """Applies changes to a calendar's events inside a single transaction.
+
+    Writers run as write queue jobs and never call Google, so a
+    transaction only lasts as long as its statements. Syncs submit one
+    writer per page fetched; a full sync writes its pages to the staging
+    table (model) and swaps them in with a last writer.
+    """
+
+    def __init__(self, db, calendar_id: str, model=CalendarEventRecord):
+        self.db = db
+        self.calendar_id = calendar_id
+        self.model = model
+
+    def clear(self):
+        """Delete every event held for the calendar."""
+        self.db.query(self.model).filter(
+            self.model.calendar_id == self.calendar_id
+        ).delete(synchronize_session=False)
+
+    def apply_page(self, upserts: list[SyncedEvent], deleted_ids: list[str]):
+        """Upsert and delete one page of events.
+
+        Deleting a recurring series also deletes its modified occurrences.
+        """
+        if deleted_ids:
+            self.db.query(self.model).filter(
+                self.model.calendar_id == self.calendar_id,
+                self.model.recurring_event_id.in_(deleted_ids),
+            ).delete(synchronize_session=False)
+
+        changed_ids = deleted_ids + [synced.event.id for synced in upserts]
+        if changed_ids:
+            self.db.query(self.model).filter(
+                self.model.calendar_id == self.calendar_id,
+                self.model.event_id.in_(changed_ids),
+            ).delete(synchronize_session=False)
+
+        # Keep only the last version of an event within the page
+        latest = {synced.event.id: synced for synced in upserts}
+        records = [_to_record(self.model, self.calendar_id, synced) for synced in latest.values()]
+        self.db.add_all(records)
+        self.db.flush()
+        # Written rows aren't needed again; don't let a large sync pile up
+        # in a session other queued writes share
+        for record in records:
+            self.db.expunge(record)
+
+    def replace_with_staged(self):
+        """Replace the calendar's events with the staged ones, in SQL, and empty its staging."""
+        staged = CalendarEventStagingRecord.__table__
+        columns = [column.name for column in staged.columns if column.name != "id"]
+        self.clear()
+        self.db.execute(
+            insert(CalendarEventRecord.__table__).from_select(
+                columns,
+                select(*(staged.c[name] for name in columns)).where(staged.c.calendar_id == self.calendar_id),
+            )
+        )
+        CalendarStoreWriter(self.db, self.calendar_id, CalendarEventStagingRecord).clear()
+
+    def finish(self, sync_token: str | None, full: bool = False, synced_until: datetime | None = None):
+        """Record the new sync token; the write queue commits."""
+        state = self.db.get(CalendarSyncState, self.calendar_id)
+        if state is None:
+            state = CalendarSyncState(calendar_id=self.calendar_id)
+            self.db.add(state)
+
+        now = datetime.utcnow()
+        state.sync_token = sync_token
+        state.synced_at = now
+        if full:
+            state.full_synced_at = now
+            state.synced_until = synced_until
+
+
+class CalendarEventStore:
+    """Persists synced events and answers time-range queries locally."""
+
+    def __init__(self, session_factory=SessionLocal, writes: WriteQueue = write_queue):
+        self.session_factory = session_factory
+        self.writes = writes
+
+    def get_state(self, calendar_id: str) -> CalendarSyncState | None:
+        """Get the sync bookkeeping row for a calendar."""
+        db = self.session_factory()
+        try:
+            return db.get(CalendarSyncState, calendar_id)
+        finally:
+            db.close()
+
+    def write(self, calendar_id: str, apply: Callable[[CalendarStoreWriter], Any]) -> Any:
+        """Run apply(writer) on the write queue and wait until it is committed.
+
+        Blocking. Changes are rolled back if apply raises, and the
+        exception is re-raised here.
+        """
+        return self.writes.submit(lambda db: apply(CalendarStoreWriter(db, calendar_id))).result()
+
+    def stage(self, calendar_id: str, apply: Callable[[CalendarStoreWriter], Any]) -> Any:
+        """Like write, but apply(writer) changes the calendar's staged events.
+
+        Queries never read staged events; a full sync makes them current
+        with CalendarStoreWriter.replace_with_staged.
+        """
+        return self.writes.submit(
+            lambda db: apply(CalendarStoreWriter(db, calendar_id, CalendarEventStagingRecord))
+        ).result()
+
+    def clear_sync_token(self, calendar_id: str):
+        """Forget the sync token so the next sync is a full one."""
+        def clear(db):
+            state = db.get(CalendarSyncState, calendar_id)
+            if state:
+                state.sync_token = None
+
+        self.writes.submit(clear).result()
+
+    def query(self, calendar_id: str, time_min: datetime, time_max: datetime) -> list[CalendarEvent]:
+        """Get stored events overlapping [time_min, time_max), ordered by start."""
+        events, _ = self.query_page(calendar_id, time_min, time_max)
+        return events
+
+    def query_page(
+        self,
+        calendar_id: str,
+        time_min: datetime,
+        time_max: datetime,
+        limit: int | None = None,
+        after: tuple[datetime, str] | None = None,
+        inclusive: bool = False,
+    ) -> tuple[list[CalendarEvent], bool]:
+        """Get up to limit overlapping events after a keyset position.
+
+        One-off events and modified occurrences come straight from the
+        table; recurring series are expanded locally for the window. Pages
+        are keyset-paginated on (start, event_id), so each page costs the
+        same regardless of how far into the window it is. With inclusive,
+        an event exactly at after is returned too. Also returns whether
+        more events follow the page.
+        """
+        time_min = _to_utc_naive(time_min)
+        time_max = _to_utc_naive(time_max)
+        fetch = limit + 1 if limit is not None else None
+
+        db = self.session_factory()
+        try:
+            query = db.query(CalendarEventRecord).filter(
+                and_(
+                    CalendarEventRecord.calendar_id == calendar_id,
+                    CalendarEventRecord.recurrence.is_(None),
+                    CalendarEventRecord.cancelled.is_not(True),
+                    CalendarEventRecord.start < time_max,
+                    CalendarEventRecord.end > time_min,
+                )
+            )
+            if after:
+                same_start_id = (
+                    CalendarEventRecord.event_id >= after[1]
+                    if inclusive
+                    else CalendarEventRecord.event_id > after[1]
+                )
+                query = query.filter(
+                    or_(
+                        CalendarEventRecord.start > after[0],
+                        and_(CalendarEventRecord.start == after[0], same_start_id),
+                    )
+                )
+            query = query.order_by(CalendarEventRecord.start, CalendarEventRecord.event_id)
+            if fetch is not None:
+                query = query.limit(fetch)
+
+            candidates = [((record.start, record.event_id), _to_event(record)) for record in query]
+            candidates.extend(
+                self._expand_series(db, calendar_id, time_min, time_max, after, inclusive, fetch)
+            )
+        finally:
+            db.close()
+
+        candidates.sort(key=lambda candidate: candidate[0])
+        has_more = limit is not None and len(candidates) > limit
+        if has_more:
+            candidates = candidates[:limit]
+        return [event for _, event in candidates], has_more
+
+    def _expand_series(
+        self,
+        db,
+        calendar_id: str,
+        time_min: datetime,
+        time_max: datetime,
+        after: tuple[datetime, str] | None,
+        inclusive: bool,
+        fetch: int | None,
+    ) -> list[tuple[tuple[datetime, str], CalendarEvent]]:
+        """Expand every recurring series overlapping the window."""
+        masters = (
+            db.query(CalendarEventRecord)
+            .filter(
+                CalendarEventRecord.calendar_id == calendar_id,
+                CalendarEventRecord.recurrence.is_not(None),
+                CalendarEventRecord.start < time_max,
+            )
+            .all()
+        )
+        if not masters:
+            return []
+
+        # Occurrences that were modified or cancelled are not expanded
+        replaced = set(
+            db.query(CalendarEventRecord.recurring_event_id, CalendarEventRecord.original_start)
+            .filter(
+                CalendarEventRecord.calendar_id == calendar_id,
+                CalendarEventRecord.recurring_event_id.in_([m.event_id for m in masters]),
+                CalendarEventRecord.original_start < time_max,
+            )
+            .all()
+        )
+
+        results = []
+        for master in masters:
+            duration = master.end - master.start
+            window_start = time_min - duration
+            if after and after[0] > window_start:
+                window_start = after[0]
+
+            master_id, all_day = master.event_id, master.all_day
+            title, location, description = master.title, master.location, master.description
+
+            count = 0
+            occurrences = expand(
+                master.recurrence, master.start, all_day, master.time_zone,
+                window_start, time_max,
+            )
+            for start in occurrences:
+                if start + duration <= time_min or (master_id, start) in replaced:
+                    continue
+                event_id = instance_id(master_id, start, all_day)
+                if after and ((start, event_id) < after or (not inclusive and (start, event_id) == after)):
+                    continue
+
+                # Fields come from an already-validated row, so skip validation
+                event_start = start if all_day else start.replace(tzinfo=timezone.utc)
+                event = CalendarEvent.model_construct(
+                    id=event_id,
+                    title=title,
+                    start=event_start,
+                    end=event_start + duration,
+                    all_day=all_day,
+                    location=location,
+                    description=description,
+                    calendar_id=calendar_id,
+                )
+                results.append(((start, event_id), event))
+
+                count += 1
+                if fetch is not None and count >= fetch:
+                    break
+        return results
+
+
+def _to_record(model, calendar_id: str, synced: SyncedEvent):
+    event = synced.event
+    return model(
+        calendar_id=calendar_id,
+        event_id=event.id,
+        title=event.title,
+        start=_to_utc_naive(event.start),
+        end=_to_utc_naive(event.end),
+        all_day=event.all_day,
+        location=event.location,
+        description=event.description,
+        recurrence="\n".join(synced.recurrence) if synced.recurrence else None,
+        time_zone=synced.time_zone,
+        recurring_event_id=synced.recurring_event_id,
+        original_start=_to_utc_naive(synced.original_start) if synced.original_start else None,
+        cancelled=synced.cancelled,
+    )
+
+
+def _to_event(record: CalendarEventRecord) -> CalendarEvent:
+    start, end = record.start, record.end
+    if not record.all_day:
+        start = start.replace(tzinfo=timezone.utc)
+        end = end.replace(tzinfo=timezone.utc)
+    return CalendarEvent(
+        id=record.event_id,
+        title=record.title,
+        start=start,
+        end=end,
+        all_day=record.all_day,
+        location=record.location,
+        description=record.description,
+        calendar_id=record.calendar_id,
+    )
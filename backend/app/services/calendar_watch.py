@@ -0,0 +1,254 @@
+"""Google Calendar push notification channels."""
+
+import asyncio
+import logging
+import secrets
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Mapping
+
+from ..config import get_settings
+from ..database import SessionLocal
+from ..models import CalendarWatchChannel
+from .event_bus import event_bus
+from .executor import calendar_executor, run_blocking
+from .write_queue import WriteQueue, write_queue
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Channels are renewed once they expire within this many seconds; it must
+# comfortably exceed the poll interval so a renewal is never missed
+RENEW_MARGIN = 3600
+
+
+class UnknownChannelError(LookupError):
+    """A notification named a channel this server did not open."""
+
+
+class InvalidChannelTokenError(PermissionError):
+    """A notification carried the wrong channel token."""
+
+
+class CalendarWatchManager:
+    """Keeps calendars fresh from Google push notifications.
+
+    One events.watch channel is held per configured calendar and renewed
+    before it expires. A notification for a channel triggers a forced
+    incremental sync of just that calendar, then drops its cached lookups.
+    Calendars without an active channel are polled instead.
+    """
+
+    def __init__(self, calendar_service, session_factory=SessionLocal, writes: WriteQueue = write_queue):
+        self.calendar_service = calendar_service
+        self.session_factory = session_factory
+        self.writes = writes
+        # channel_id -> (calendar_id, token), mirrored from the database
+        self._channels: dict[str, tuple[str, str]] = {}
+        self._lock = threading.Lock()
+        # Calendars with a resync queued or running, and those notified again
+        # since it started
+        self._pending: set[str] = set()
+        self._dirty: set[str] = set()
+
+    def _load_channels(self) -> list[CalendarWatchChannel]:
+        db = self.session_factory()
+        try:
+            channels = db.query(CalendarWatchChannel).all()
+        finally:
+            db.close()
+        with self._lock:
+            self._channels = {c.channel_id: (c.calendar_id, c.token) for c in channels}
+        return channels
+
+    def _lookup(self, channel_id: str) -> tuple[str, str] | None:
+        with self._lock:
+            channel = self._channels.get(channel_id)
+        if channel is None:
+            # Channels opened by a previous run are only on disk
+            db = self.session_factory()
+            try:
+                row = db.get(CalendarWatchChannel, channel_id)
+            finally:
+                db.close()
+            if row is not None:
+                channel = (row.calendar_id, row.token)
+                with self._lock:
+                    self._channels[channel_id] = channel
+        return channel
+
+    def handle_notification(self, headers: Mapping[str, str]) -> bool:
+        """Handle the headers of a push notification.
+
+        Returns True if a resync was scheduled. Blocking, as a channel
+        opened by a previous run is looked up in the database; it never
+        waits on Google, though: the resync runs on the calendar executor,
+        and a burst of notifications for a calendar costs at most one extra
+        pass.
+        """
+        channel_id = headers.get("x-goog-channel-id", "")
+        channel = self._lookup(channel_id)
+        if channel is None:
+            raise UnknownChannelError(channel_id)
+        calendar_id, token = channel
+        if not secrets.compare_digest(headers.get("x-goog-channel-token", ""), token):
+            raise InvalidChannelTokenError(channel_id)
+
+        # "sync" only confirms a new channel; nothing has changed yet
+        if headers.get("x-goog-resource-state") == "sync":
+            return False
+
+        with self._lock:
+            if calendar_id in self._pending:
+                # Picked up by the resync already queued or running
+                self._dirty.add(calendar_id)
+                return False
+            self._pending.add(calendar_id)
+        calendar_executor.submit(self._resync_pending, calendar_id)
+        return True
+
+    def _resync_pending(self, calendar_id: str):
+        """Resync until no notification arrived during the last pass."""
+        while True:
+            with self._lock:
+                self._dirty.discard(calendar_id)
+            if self._resync(calendar_id):
+                event_bus.publish("calendar.changed", {"calendar_id": calendar_id})
+            with self._lock:
+                if calendar_id not in self._dirty:
+                    self._pending.discard(calendar_id)
+                    return
+
+    def _resync(self, calendar_id: str) -> bool:
+        """Pull a calendar's changes and drop its cached lookups.
+
+        Returns whether the sync succeeded.
+        """
+        service = self.calendar_service
+        try:
+            service.sync(calendar_id, force=True)
+            service.sync_errors.pop(calendar_id, None)
+            return True
+        except Exception as e:
+            service.sync_errors[calendar_id] = str(e)
+            # Let requests sync it again until the channel is renewed
+            service.pushed_calendars.discard(calendar_id)
+            logger.warning(f"Calendar {calendar_id} resync failed: {e}")
+            return False
+        finally:
+            service.invalidate_calendar(calendar_id)
+
+    def ensure_channels(self):
+        """Open or renew a channel per configured calendar and stop stale ones.
+
+        Blocking. Without a webhook URL or credentials no channels are kept
+        and every calendar falls back to polling.
+        """
+        service = self.calendar_service
+        channels = self._load_channels()
+        if not settings.calendar_webhook_url or not service.is_authenticated():
+            service.pushed_calendars.clear()
+            return
+
+        calendar_ids = settings.calendar_ids
+        now = datetime.utcnow()
+        renew_before = now + timedelta(seconds=RENEW_MARGIN)
+        current = {c.calendar_id for c in channels if c.expires_at > renew_before}
+        opened = set()
+        for calendar_id in calendar_ids:
+            if calendar_id in current:
+                continue
+            try:
+                self._open_channel(calendar_id)
+                opened.add(calendar_id)
+            except Exception as e:
+                logger.warning(f"Could not watch calendar {calendar_id}: {e}")
+
+        active = set()
+        for channel in channels:
+            replaced = channel.calendar_id in opened and channel.expires_at <= renew_before
+            if channel.calendar_id not in calendar_ids or channel.expires_at <= now or replaced:
+                try:
+                    self._stop_channel(channel)
+                except Exception as e:
+                    logger.warning(f"Could not stop channel {channel.channel_id}: {e}")
+            else:
+                active.add(channel.calendar_id)
+        active |= opened
+
+        newly_watched = active - service.pushed_calendars
+        service.pushed_calendars.intersection_update(active)
+        service.pushed_calendars.update(newly_watched)
+        # Catch up on anything missed while these calendars were unwatched
+        for calendar_id in newly_watched:
+            self._resync(calendar_id)
+
+    def _open_channel(self, calendar_id: str):
+        channel_id = str(uuid.uuid4())
+        token = secrets.token_urlsafe(32)
+        response = self.calendar_service._get_service().events().watch(
+            calendarId=calendar_id,
+            body={
+                "id": channel_id,
+                "type": "web_hook",
+                "address": settings.calendar_webhook_url,
+                "token": token,
+                "params": {"ttl": str(settings.calendar_watch_ttl)},
+            },
+        ).execute()
+
+        expires_at = datetime.utcfromtimestamp(int(response["expiration"]) / 1000)
+        channel = CalendarWatchChannel(
+            channel_id=channel_id,
+            calendar_id=calendar_id,
+            resource_id=response["resourceId"],
+            token=token,
+            expires_at=expires_at,
+        )
+        self.writes.submit(lambda db: db.add(channel)).result()
+        with self._lock:
+            self._channels[channel_id] = (calendar_id, token)
+        logger.info(f"Watching calendar {calendar_id} until {expires_at:%Y-%m-%d %H:%M} UTC")
+
+    def _stop_channel(self, channel: CalendarWatchChannel):
+        from googleapiclient.errors import HttpError
+
+        if channel.expires_at > datetime.utcnow():
+            try:
+                self.calendar_service._get_service().channels().stop(
+                    body={"id": channel.channel_id, "resourceId": channel.resource_id}
+                ).execute()
+            except HttpError as e:
+                # Already gone on Google's side
+                if e.resp.status != 404:
+                    logger.warning(f"Could not stop channel {channel.channel_id}: {e}")
+                    return
+        self.writes.submit(
+            lambda db: db.query(CalendarWatchChannel).filter(
+                CalendarWatchChannel.channel_id == channel.channel_id
+            ).delete()
+        ).result()
+        with self._lock:
+            self._channels.pop(channel.channel_id, None)
+
+    def poll_unwatched(self):
+        """Resync calendars that have no active channel. Blocking."""
+        service = self.calendar_service
+        if not service.is_authenticated():
+            return
+        for calendar_id in settings.calendar_ids:
+            if calendar_id not in service.pushed_calendars:
+                self._resync(calendar_id)
+
+    async def run(self):
+        """Renew channels and poll unwatched calendars until cancelled."""
+        while True:
+            for step in (self.ensure_channels, self.poll_unwatched):
+                try:
+                    await run_blocking(calendar_executor, step)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Calendar watch upkeep failed: {e}")
+            await asyncio.sleep(settings.calendar_poll_interval)
@@ -0,0 +1,136 @@
+"""Todo change log for delta syncs."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import Todo, TodoChangeRecord
+from ..schemas import TodoChange, TodoChangesResponse, TodoResponse
+from .write_queue import write_queue
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Seconds between compactions of the change log
+COMPACTION_INTERVAL = 6 * 3600
+
+
+def record_todo_changes(session: Session, op: str, todo_ids: list[int]):
+    """Log changes made outside the unit of work, e.g. by bulk statements.
+
+    Runs in the session's transaction, so the log commits or rolls back
+    together with the change itself.
+    """
+    if todo_ids:
+        session.execute(
+            TodoChangeRecord.__table__.insert(),
+            [{"todo_id": todo_id, "op": op, "changed_at": datetime.utcnow()} for todo_id in todo_ids],
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def _log_todo_flush(session, flush_context):
+    now = datetime.utcnow()
+    rows = []
+    for obj in session.new:
+        if isinstance(obj, Todo):
+            rows.append({"todo_id": obj.id, "op": "insert", "changed_at": now})
+    for obj in session.dirty:
+        if isinstance(obj, Todo) and session.is_modified(obj, include_collections=False):
+            rows.append({"todo_id": obj.id, "op": "update", "changed_at": now})
+    for obj in session.deleted:
+        if isinstance(obj, Todo):
+            rows.append({"todo_id": obj.id, "op": "delete", "changed_at": now})
+    if rows:
+        session.connection().execute(TodoChangeRecord.__table__.insert(), rows)
+
+
+def get_changes(db: Session, since: int) -> TodoChangesResponse:
+    """Get the net change to each todo touched after version since.
+
+    A todo inserted after since is reported as an insert even if it was
+    also updated; one deleted is reported as a delete whatever came before.
+    """
+    oldest, latest = db.query(
+        func.min(TodoChangeRecord.version), func.max(TodoChangeRecord.version)
+    ).one()
+    latest = latest or 0
+    if since == latest:
+        return TodoChangesResponse(version=latest, changes=[])
+    # 0 means the client holds nothing yet, versions before the oldest
+    # retained one were compacted away, and one past the latest came from
+    # another database
+    if since <= 0 or since > latest or (oldest is not None and since < oldest - 1):
+        return TodoChangesResponse(version=latest, changes=[], full_resync=True)
+
+    records = (
+        db.query(TodoChangeRecord)
+        .filter(TodoChangeRecord.version > since)
+        .order_by(TodoChangeRecord.version)
+        .all()
+    )
+    net: dict[int, tuple[int, str]] = {}
+    for record in records:
+        previous = net.get(record.todo_id)
+        op = record.op
+        if previous is not None and previous[1] == "insert" and op == "update":
+            op = "insert"
+        net[record.todo_id] = (record.version, op)
+
+    live_ids = [todo_id for todo_id, (_, op) in net.items() if op != "delete"]
+    todos = {todo.id: todo for todo in db.query(Todo).filter(Todo.id.in_(live_ids))} if live_ids else {}
+
+    changes = []
+    for todo_id, (version, op) in sorted(net.items(), key=lambda item: item[1][0]):
+        todo = todos.get(todo_id)
+        if op != "delete" and todo is None:
+            # Deleted by a write that wasn't logged
+            op = "delete"
+        changes.append(TodoChange(
+            version=version,
+            op=op,
+            todo_id=todo_id,
+            todo=TodoResponse.model_validate(todo) if op != "delete" else None,
+        ))
+    return TodoChangesResponse(version=latest, changes=changes)
+
+
+def compact(db: Session, retention: timedelta) -> int:
+    """Drop log entries older than retention, always keeping the latest.
+
+    Returns the number of entries removed. The latest entry stays so the
+    version a client holds can still be told apart from a compacted one.
+    Runs in the caller's transaction, normally a write queue job, so the
+    read and the delete see the same snapshot.
+    """
+    latest = db.query(func.max(TodoChangeRecord.version)).scalar()
+    if latest is None:
+        return 0
+    removed = (
+        db.query(TodoChangeRecord)
+        .filter(
+            TodoChangeRecord.changed_at < datetime.utcnow() - retention,
+            TodoChangeRecord.version < latest,
+        )
+        .delete(synchronize_session=False)
+    )
+    return removed
+
+
+async def run_compaction():
+    """Compact the change log periodically until cancelled."""
+    while True:
+        try:
+            retention = timedelta(days=settings.todo_change_retention_days)
+            removed = await write_queue.run(lambda db: compact(db, retention))
+            if removed:
+                logger.info(f"Compacted {removed} todo change log entries")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Todo change log compaction failed: {e}")
+        await asyncio.sleep(COMPACTION_INTERVAL)
@@ -0,0 +1,206 @@
+"""Precomputed snapshot behind /api/dashboard."""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from ..config import get_settings
+from ..schemas import CalendarEvent, DashboardResponse, TodoResponse
+from .event_bus import event_bus
+from .executor import calendar_executor, run_blocking, run_read
+from .recurrence import to_utc_naive
+from .todo_repository import TodoRepository
+from .versioning import todo_changes
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Days of upcoming events shown, matching /api/calendar/events
+UPCOMING_DAYS = 7
+
+# Seconds to let a burst of changes land before rebuilding once for all of them
+REBUILD_DELAY = 0.2
+
+# Bus events after which the calendar part is reloaded
+RELOAD_EVENTS = ("calendar.changed", "resync")
+
+# Snapshot fields filled from the calendar
+CALENDAR_FIELDS = ("today", "upcoming", "calendar_connected")
+
+
+class DashboardService:
+    """Serves the dashboard from a snapshot rebuilt when its inputs change.
+
+    Todos are reloaded after committed todo writes. Events come from one
+    calendar read spanning the start of today to the end of the upcoming
+    window, split into today and upcoming; they are reloaded on
+    calendar.changed, at midnight UTC (when "today" moves) and, for
+    calendars without push channels, once older than calendar_cache_ttl.
+
+    A poll is a memory read of the pre-serialized snapshot. It only waits
+    when todos changed after the snapshot was taken, so clients always see
+    their own writes, or when the day turned; an expired calendar part is
+    served as is while it reloads in the background.
+
+    Clients get todo changes from the bus themselves, but not calendar
+    ones, so a rebuild that changes the calendar part publishes
+    dashboard.changed for them to refetch.
+    """
+
+    def __init__(self, calendar_service, days: int = UPCOMING_DAYS):
+        self.calendar_service = calendar_service
+        self.days = days
+        self.version = 0
+        self.body: bytes | None = None
+        self._content: dict | None = None
+        self._todo_version = -1
+        self._todos: list[TodoResponse] = []
+        self._events: tuple[list[CalendarEvent], list[CalendarEvent], bool] | None = None
+        self._events_day = None
+        self._events_loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._background: asyncio.Task | None = None
+
+    async def get(self) -> tuple[bytes, int]:
+        """Get the snapshot as JSON and its version, rebuilding only if needed."""
+        if self.body is None or self._todo_version != todo_changes.value or self._day_changed():
+            await self.refresh()
+        if self._events_expired() and (self._background is None or self._background.done()):
+            self._background = asyncio.create_task(self.refresh(reload_events=True))
+        return self.body, self.version
+
+    async def refresh(self, reload_events: bool = False):
+        """Rebuild whatever parts of the snapshot are out of date.
+
+        Events are only loaded here when missing or from another day.
+        With reload_events they are fetched again first, outside the
+        snapshot lock, so a rebuild after a todo write never waits on
+        Google; get schedules that for expired events. Concurrent callers
+        share one rebuild; a caller that waited behind another finds the
+        snapshot current and returns without reloading.
+        """
+        if reload_events:
+            await self._load_events()
+        async with self._lock:
+            # Read the version first, so a write racing the reload can only
+            # leave the snapshot looking older than it is
+            todo_version = todo_changes.value
+            todos = self._todos
+            if todo_version != self._todo_version:
+                todos = await run_read(self._load_todos)
+
+            events = self._events
+            if events is None or self._day_changed():
+                events = await self._load_events()
+
+            snapshot = DashboardResponse(
+                todos=todos,
+                today=events[0],
+                upcoming=events[1],
+                calendar_connected=events[2],
+                generated_at=datetime.utcnow(),
+            )
+            # A rebuild that found nothing new keeps its version, so clients
+            # holding it keep getting 304s
+            content = snapshot.model_dump(exclude={"generated_at"})
+            if content != self._content:
+                calendar_changed = self._content is not None and any(
+                    content[name] != self._content[name] for name in CALENDAR_FIELDS
+                )
+                self.version += 1
+                self._content = content
+                self.body = snapshot.model_dump_json().encode()
+                if calendar_changed:
+                    event_bus.publish("dashboard.changed", {"version": self.version})
+            self._todos, self._todo_version = todos, todo_version
+
+    @staticmethod
+    def _load_todos(db) -> list[TodoResponse]:
+        todos, _ = TodoRepository(db).query_page()
+        return [TodoResponse.model_validate(todo) for todo in todos]
+
+    async def _load_events(self) -> tuple[list[CalendarEvent], list[CalendarEvent], bool]:
+        """Fetch today's and upcoming events in one read, keeping the last good ones on failure."""
+        day = datetime.utcnow().date()
+        if not self.calendar_service.is_authenticated():
+            events = ([], [], False)
+        else:
+            try:
+                events = await run_blocking(
+                    calendar_executor, self._fetch_events, timeout=settings.calendar_request_timeout
+                )
+            except Exception as e:
+                logger.warning(f"Dashboard calendar refresh failed: {e}")
+                if self._events is not None:
+                    # Retry on the next expiry rather than on every poll
+                    self._events_loaded_at = time.monotonic()
+                    return self._events
+                events = ([], [], True)
+        self._events, self._events_day, self._events_loaded_at = events, day, time.monotonic()
+        return events
+
+    def _fetch_events(self) -> tuple[list[CalendarEvent], list[CalendarEvent], bool]:
+        now = datetime.utcnow()
+        start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        end_of_day = start_of_day + timedelta(days=1)
+        events = self.calendar_service.get_events_between(
+            start_of_day, max(end_of_day, now + timedelta(days=self.days))
+        )
+        # Timed events are aware and all-day ones naive; compare both as naive UTC
+        bounds = [(event, to_utc_naive(event.start), to_utc_naive(event.end)) for event in events]
+        today = [event for event, start, end in bounds if start < end_of_day and end > start_of_day]
+        upcoming = [
+            event for event, start, end in bounds
+            if end > now and start < now + timedelta(days=self.days)
+        ]
+        return today, upcoming, True
+
+    def _day_changed(self) -> bool:
+        return self._events_day is not None and self._events_day != datetime.utcnow().date()
+
+    def _events_pushed(self) -> bool:
+        # Calendars with push channels announce changes with calendar.changed
+        return set(settings.calendar_ids) <= self.calendar_service.pushed_calendars
+
+    def _events_expired(self) -> bool:
+        if self._events_pushed():
+            return False
+        return time.monotonic() - self._events_loaded_at > settings.calendar_cache_ttl
+
+    def _next_reload_in(self) -> float:
+        """Seconds until midnight UTC or, without push channels, until the events expire."""
+        now = datetime.utcnow()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+        wait = (midnight - now).total_seconds()
+        if not self._events_pushed():
+            expires_in = self._events_loaded_at + settings.calendar_cache_ttl - time.monotonic()
+            wait = min(wait, max(expires_in, 0.0))
+        return wait
+
+    async def run(self):
+        """Rebuild on todo and calendar changes, at midnight UTC and on expiry until cancelled.
+
+        Reloading expired events here rather than only on a poll keeps
+        clients current while they wait on the stream instead of polling.
+        """
+        subscription = event_bus.subscribe()
+        try:
+            while True:
+                event = await subscription.next(timeout=self._next_reload_in())
+                if event is not None and event.type == "dashboard.changed":
+                    # Published by refresh itself
+                    continue
+                # Nothing before the timeout means the day turned or the events expired
+                reload_events = event is None or event.type in RELOAD_EVENTS
+                await asyncio.sleep(REBUILD_DELAY)
+                while (event := await subscription.next(timeout=0.001)) is not None:
+                    reload_events = reload_events or event.type in RELOAD_EVENTS
+                try:
+                    await self.refresh(reload_events=reload_events)
+                except Exception as e:
+                    logger.warning(f"Dashboard rebuild failed: {e}")
+        except EOFError:
+            return
+        finally:
+            event_bus.unsubscribe(subscription)
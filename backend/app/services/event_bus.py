@@ -0,0 +1,178 @@
+"""In-process bus pushing data changes to connected dashboards."""
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..schemas import TodoResponse
+
+logger = logging.getLogger(__name__)
+
+# Events a subscriber may fall behind by before it is told to resync
+MAX_PENDING = 100
+
+# Recent events kept for clients reconnecting with Last-Event-ID
+REPLAY_SIZE = 256
+
+
+@dataclass
+class ChangeEvent:
+    """A change pushed to subscribers; id increases by one per event."""
+    id: int
+    type: str
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+class Subscription:
+    """One consumer's bounded queue of pending events.
+
+    A consumer that falls more than max_pending events behind loses its
+    backlog and gets a single resync event instead, so a stalled client
+    costs a fixed amount of memory and never slows down publishers.
+    """
+
+    def __init__(self, max_pending: int):
+        self._queue: asyncio.Queue[ChangeEvent | None] = asyncio.Queue(max_pending)
+        self._overflowed = False
+        # ID of the latest event skipped, sent along with the resync
+        self._resume_id = 0
+        self.dropped = 0
+
+    def _offer(self, event: ChangeEvent):
+        if not self._overflowed:
+            try:
+                self._queue.put_nowait(event)
+                return
+            except asyncio.QueueFull:
+                self.dropped += self._queue.qsize()
+                while not self._queue.empty():
+                    self._queue.get_nowait()
+                self._overflowed = True
+        self.dropped += 1
+        self._resume_id = event.id
+
+    def _resync_from(self, event_id: int):
+        self._overflowed = True
+        self._resume_id = event_id
+
+    def _close(self):
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._overflowed = False
+        self._queue.put_nowait(None)
+
+    async def next(self, timeout: float) -> ChangeEvent | None:
+        """Wait for the next event.
+
+        Returns None after timeout seconds with nothing to send, and raises
+        EOFError once the bus has shut down.
+        """
+        if self._overflowed:
+            self._overflowed = False
+            return ChangeEvent(id=self._resume_id, type="resync")
+        try:
+            event = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is None:
+            raise EOFError
+        return event
+
+
+class EventBus:
+    """Fans change events out to asyncio subscribers.
+
+    publish can be called from any thread, including the threadpool that
+    runs sync route handlers; delivery always happens on the event loop
+    the bus was bound to at startup. Publishing before that is a no-op.
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING, replay_size: int = REPLAY_SIZE):
+        self.max_pending = max_pending
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._subscribers: set[Subscription] = set()
+        self._recent: deque[ChangeEvent] = deque(maxlen=replay_size)
+        # IDs start at the current time in milliseconds, so they keep
+        # increasing across restarts and stale Last-Event-IDs are detected
+        self._ids = itertools.count(int(time.time() * 1000))
+        self._last_id = next(self._ids)
+        self._ids_lock = threading.Lock()
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Deliver events on loop from now on."""
+        self._loop = loop
+
+    def publish(self, type: str, data: dict[str, Any] | None = None):
+        """Publish an event to every subscriber. Thread-safe and non-blocking."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        with self._ids_lock:
+            event = ChangeEvent(id=next(self._ids), type=type, data=data or {})
+            self._last_id = event.id
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(event)
+        else:
+            loop.call_soon_threadsafe(self._deliver, event)
+
+    def _deliver(self, event: ChangeEvent):
+        self._recent.append(event)
+        for subscription in self._subscribers:
+            subscription._offer(event)
+
+    def subscribe(self, last_event_id: int | None = None) -> Subscription:
+        """Start receiving events; call from the bus's event loop.
+
+        With last_event_id, events published since then are queued first if
+        they are still held, otherwise the subscriber starts with a resync.
+        """
+        subscription = Subscription(self.max_pending)
+        if last_event_id is not None:
+            # The first ID this process could replay from
+            first_held = self._recent[0].id if self._recent else self._last_id + 1
+            if last_event_id + 1 < first_held or last_event_id > self._last_id:
+                subscription._resync_from(self._last_id)
+            else:
+                for event in self._recent:
+                    if event.id > last_event_id:
+                        subscription._offer(event)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def close(self):
+        """End every subscription, e.g. at shutdown. Call from the event loop."""
+        for subscription in self._subscribers:
+            subscription._close()
+        self._subscribers.clear()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+# Global event bus
+event_bus = EventBus()
+
+
+def publish_todo(action: str, todo) -> None:
+    """Publish a todo.created/updated/deleted event carrying the todo as JSON.
+
+    todo is a Todo row or TodoResponse; deletions may pass just the ID.
+    """
+    if action == "deleted":
+        data = {"id": todo if isinstance(todo, int) else todo.id}
+    else:
+        data = TodoResponse.model_validate(todo).model_dump(mode="json")
+    event_bus.publish(f"todo.{action}", data)
@@ -0,0 +1,140 @@
+"""In-process cache for calendar event lookups."""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    """A cached value, the monotonic time it was fetched and its generation."""
+    value: Any
+    fetched_at: float
+    generation: int
+
+
+class EventCache:
+    """TTL cache with stale-while-revalidate and single-flight loading.
+
+    Entries younger than ``ttl`` are served directly. Entries older than
+    ``ttl`` but within ``ttl + stale_ttl`` are served as-is while a single
+    background refresh is started. Anything older is treated as a miss, and
+    concurrent misses for the same key share one call to the loader.
+
+    Every entry carries a generation that only changes when a load returns
+    a different value, so callers can tell whether data changed without
+    loading it.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: dict[Hashable, _Entry] = {}
+        self._inflight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="event-cache")
+        self._generation = 0
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for key, loading it if needed."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = now - entry.fetched_at
+                if age < self.ttl:
+                    self.hits += 1
+                    return entry.value
+                if age < self.ttl + self.stale_ttl:
+                    self.stale_hits += 1
+                    if key not in self._inflight:
+                        self._inflight[key] = Future()
+                        self._refresher.submit(self._load, key, loader)
+                    return entry.value
+
+            self.misses += 1
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if leader:
+            self._load(key, loader)
+        return future.result()
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]):
+        """Run the loader and publish its result to waiters."""
+        with self._lock:
+            future = self._inflight[key]
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+                self._inflight.pop(key, None)
+            logger.warning(f"Calendar cache load failed for {key}: {e}")
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self.refreshes += 1
+            previous = self._entries.get(key)
+            if previous is not None and previous.value == value:
+                generation = previous.generation
+            else:
+                self._generation += 1
+                generation = self._generation
+            self._entries[key] = _Entry(value=value, fetched_at=time.monotonic(), generation=generation)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+
+    def generation(self, key: Hashable, loader: Callable[[], Any]) -> int | None:
+        """Return the generation of the value get would serve, without loading it.
+
+        Returns None if get would have to load. A stale entry starts its
+        background refresh just as get would.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            age = time.monotonic() - entry.fetched_at
+            if age >= self.ttl + self.stale_ttl:
+                return None
+            if age >= self.ttl and key not in self._inflight:
+                self._inflight[key] = Future()
+                self._refresher.submit(self._load, key, loader)
+            return entry.generation
+
+    def invalidate(self, predicate: Callable[[Hashable], bool] | None = None):
+        """Drop cached entries, optionally only those whose key matches."""
+        with self._lock:
+            if predicate is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if predicate(k)]:
+                    del self._entries[key]
+
+    def stats(self) -> dict:
+        """Return hit/miss counters."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "errors": self.errors,
+                "entries": len(self._entries),
+            }
@@ -0,0 +1,70 @@
+"""Bounded thread pools for blocking integration calls."""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..database import ReadSessionLocal
+
+settings = get_settings()
+
+# Dedicated pool for Google Calendar calls, so a slow upstream can neither
+# stall the event loop nor exhaust Starlette's shared threadpool
+calendar_executor = ThreadPoolExecutor(
+    max_workers=settings.calendar_executor_workers,
+    thread_name_prefix="calendar",
+)
+
+# One thread per pooled read connection, so todo queries from async routes
+# and the Telegram bot never run on the event loop
+database_executor = ThreadPoolExecutor(
+    max_workers=settings.database_read_pool_size,
+    thread_name_prefix="db-read",
+)
+
+
+async def run_blocking(
+    executor: ThreadPoolExecutor,
+    func: Callable[..., Any],
+    *args,
+    timeout: float | None = None,
+    **kwargs,
+) -> Any:
+    """Run a blocking call on executor without blocking the event loop.
+
+    Raises asyncio.TimeoutError if the call does not finish within timeout.
+    The awaiting request is released immediately; a call still waiting in
+    the queue is cancelled, one already running is left to finish. The
+    call sees the caller's context variables, as with asyncio.to_thread.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    future = loop.run_in_executor(executor, functools.partial(context.run, func, *args, **kwargs))
+    return await asyncio.wait_for(future, timeout)
+
+
+async def run_read(func: Callable[[Session], Any]) -> Any:
+    """Run func(session) with a read-only session on the database executor.
+
+    The session is closed once func returns, so func should return loaded
+    rows or snapshots rather than anything that lazy-loads later.
+    """
+    def read():
+        db = ReadSessionLocal()
+        try:
+            return func(db)
+        finally:
+            db.close()
+
+    return await run_blocking(database_executor, read)
+
+
+def shutdown_executors():
+    """Stop accepting work and drop queued calls."""
+    calendar_executor.shutdown(wait=False, cancel_futures=True)
+    database_executor.shutdown(wait=False, cancel_futures=True)
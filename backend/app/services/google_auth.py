@@ -0,0 +1,170 @@
+"""Shared Google OAuth credential management."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ..config import get_settings
+from .executor import calendar_executor, run_blocking
+from .metrics import time_google_call
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# OAuth2 scopes for Google Calendar
+SCOPES = ["https://www.googleapis.com/auth/calendar.readonly"]
+
+# Token storage path
+TOKEN_PATH = Path(__file__).parent.parent.parent / "google_token.json"
+
+# How often the refresher checks back when there is nothing to refresh yet,
+# and how soon it retries after a failed refresh, in seconds
+IDLE_POLL_INTERVAL = 60
+RETRY_INTERVAL = 30
+
+
+class CredentialManager:
+    """Owns the one set of Google credentials every caller shares.
+
+    The token file is read once. Refreshes happen under a lock, so
+    concurrent callers never race or each hit the token endpoint, and the
+    background refresher renews the access token before it expires. Auth
+    state is answered from memory.
+    """
+
+    def __init__(self, token_path: Path = TOKEN_PATH):
+        self.token_path = token_path
+        self.credentials: Credentials | None = None
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _ensure_loaded(self):
+        """Read the token file on first use."""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if self.token_path.exists():
+                from google.oauth2.credentials import Credentials
+
+                try:
+                    with open(self.token_path, "r") as f:
+                        token_data = json.load(f)
+                    self.credentials = Credentials.from_authorized_user_info(token_data, SCOPES)
+                except Exception as e:
+                    logger.warning(f"Could not load Google token: {e}")
+                    self.credentials = None
+            self._loaded = True
+
+    def get(self) -> Credentials | None:
+        """Get the current credentials, without touching the network."""
+        self._ensure_loaded()
+        return self.credentials
+
+    def is_authenticated(self) -> bool:
+        """Check if we hold a usable access token."""
+        credentials = self.get()
+        return credentials is not None and credentials.valid
+
+    def has_credentials(self) -> bool:
+        """Check if we are signed in: the access token is usable or can be refreshed.
+
+        Unlike is_authenticated this stays true while the token is expired,
+        e.g. after a failed refresh with Google unreachable.
+        """
+        credentials = self.get()
+        return credentials is not None and (credentials.valid or bool(credentials.refresh_token))
+
+    def set(self, credentials: Credentials):
+        """Adopt newly issued credentials and persist them."""
+        with self._lock:
+            self.credentials = credentials
+            self._loaded = True
+            self._save()
+
+    def refresh_if_needed(self) -> bool:
+        """Refresh the access token if it expires within the refresh margin.
+
+        Blocking. Returns True if a refresh happened. Callers queued behind
+        an in-flight refresh see the new token and return without another.
+        """
+        self._ensure_loaded()
+        with self._lock:
+            if not self._needs_refresh():
+                return False
+            from google.auth.transport.requests import Request
+
+            with time_google_call("oauth2.token.refresh"):
+                self.credentials.refresh(Request())
+            self._save()
+            logger.info("Refreshed Google access token.")
+            return True
+
+    def _needs_refresh(self) -> bool:
+        credentials = self.credentials
+        if credentials is None or not credentials.refresh_token:
+            return False
+        if credentials.expiry is None:
+            return not credentials.valid
+        margin = timedelta(seconds=settings.google_token_refresh_margin)
+        return credentials.expiry - margin <= datetime.utcnow()
+
+    def seconds_until_refresh(self) -> float:
+        """How long the refresher can sleep before it has work to do."""
+        self._ensure_loaded()
+        credentials = self.credentials
+        if credentials is None or not credentials.refresh_token or credentials.expiry is None:
+            return IDLE_POLL_INTERVAL
+        margin = timedelta(seconds=settings.google_token_refresh_margin)
+        due = (credentials.expiry - margin - datetime.utcnow()).total_seconds()
+        # Check back periodically anyway, in case the token was replaced
+        return min(max(due, 0), IDLE_POLL_INTERVAL * 5)
+
+    def _save(self):
+        """Write the token file atomically; caller holds the lock."""
+        if not self.credentials:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.token_path.parent, prefix=".google_token.")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(self.credentials.to_json())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.token_path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    async def run_refresher(self):
+        """Keep the access token fresh until cancelled."""
+        # Read the token file, and import google-auth, off the event loop
+        await run_blocking(calendar_executor, self._ensure_loaded)
+        while True:
+            await asyncio.sleep(self.seconds_until_refresh())
+            try:
+                await run_blocking(
+                    calendar_executor,
+                    self.refresh_if_needed,
+                    timeout=settings.calendar_request_timeout,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Google token refresh failed: {e}")
+                await asyncio.sleep(RETRY_INTERVAL)
+
+
+# Global credential manager
+credential_manager = CredentialManager()
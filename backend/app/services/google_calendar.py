@@ -1,33 +1,109 @@
-"""Google Calendar API service."""
+"""Google Calendar API service.
 
-import os
-import json
-from datetime import datetime, timedelta
-from pathlib import Path
+The Google client libraries take a noticeable share of startup, so they
+are imported on first use, normally by the calendar watcher's first pass
+on the calendar executor once the app is serving.
+"""
 
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from __future__ import annotations
+
+import heapq
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+from zoneinfo import ZoneInfo
 
 from ..config import get_settings
 from ..schemas import CalendarEvent
+from .calendar_store import (
+    CalendarEventStore,
+    SyncedEvent,
+    decode_cursor,
+    encode_cursor,
+    event_sort_key,
+)
+from .event_cache import EventCache
+from .google_auth import SCOPES, credential_manager
+from .interval_index import IntervalIndex
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+    from google_auth_httplib2 import AuthorizedHttp
+    from google_auth_oauthlib.flow import Flow
+    from googleapiclient.http import HttpRequest
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Socket timeout for Calendar API requests, in seconds
+HTTP_TIMEOUT = 30
+
+# Largest page the Calendar API will return
+PAGE_SIZE = 2500
+
+# Partial response mask: only what _parse_event and recurrence expansion
+# read, plus paging tokens
+EVENT_FIELDS = (
+    "nextPageToken,nextSyncToken,"
+    "items(id,status,summary,location,description,start,end,"
+    "recurrence,recurringEventId,originalStartTime)"
+)
 
-# OAuth2 scopes for Google Calendar
-SCOPES = ["https://www.googleapis.com/auth/calendar.readonly"]
+# Longest window a full sync will cover, however many days are requested
+MAX_SYNC_DAYS = 3650
 
-# Token storage path
-TOKEN_PATH = Path(__file__).parent.parent.parent / "google_token.json"
+
+class EventPageIterator:
+    """Streams events().list pages, following nextPageToken.
+
+    Iterating yields one list of raw event items per page. Once exhausted,
+    sync_token holds the nextSyncToken from the final page.
+    """
+
+    def __init__(self, service, **params):
+        self.service = service
+        self.params = {"maxResults": PAGE_SIZE, "fields": EVENT_FIELDS, **params}
+        self.sync_token: str | None = None
+
+    def __iter__(self):
+        page_token = None
+        while True:
+            result = self.service.events().list(pageToken=page_token, **self.params).execute()
+            yield result.get("items", [])
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                self.sync_token = result.get("nextSyncToken")
+                return
 
 
 class GoogleCalendarService:
     """Service for interacting with Google Calendar API."""
 
     def __init__(self):
-        self.credentials: Credentials | None = None
-        self._load_credentials()
+        self.credential_manager = credential_manager
+        self._service = None
+        self._service_credentials: Credentials | None = None
+        self._service_lock = threading.Lock()
+        # httplib2.Http is not thread-safe, so each worker thread keeps its
+        # own keep-alive connection pool
+        self._local = threading.local()
+        self.store = CalendarEventStore()
+        self._sync_locks: dict[str, threading.Lock] = {}
+        self._sync_locks_guard = threading.Lock()
+        self._last_sync: dict[str, float] = {}
+        self.sync_errors: dict[str, str] = {}
+        self.pushed_calendars: set[str] = set()
+        self._fanout = ThreadPoolExecutor(
+            max_workers=settings.calendar_fanout_workers,
+            thread_name_prefix="calendar-fanout",
+        )
+        self.cache = EventCache(
+            ttl=settings.calendar_cache_ttl,
+            stale_ttl=settings.calendar_cache_stale_ttl,
+        )
 
     def _get_client_config(self) -> dict:
         """Build OAuth client config from environment variables."""
@@ -45,39 +121,31 @@ class GoogleCalendarService:
             }
         }
 
-    def _load_credentials(self):
-        """Load credentials from stored token file."""
-        if TOKEN_PATH.exists():
-            try:
-                with open(TOKEN_PATH, "r") as f:
-                    token_data = json.load(f)
-                self.credentials = Credentials.from_authorized_user_info(token_data, SCOPES)
-
-                # Refresh if expired
-                if self.credentials and self.credentials.expired and self.credentials.refresh_token:
-                    self.credentials.refresh(Request())
-                    self._save_credentials()
-            except Exception:
-                self.credentials = None
-
-    def _save_credentials(self):
-        """Save credentials to token file."""
-        if self.credentials:
-            with open(TOKEN_PATH, "w") as f:
-                f.write(self.credentials.to_json())
+    @property
+    def credentials(self) -> Credentials | None:
+        """The shared credentials, refreshed in the background."""
+        return self.credential_manager.get()
 
     def is_authenticated(self) -> bool:
-        """Check if we have valid credentials."""
-        return self.credentials is not None and self.credentials.valid
+        """Check if we are signed in, even if the access token needs a refresh.
 
-    def get_auth_url(self) -> str:
-        """Get the OAuth2 authorization URL."""
-        flow = Flow.from_client_config(
+        Callers go on to serve stored events when the refresh, or the sync
+        behind it, fails.
+        """
+        return self.credential_manager.has_credentials()
+
+    def _get_flow(self) -> Flow:
+        from google_auth_oauthlib.flow import Flow
+
+        return Flow.from_client_config(
             self._get_client_config(),
             scopes=SCOPES,
             redirect_uri=self._get_client_config()["web"]["redirect_uris"][0]
         )
-        auth_url, _ = flow.authorization_url(
+
+    def get_auth_url(self) -> str:
+        """Get the OAuth2 authorization URL."""
+        auth_url, _ = self._get_flow().authorization_url(
             access_type="offline",
             include_granted_scopes="true",
             prompt="consent"
@@ -86,60 +154,370 @@ class GoogleCalendarService:
 
     def handle_callback(self, code: str):
         """Handle OAuth2 callback and store credentials."""
-        flow = Flow.from_client_config(
-            self._get_client_config(),
-            scopes=SCOPES,
-            redirect_uri=self._get_client_config()["web"]["redirect_uris"][0]
-        )
+        flow = self._get_flow()
         flow.fetch_token(code=code)
-        self.credentials = flow.credentials
-        self._save_credentials()
+        self.credential_manager.set(flow.credentials)
+        self.cache.invalidate()
 
     def _get_service(self):
-        """Get the Google Calendar API service."""
+        """Get the Google Calendar API service.
+
+        The client is built once from the discovery document bundled with
+        googleapiclient and only rebuilt when the credentials object changes.
+        """
         if not self.is_authenticated():
             raise Exception("Not authenticated with Google Calendar")
-        return build("calendar", "v3", credentials=self.credentials)
+        if not self.credential_manager.is_authenticated():
+            # Expired, e.g. the refresher's last attempt failed; try once more
+            self.credential_manager.refresh_if_needed()
+        from googleapiclient.discovery import build
+
+        with self._service_lock:
+            if self._service is None or self._service_credentials is not self.credentials:
+                self._service = build(
+                    "calendar",
+                    "v3",
+                    http=self._get_http(),
+                    requestBuilder=self._build_request,
+                    static_discovery=True,
+                    cache_discovery=False,
+                )
+                self._service_credentials = self.credentials
+            return self._service
+
+    def _get_http(self) -> AuthorizedHttp:
+        """Get this thread's authorized, keep-alive HTTP transport."""
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+
+        http = getattr(self._local, "http", None)
+        if http is None or http.credentials is not self.credentials:
+            transport = getattr(self._local, "transport", None)
+            if transport is None:
+                transport = httplib2.Http(timeout=HTTP_TIMEOUT)
+                self._local.transport = transport
+            http = AuthorizedHttp(self.credentials, http=transport)
+            self._local.http = http
+        return http
+
+    def _build_request(self, http, *args, **kwargs) -> HttpRequest:
+        """Bind each API request to the calling thread's transport."""
+        from .google_http import TimedHttpRequest
+
+        return TimedHttpRequest(self._get_http(), *args, **kwargs)
 
     def get_upcoming_events(self, days: int = 7) -> list[CalendarEvent]:
         """Get upcoming calendar events for the next N days."""
-        service = self._get_service()
+        return self.cache.get(self._upcoming_key(days), lambda: self._fetch_upcoming_events(days))
+
+    def upcoming_events_generation(self, days: int = 7) -> int | None:
+        """Cache generation get_upcoming_events would serve, or None if it must load."""
+        return self.cache.generation(self._upcoming_key(days), lambda: self._fetch_upcoming_events(days))
 
+    @staticmethod
+    def _upcoming_key(days: int) -> tuple:
+        return (tuple(settings.calendar_ids), "upcoming", days)
+
+    def get_upcoming_events_page(
+        self, days: int, limit: int, cursor: str | None = None
+    ) -> tuple[list[CalendarEvent], str | None]:
+        """Get one page of upcoming events and the cursor for the next page.
+
+        Each calendar contributes at most limit events after the cursor, so
+        the first limit of their merge is exactly the next page. Raises
+        InvalidCursorError if the cursor is malformed.
+        """
+        after = decode_cursor(cursor) if cursor else None
         now = datetime.utcnow()
-        time_min = now.isoformat() + "Z"
-        time_max = (now + timedelta(days=days)).isoformat() + "Z"
+        time_max = now + timedelta(days=days)
 
-        events_result = service.events().list(
-            calendarId=settings.google_calendar_id,
-            timeMin=time_min,
-            timeMax=time_max,
-            maxResults=50,
-            singleEvents=True,
-            orderBy="startTime"
-        ).execute()
+        def query_page(calendar_id: str) -> tuple[list[CalendarEvent], bool]:
+            self._sync_quietly(calendar_id, time_max)
+            if after is None:
+                return self.store.query_page(calendar_id, now, time_max, limit)
+            # Events tied with the cursor on (start, id) belong to this page
+            # only in calendars ordered after the cursor's calendar
+            after_start, after_id, after_calendar = after
+            return self.store.query_page(
+                calendar_id, now, time_max, limit,
+                after=(after_start, after_id),
+                inclusive=calendar_id > after_calendar,
+            )
 
-        events = events_result.get("items", [])
-        return [self._parse_event(event) for event in events]
+        pages = self._for_each_calendar(query_page)
+        events = list(heapq.merge(*(page for page, _ in pages), key=event_sort_key))
+        has_more = len(events) > limit or any(more for _, more in pages)
+        events = events[:limit]
+        return events, encode_cursor(events[-1]) if has_more and events else None
 
     def get_today_events(self) -> list[CalendarEvent]:
         """Get today's calendar events."""
-        service = self._get_service()
+        return self.cache.get(self._today_key(), self._fetch_today_events)
+
+    def today_events_generation(self) -> int | None:
+        """Cache generation get_today_events would serve, or None if it must load."""
+        return self.cache.generation(self._today_key(), self._fetch_today_events)
+
+    @staticmethod
+    def _today_key() -> tuple:
+        today = datetime.utcnow().date()
+        return (tuple(settings.calendar_ids), "today", today.isoformat())
+
+    def get_event_index(self, time_min: datetime, time_max: datetime) -> IntervalIndex:
+        """Get an interval index over every calendar covering [time_min, time_max).
+
+        Bounds are aware datetimes. The index is built over whole days so
+        nearby queries share one cached index.
+        """
+        day_min = time_min.astimezone(timezone.utc).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+        day_max = time_max.astimezone(timezone.utc).replace(tzinfo=None, hour=0, minute=0, second=0, microsecond=0)
+        day_max += timedelta(days=1)
+        # All-day events are anchored to the household zone, so widen by a
+        # day on each side to catch any whose local date straddles UTC
+        window_min, window_max = day_min - timedelta(days=1), day_max + timedelta(days=1)
+
+        def build() -> IntervalIndex:
+            events = self._sync_and_query(window_min, window_max)
+            return IntervalIndex(events, ZoneInfo(settings.calendar_time_zone))
+
+        key = (tuple(settings.calendar_ids), "index", day_min.date().isoformat(), day_max.date().isoformat())
+        return self.cache.get(key, build)
+
+    def get_events_between(self, time_min: datetime, time_max: datetime) -> list[CalendarEvent]:
+        """Sync every calendar and get events overlapping [time_min, time_max), uncached.
 
+        For callers keeping results of their own, like the dashboard snapshot.
+        """
+        return self._sync_and_query(time_min, time_max)
+
+    def _fetch_upcoming_events(self, days: int) -> list[CalendarEvent]:
+        """Sync the local store and read upcoming events for the next N days."""
+        now = datetime.utcnow()
+        return self._sync_and_query(now, now + timedelta(days=days))
+
+    def _fetch_today_events(self) -> list[CalendarEvent]:
+        """Sync the local store and read today's events."""
         now = datetime.utcnow()
         start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_of_day = start_of_day + timedelta(days=1)
-
-        events_result = service.events().list(
-            calendarId=settings.google_calendar_id,
-            timeMin=start_of_day.isoformat() + "Z",
-            timeMax=end_of_day.isoformat() + "Z",
-            maxResults=50,
-            singleEvents=True,
-            orderBy="startTime"
-        ).execute()
-
-        events = events_result.get("items", [])
-        return [self._parse_event(event) for event in events]
+        return self._sync_and_query(start_of_day, start_of_day + timedelta(days=1))
+
+    def _sync_and_query(self, time_min: datetime, time_max: datetime) -> list[CalendarEvent]:
+        """Bring every calendar up to date, then merge their events by start."""
+        def query(calendar_id: str) -> list[CalendarEvent]:
+            self._sync_quietly(calendar_id, time_max)
+            return self.store.query(calendar_id, time_min, time_max)
+
+        return list(heapq.merge(*self._for_each_calendar(query), key=event_sort_key))
+
+    def _for_each_calendar(self, func) -> list:
+        """Run func for every configured calendar on the fan-out pool.
+
+        A calendar that fails is logged, recorded in sync_errors and left
+        out of the results; the call only fails if every calendar does.
+        """
+        calendar_ids = settings.calendar_ids
+        if len(calendar_ids) == 1:
+            futures = None
+        else:
+            futures = {cid: self._fanout.submit(func, cid) for cid in calendar_ids}
+
+        results, first_error = [], None
+        for calendar_id in calendar_ids:
+            try:
+                result = futures[calendar_id].result() if futures else func(calendar_id)
+            except Exception as e:
+                logger.warning(f"Calendar {calendar_id} failed: {e}")
+                self.sync_errors[calendar_id] = str(e)
+                first_error = first_error or e
+                continue
+            results.append(result)
+
+        if not results and first_error is not None:
+            raise first_error
+        return results
+
+    def _sync_quietly(self, calendar_id: str, until: datetime):
+        """Sync, but serve events from the last good sync if Google is unreachable."""
+        try:
+            self.sync(calendar_id, until=until)
+            self.sync_errors.pop(calendar_id, None)
+        except Exception as e:
+            self.sync_errors[calendar_id] = str(e)
+            if self.store.get_state(calendar_id) is None:
+                raise
+            logger.warning(f"Calendar {calendar_id} sync failed, serving stored events: {e}")
+
+    def invalidate_calendar(self, calendar_id: str):
+        """Drop cached lookups that include a calendar."""
+        self.cache.invalidate(lambda key: calendar_id in key[0])
+
+    def _get_sync_lock(self, calendar_id: str) -> threading.Lock:
+        with self._sync_locks_guard:
+            return self._sync_locks.setdefault(calendar_id, threading.Lock())
+
+    def sync(self, calendar_id: str, force: bool = False, until: datetime | None = None):
+        """Incrementally sync a calendar into the local store.
+
+        Runs a full sync when there is no sync token, when Google rejects the
+        token with 410 Gone, when until lies beyond the synced window, or once
+        a day so the window follows the current date. Calls within the cache
+        TTL of the last sync, or for calendars kept current by a push
+        channel, are skipped unless force is set.
+        """
+        from googleapiclient.errors import HttpError
+
+        with self._get_sync_lock(calendar_id):
+            state = self.store.get_state(calendar_id)
+            window_end = self._sync_window_end(until)
+            beyond_window = (
+                state is not None
+                and until is not None
+                and (state.synced_until is None or state.synced_until < min(until, window_end))
+            )
+
+            today = datetime.utcnow().date()
+            last_sync = self._last_sync.get(calendar_id)
+            recently_synced = last_sync and time.monotonic() - last_sync < settings.calendar_cache_ttl
+            # A push channel resyncs this calendar whenever it changes
+            pushed = (
+                calendar_id in self.pushed_calendars
+                and state is not None
+                and state.full_synced_at is not None
+                and state.full_synced_at.date() == today
+            )
+            if not force and (recently_synced or pushed) and not beyond_window:
+                return
+
+            needs_full = (
+                state is None
+                or not state.sync_token
+                or state.full_synced_at is None
+                or state.full_synced_at.date() != today
+                or beyond_window
+            )
+
+            if not needs_full:
+                try:
+                    self._incremental_sync(calendar_id, state.sync_token)
+                except HttpError as e:
+                    if e.resp.status != 410:
+                        raise
+                    logger.info(f"Sync token for {calendar_id} expired, running full sync")
+                    self.store.clear_sync_token(calendar_id)
+                    needs_full = True
+
+            if needs_full:
+                # Never shrink a window a previous request already widened
+                if state is not None and state.synced_until and state.synced_until > window_end:
+                    window_end = min(state.synced_until, self._sync_window_end(None, MAX_SYNC_DAYS))
+                self._full_sync(calendar_id, window_end)
+
+            self._last_sync[calendar_id] = time.monotonic()
+
+    @staticmethod
+    def _sync_window_end(until: datetime | None, days: int | None = None) -> datetime:
+        """End of the window a full sync should cover."""
+        start_of_day = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        window_end = start_of_day + timedelta(days=days or settings.calendar_sync_days)
+        if until is not None and until > window_end:
+            window_end = min(
+                until.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1),
+                start_of_day + timedelta(days=MAX_SYNC_DAYS),
+            )
+        return window_end
+
+    def _full_sync(self, calendar_id: str, window_end: datetime):
+        """Stage the whole sync window page by page, then swap it in for what the store held.
+
+        Each page is written in a transaction of its own as it arrives, so
+        neither the database write lock nor the fetched pages are held
+        across calls to Google. Queries keep seeing the previous events
+        until the swap.
+        """
+        start_of_day = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        pages = EventPageIterator(
+            self._get_service(),
+            calendarId=calendar_id,
+            timeMin=(start_of_day - timedelta(days=1)).isoformat() + "Z",
+            timeMax=window_end.isoformat() + "Z",
+        )
+        # Left over if an earlier full sync failed part way
+        self.store.stage(calendar_id, lambda writer: writer.clear())
+        for items in pages:
+            upserts, _ = self._to_synced_events(items)
+            self.store.stage(calendar_id, lambda writer: writer.apply_page(upserts, []))
+
+        def swap(writer):
+            writer.replace_with_staged()
+            writer.finish(pages.sync_token, full=True, synced_until=window_end)
+
+        self.store.write(calendar_id, swap)
+
+    def _incremental_sync(self, calendar_id: str, sync_token: str):
+        """Apply changes since the last sync token to the store, page by page.
+
+        The new token is only recorded after the last page, so a sync that
+        fails part way starts over from the old one; changes are upserts and
+        deletes, so applying a page twice is harmless.
+        """
+        pages = EventPageIterator(
+            self._get_service(),
+            calendarId=calendar_id,
+            syncToken=sync_token,
+        )
+        for items in pages:
+            upserts, deleted_ids = self._to_synced_events(items)
+            self.store.write(calendar_id, lambda writer: writer.apply_page(upserts, deleted_ids))
+        self.store.write(calendar_id, lambda writer: writer.finish(pages.sync_token or sync_token))
+
+    def _to_synced_events(self, items: list[dict]) -> tuple[list[SyncedEvent], list[str]]:
+        """Split a page of raw events into rows to store and IDs to delete.
+
+        Recurring series arrive as masters (singleEvents is off) and are
+        expanded locally. A cancelled occurrence of a series is kept as a
+        tombstone; any other cancelled event is deleted.
+        """
+        upserts: list[SyncedEvent] = []
+        deleted_ids: list[str] = []
+
+        for item in items:
+            recurring_event_id = item.get("recurringEventId")
+            original_start = None
+            if recurring_event_id and "originalStartTime" in item:
+                original_start = self._parse_time(item["originalStartTime"])
+
+            if item.get("status") == "cancelled":
+                if recurring_event_id and original_start is not None:
+                    all_day = "date" in item["originalStartTime"]
+                    upserts.append(SyncedEvent(
+                        event=CalendarEvent(
+                            id=item["id"], title="", start=original_start,
+                            end=original_start, all_day=all_day,
+                        ),
+                        recurring_event_id=recurring_event_id,
+                        original_start=original_start,
+                        cancelled=True,
+                    ))
+                else:
+                    deleted_ids.append(item["id"])
+                continue
+
+            upserts.append(SyncedEvent(
+                event=self._parse_event(item),
+                recurrence=item.get("recurrence"),
+                time_zone=item.get("start", {}).get("timeZone"),
+                recurring_event_id=recurring_event_id,
+                original_start=original_start,
+            ))
+
+        return upserts, deleted_ids
+
+    @staticmethod
+    def _parse_time(value: dict) -> datetime:
+        """Parse a Google {date} or {dateTime} object."""
+        if "date" in value:
+            return datetime.fromisoformat(value["date"])
+        return datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00"))
 
     def _parse_event(self, event: dict) -> CalendarEvent:
         """Parse a Google Calendar event into our schema."""
@@ -0,0 +1,17 @@
+"""Transport pieces of the Google API client.
+
+Kept apart from google_calendar so googleapiclient is only imported once
+a calendar is actually used, not when the app starts.
+"""
+
+from googleapiclient.http import HttpRequest
+
+from .metrics import time_google_call
+
+
+class TimedHttpRequest(HttpRequest):
+    """An API request whose executions are timed in the metrics."""
+
+    def execute(self, *args, **kwargs):
+        with time_google_call(self.methodId or "unknown"):
+            return super().execute(*args, **kwargs)
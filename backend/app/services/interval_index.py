@@ -0,0 +1,136 @@
+"""Interval index for free/busy and conflict queries over calendar events."""
+
+import heapq
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone, tzinfo
+
+from ..schemas import CalendarEvent
+
+
+def event_bounds(event: CalendarEvent, zone: tzinfo) -> tuple[datetime, datetime]:
+    """Get an event's start and end as aware UTC datetimes.
+
+    All-day events carry naive dates, so they are anchored to midnight in
+    zone; timed events are already aware and just converted.
+    """
+    start, end = event.start, event.end
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=zone)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=zone)
+    return start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+
+
+class IntervalIndex:
+    """Static augmented interval tree over a set of events.
+
+    Events are sorted by start and laid out as an implicit balanced binary
+    tree over that array: the node for a slice [lo, hi) is its midpoint, and
+    max_end holds the latest end anywhere in the slice. Overlap queries skip
+    every subtree that ends before the query starts or begins after it ends,
+    so they cost O(log n + k) for k matches regardless of event length.
+    """
+
+    def __init__(self, events: list[CalendarEvent], zone: tzinfo = timezone.utc):
+        bounded = []
+        for event in events:
+            start, end = event_bounds(event, zone)
+            bounded.append((start.timestamp(), end.timestamp(), event))
+        bounded.sort(key=lambda item: (item[0], item[1]))
+
+        self.starts = [item[0] for item in bounded]
+        self.ends = [item[1] for item in bounded]
+        self.events = [item[2] for item in bounded]
+        self.max_end = [0.0] * len(bounded)
+        self._build(0, len(bounded))
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def _build(self, lo: int, hi: int) -> float:
+        if lo >= hi:
+            return float("-inf")
+        mid = (lo + hi) // 2
+        latest = max(self.ends[mid], self._build(lo, mid), self._build(mid + 1, hi))
+        self.max_end[mid] = latest
+        return latest
+
+    def _overlapping_indexes(self, start: float, end: float) -> list[int]:
+        """Indexes of events overlapping [start, end), in start order."""
+        found = []
+        # Nothing at or after this index starts before the query ends
+        stop = bisect_left(self.starts, end)
+        stack = [(0, len(self.events))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi or lo >= stop:
+                continue
+            mid = (lo + hi) // 2
+            if self.max_end[mid] <= start:
+                continue
+            if mid < stop and self.ends[mid] > start:
+                found.append(mid)
+            stack.append((lo, mid))
+            stack.append((mid + 1, hi))
+        found.sort()
+        return found
+
+    def overlapping(self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        """Events overlapping [start, end), ordered by start."""
+        indexes = self._overlapping_indexes(start.timestamp(), end.timestamp())
+        return [self.events[i] for i in indexes]
+
+    def busy(self, start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+        """Merged busy periods within [start, end)."""
+        lower, upper = start.timestamp(), end.timestamp()
+        merged: list[list[float]] = []
+        for i in self._overlapping_indexes(lower, upper):
+            slot_start, slot_end = max(self.starts[i], lower), min(self.ends[i], upper)
+            if merged and slot_start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], slot_end)
+            else:
+                merged.append([slot_start, slot_end])
+        return [(_from_ts(a), _from_ts(b)) for a, b in merged]
+
+    def free(
+        self, start: datetime, end: datetime, min_duration: timedelta = timedelta(0)
+    ) -> list[tuple[datetime, datetime]]:
+        """Gaps within [start, end) longer than min_duration not covered by any event."""
+        gaps = []
+        cursor = start.astimezone(timezone.utc)
+        end = end.astimezone(timezone.utc)
+        for busy_start, busy_end in self.busy(start, end):
+            if busy_start - cursor > min_duration:
+                gaps.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+        if end - cursor > min_duration:
+            gaps.append((cursor, end))
+        return gaps
+
+    def conflicts(
+        self, start: datetime, end: datetime
+    ) -> list[tuple[CalendarEvent, CalendarEvent, datetime, datetime]]:
+        """Pairs of events that overlap each other within [start, end).
+
+        A sweep over events in start order keeps a heap of those still in
+        progress, so the cost is O(n log n + k) for k conflicting pairs.
+        Each pair is reported once with its overlapping period.
+        """
+        lower, upper = start.timestamp(), end.timestamp()
+        active: list[tuple[float, int]] = []
+        pairs = []
+        for i in self._overlapping_indexes(lower, upper):
+            event_start = self.starts[i]
+            while active and active[0][0] <= event_start:
+                heapq.heappop(active)
+            for active_end, j in active:
+                overlap_start = max(event_start, lower)
+                overlap_end = min(active_end, self.ends[i], upper)
+                if overlap_end > overlap_start:
+                    pairs.append((self.events[j], self.events[i], _from_ts(overlap_start), _from_ts(overlap_end)))
+            heapq.heappush(active, (self.ends[i], i))
+        return pairs
+
+
+def _from_ts(value: float) -> datetime:
+    return datetime.fromtimestamp(value, tz=timezone.utc)
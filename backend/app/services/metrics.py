@@ -0,0 +1,277 @@
+"""In-process metrics exposed in the Prometheus text format on /metrics.
+
+Nothing here is hooked in unless metrics_enabled is set: main.py adds the
+middleware and route, database.py the query listeners and the Telegram
+bot the handler timers only then, so a disabled server pays nothing.
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from ..config import get_settings
+
+settings = get_settings()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans a cached read through a slow Google call
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class Counter:
+    """A monotonically increasing count per label set."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in values
+        ]
+
+
+class Histogram:
+    """Observations per label set, counted into fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Per label set: a count per bucket plus one for +Inf, and the sum
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(labels) or self._values.setdefault(
+                labels, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = sorted((labels, (list(counts), total[0])) for labels, (counts, total) in self._values.items())
+        lines = []
+        for labels, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                bucket_labels = _format_labels(self.labelnames, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """The metrics /metrics reports, in registration order."""
+
+    def __init__(self):
+        self.metrics: list[Counter | Histogram] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+class RequestQueries:
+    """Queries run on behalf of one HTTP request, wherever they ran."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Set by the middleware for the duration of a request; run_blocking and the
+# write queue carry it to the threads doing the request's queries
+current_request_queries: ContextVar[RequestQueries | None] = ContextVar("current_request_queries", default=None)
+
+
+def record_query(engine_name: str, seconds: float):
+    """Record one statement executed on engine_name, against the current request if any."""
+    QUERY_DURATION.observe(seconds, engine_name)
+    queries = current_request_queries.get()
+    if queries is not None:
+        queries.count += 1
+        queries.seconds += seconds
+
+
+@contextmanager
+def time_google_call(method: str):
+    """Time a Google API call, counting failures by HTTP status or exception type."""
+    if not settings.metrics_enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        status = getattr(getattr(e, "resp", None), "status", None)
+        GOOGLE_ERRORS.inc(method, str(status) if status else type(e).__name__)
+        raise
+    finally:
+        GOOGLE_DURATION.observe(time.perf_counter() - start, method)
+
+
+def timed_handler(command: str, callback):
+    """Wrap a Telegram handler callback to record its latency and failures."""
+
+    @functools.wraps(callback)
+    async def timed(update, context):
+        start = time.perf_counter()
+        try:
+            return await callback(update, context)
+        except Exception:
+            BOT_ERRORS.inc(command)
+            raise
+        finally:
+            BOT_DURATION.observe(time.perf_counter() - start, command)
+
+    return timed
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and database use.
+
+    Latency runs until the response headers are sent, so streamed
+    responses such as /api/stream report their time to first byte rather
+    than how long the client stayed connected.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        started = False
+        queries = RequestQueries()
+        token = current_request_queries.set(queries)
+
+        async def send_timed(message):
+            nonlocal started
+            if message["type"] == "http.response.start" and not started:
+                started = True
+                REQUEST_DURATION.observe(
+                    time.perf_counter() - start, scope["method"], _route(scope), str(message["status"])
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            current_request_queries.reset(token)
+            route = _route(scope)
+            if not started:
+                REQUEST_DURATION.observe(time.perf_counter() - start, scope["method"], route, "500")
+            REQUEST_QUERIES.observe(queries.count, route)
+            REQUEST_QUERY_TIME.observe(queries.seconds, route)
+
+
+def _route(scope) -> str:
+    # The route template rather than the raw path, so IDs don't each get a series
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+# Global instances
+registry = MetricsRegistry()
+REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending its response headers.",
+    ("method", "route", "status"),
+))
+REQUEST_QUERIES = registry.register(Histogram(
+    "http_request_db_queries",
+    "Database statements executed per request.",
+    ("route",),
+    QUERY_COUNT_BUCKETS,
+))
+REQUEST_QUERY_TIME = registry.register(Histogram(
+    "http_request_db_query_seconds",
+    "Time spent executing database statements per request.",
+    ("route",),
+))
+QUERY_DURATION = registry.register(Histogram(
+    "db_query_duration_seconds",
+    "Database statement execution time, by engine.",
+    ("engine",),
+))
+GOOGLE_DURATION = registry.register(Histogram(
+    "google_api_request_duration_seconds",
+    "Google API call latency, by API method.",
+    ("method",),
+))
+GOOGLE_ERRORS = registry.register(Counter(
+    "google_api_errors_total",
+    "Failed Google API calls, by API method and HTTP status or exception type.",
+    ("method", "error"),
+))
+BOT_DURATION = registry.register(Histogram(
+    "telegram_handler_duration_seconds",
+    "Telegram command and message handler latency.",
+    ("command",),
+))
+BOT_ERRORS = registry.register(Counter(
+    "telegram_handler_errors_total",
+    "Telegram handlers that raised.",
+    ("command",),
+))
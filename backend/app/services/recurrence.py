@@ -0,0 +1,114 @@
+"""Local expansion of recurring calendar events."""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterator
+from zoneinfo import ZoneInfo
+
+from dateutil.relativedelta import relativedelta
+from dateutil.rrule import rruleset, rrulestr
+
+logger = logging.getLogger(__name__)
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """Normalize a datetime to naive UTC; naive values are returned unchanged."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def instance_id(master_id: str, start: datetime, all_day: bool) -> str:
+    """Build the instance ID Google uses for an occurrence of a series."""
+    if all_day:
+        return f"{master_id}_{start:%Y%m%d}"
+    return f"{master_id}_{to_utc_naive(start):%Y%m%dT%H%M%SZ}"
+
+
+# Steps that can be skipped without changing which occurrences a rule
+# produces, as (timedelta, months) per unit of INTERVAL
+_STEPS = {
+    "DAILY": (timedelta(days=1), 0),
+    "WEEKLY": (timedelta(weeks=1), 0),
+    "MONTHLY": (None, 1),
+    "YEARLY": (None, 12),
+}
+
+
+@lru_cache(maxsize=512)
+def _compile(recurrence: str, dtstart: datetime) -> rruleset:
+    """Parse RRULE/RDATE/EXDATE lines once per series start."""
+    return rrulestr(recurrence, dtstart=dtstart, forceset=True, tzids=ZoneInfo)
+
+
+def _rebase(recurrence: str, dtstart: datetime, after: datetime) -> datetime:
+    """Move a series start forward by whole intervals to just before after.
+
+    dateutil iterates every occurrence from DTSTART, so a daily series that
+    began years ago costs thousands of steps per lookup. Skipping whole
+    intervals keeps the rule's phase, so the occurrences in the window are
+    unchanged. Rules with COUNT or BYSETPOS depend on the true start and are
+    never rebased, nor are monthly or yearly starts after the 28th, which
+    could land on a shorter month.
+    """
+    rules = [line[len("RRULE:"):] for line in recurrence.splitlines() if line.startswith("RRULE:")]
+    if len(rules) != 1:
+        return dtstart
+
+    parts = dict(part.split("=", 1) for part in rules[0].split(";") if "=" in part)
+    step = _STEPS.get(parts.get("FREQ", ""))
+    if step is None or "COUNT" in parts or "BYSETPOS" in parts:
+        return dtstart
+    interval = int(parts.get("INTERVAL", "1"))
+    period, months = step
+
+    # Always leave one interval of slack so DST shifts can't skip anything
+    if period is not None:
+        skipped = (after - dtstart) // (period * interval) - 1
+        return dtstart + period * interval * skipped if skipped > 0 else dtstart
+
+    if dtstart.day > 28:
+        return dtstart
+    elapsed = (after.year - dtstart.year) * 12 + after.month - dtstart.month
+    skipped = elapsed // (months * interval) - 1
+    return dtstart + relativedelta(months=months * interval * skipped) if skipped > 0 else dtstart
+
+
+def expand(
+    recurrence: str,
+    start: datetime,
+    all_day: bool,
+    time_zone: str | None,
+    window_start: datetime,
+    window_end: datetime,
+) -> Iterator[datetime]:
+    """Yield occurrence starts of a series that begin in [window_start, window_end).
+
+    start is the series' first occurrence as stored (naive UTC for timed
+    events, naive midnight for all-day ones). Timed series are expanded in
+    time_zone so occurrences keep their wall-clock time across DST changes.
+    Window bounds and yielded values use the same naive convention as start.
+    """
+    if all_day:
+        dtstart = start
+        after, before = window_start, window_end
+    else:
+        zone = ZoneInfo(time_zone) if time_zone else timezone.utc
+        dtstart = start.replace(tzinfo=timezone.utc).astimezone(zone)
+        after = window_start.replace(tzinfo=timezone.utc)
+        before = window_end.replace(tzinfo=timezone.utc)
+
+    try:
+        rules = _compile(recurrence, _rebase(recurrence, dtstart, after))
+    except Exception as e:
+        logger.warning(f"Could not parse recurrence {recurrence!r}: {e}")
+        if window_start <= start < window_end:
+            yield start
+        return
+
+    for occurrence in rules.xafter(after, inc=True):
+        if occurrence >= before:
+            return
+        yield occurrence if all_day else to_utc_naive(occurrence)
+
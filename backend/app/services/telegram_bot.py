@@ -1,24 +1,36 @@
-"""Telegram bot service for mobile todo input."""
+"""Telegram bot service for mobile todo input.
+
+python-telegram-bot is only imported when the bot starts, so a server
+without a bot token never loads it.
+"""
+
+from __future__ import annotations
 
 import re
 import asyncio
+import importlib
 import logging
-from telegram import Update, Bot
-from telegram.ext import (
-    Application,
-    CommandHandler,
-    MessageHandler,
-    ContextTypes,
-    filters,
-)
+from typing import TYPE_CHECKING
 
 from ..config import get_settings
-from ..database import SessionLocal
 from ..models import Todo
+from ..schemas import TodoResponse
+from .event_bus import publish_todo
+from .executor import run_read
+from .metrics import timed_handler
+from .todo_repository import TodoNotFoundError, TodoRepository
+from .write_queue import write_queue
+
+if TYPE_CHECKING:
+    from telegram import Bot, Update
+    from telegram.ext import Application, ContextTypes
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Matches listed by /find; more than fit on a phone screen aren't useful
+FIND_LIMIT = 15
+
 
 class TelegramBotService:
     """Service for handling Telegram bot interactions."""
@@ -49,6 +61,7 @@ class TelegramBotService:
             "/add <task> - Add a new todo\n"
             "/list - Show all pending todos\n"
             "/all - Show all todos (including completed)\n"
+            "/find <text> - Search todos\n"
             "/done <id> - Mark a todo as complete\n"
             "/delete <id> - Delete a todo\n"
             "/help - Show this message\n\n"
@@ -73,7 +86,7 @@ class TelegramBotService:
             return
 
         title = " ".join(context.args)
-        todo = self._create_todo(title, user.username or str(user.id))
+        todo = await self._create_todo(title, user.username or str(user.id))
 
         await update.message.reply_text(f"Added todo #{todo.id}: {todo.title}")
 
@@ -84,7 +97,7 @@ class TelegramBotService:
             await update.message.reply_text("You're not authorized to use this bot.")
             return
 
-        todos = self._get_todos(completed=False)
+        todos = await self._get_todos(completed=False)
 
         if not todos:
             await update.message.reply_text("No pending todos!")
@@ -103,7 +116,7 @@ class TelegramBotService:
             await update.message.reply_text("You're not authorized to use this bot.")
             return
 
-        todos = self._get_todos()
+        todos = await self._get_todos()
 
         if not todos:
             await update.message.reply_text("No todos found!")
@@ -116,6 +129,33 @@ class TelegramBotService:
 
         await update.message.reply_text(message)
 
+    async def find_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /find command - search todo titles."""
+        user = update.effective_user
+        if not self.is_authorized(user.id):
+            await update.message.reply_text("You're not authorized to use this bot.")
+            return
+
+        if not context.args:
+            await update.message.reply_text("Please provide something to search for. Example: /find milk")
+            return
+
+        text = " ".join(context.args)
+        todos, has_more = await self._search_todos(text)
+
+        if not todos:
+            await update.message.reply_text(f"No todos match \"{text}\".")
+            return
+
+        message = f"Todos matching \"{text}\":\n\n"
+        for todo in todos:
+            status = "Completed" if todo.completed else "Pending"
+            message += f"#{todo.id} [{status}] - {todo.title}\n"
+        if has_more:
+            message += f"\nShowing the best {len(todos)} matches; add words to narrow it down."
+
+        await update.message.reply_text(message)
+
     async def done_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /done command."""
         user = update.effective_user
@@ -133,7 +173,7 @@ class TelegramBotService:
             await update.message.reply_text("Invalid ID. Please provide a number.")
             return
 
-        todo = self._complete_todo(todo_id)
+        todo = await self._complete_todo(todo_id)
         if todo:
             await update.message.reply_text(f"Completed: {todo.title}")
         else:
@@ -156,7 +196,7 @@ class TelegramBotService:
             await update.message.reply_text("Invalid ID. Please provide a number.")
             return
 
-        if self._delete_todo(todo_id):
+        if await self._delete_todo(todo_id):
             await update.message.reply_text(f"Deleted todo #{todo_id}")
         else:
             await update.message.reply_text(f"Todo #{todo_id} not found.")
@@ -182,77 +222,70 @@ class TelegramBotService:
             if match:
                 title = match.group(1).strip()
                 if title:
-                    todo = self._create_todo(title, user.username or str(user.id))
+                    todo = await self._create_todo(title, user.username or str(user.id))
                     await update.message.reply_text(f"Added todo #{todo.id}: {todo.title}")
                     return
 
-    def _create_todo(self, title: str, created_by: str) -> Todo:
+    async def _create_todo(self, title: str, created_by: str) -> TodoResponse:
         """Create a new todo in the database."""
-        db = SessionLocal()
-        try:
-            todo = Todo(title=title, created_by=created_by)
-            db.add(todo)
-            db.commit()
-            db.refresh(todo)
-            return todo
-        finally:
-            db.close()
-
-    def _get_todos(self, completed: bool | None = None) -> list[Todo]:
+        todo = await write_queue.run(lambda db: TodoRepository(db).create(title, created_by))
+        publish_todo("created", todo)
+        return todo
+
+    async def _get_todos(self, completed: bool | None = None) -> list[Todo]:
         """Get todos from the database."""
-        db = SessionLocal()
-        try:
-            query = db.query(Todo)
-            if completed is not None:
-                query = query.filter(Todo.completed == completed)
-            return query.order_by(Todo.created_at.desc()).all()
-        finally:
-            db.close()
-
-    def _complete_todo(self, todo_id: int) -> Todo | None:
+        todos, _ = await run_read(lambda db: TodoRepository(db).query_page(completed))
+        return todos
+
+    async def _search_todos(self, text: str) -> tuple[list[Todo], bool]:
+        """Search todo titles, best match first."""
+        return await run_read(lambda db: TodoRepository(db).search(text, limit=FIND_LIMIT))
+
+    async def _complete_todo(self, todo_id: int) -> TodoResponse | None:
         """Mark a todo as complete."""
-        db = SessionLocal()
         try:
-            todo = db.query(Todo).filter(Todo.id == todo_id).first()
-            if todo:
-                todo.completed = True
-                db.commit()
-                db.refresh(todo)
-            return todo
-        finally:
-            db.close()
-
-    def _delete_todo(self, todo_id: int) -> bool:
+            todo = await write_queue.run(lambda db: TodoRepository(db).update(todo_id, {"completed": True}))
+        except TodoNotFoundError:
+            return None
+        publish_todo("updated", todo)
+        return todo
+
+    async def _delete_todo(self, todo_id: int) -> bool:
         """Delete a todo."""
-        db = SessionLocal()
         try:
-            todo = db.query(Todo).filter(Todo.id == todo_id).first()
-            if todo:
-                db.delete(todo)
-                db.commit()
-                return True
+            await write_queue.run(lambda db: TodoRepository(db).delete(todo_id))
+        except TodoNotFoundError:
             return False
-        finally:
-            db.close()
+        publish_todo("deleted", todo_id)
+        return True
+
+    @staticmethod
+    def _handler(command: str, callback):
+        """Handler callback for command, timed when metrics are enabled."""
+        return timed_handler(command, callback) if settings.metrics_enabled else callback
 
     async def start(self):
         """Start the Telegram bot."""
         if not settings.telegram_bot_token:
             logger.warning("Telegram bot token not configured. Bot will not start.")
             return
+        # Importing python-telegram-bot takes a while; do it off the event loop
+        await asyncio.to_thread(importlib.import_module, "telegram.ext")
+        from telegram.ext import Application, CommandHandler, MessageHandler, filters
 
         self.application = Application.builder().token(settings.telegram_bot_token).build()
 
         # Register handlers
-        self.application.add_handler(CommandHandler("start", self.start_command))
-        self.application.add_handler(CommandHandler("help", self.help_command))
-        self.application.add_handler(CommandHandler("add", self.add_command))
-        self.application.add_handler(CommandHandler("list", self.list_command))
-        self.application.add_handler(CommandHandler("all", self.all_command))
-        self.application.add_handler(CommandHandler("done", self.done_command))
-        self.application.add_handler(CommandHandler("delete", self.delete_command))
+        self.application.add_handler(CommandHandler("start", self._handler("start", self.start_command)))
+        self.application.add_handler(CommandHandler("help", self._handler("help", self.help_command)))
+        self.application.add_handler(CommandHandler("add", self._handler("add", self.add_command)))
+        self.application.add_handler(CommandHandler("list", self._handler("list", self.list_command)))
+        self.application.add_handler(CommandHandler("all", self._handler("all", self.all_command)))
+        self.application.add_handler(CommandHandler("find", self._handler("find", self.find_command)))
+        self.application.add_handler(CommandHandler("done", self._handler("done", self.done_command)))
+        self.application.add_handler(CommandHandler("delete", self._handler("delete", self.delete_command)))
         self.application.add_handler(
-            MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message)
+            MessageHandler(filters.TEXT & ~filters.COMMAND, self._handler("message", self.handle_message))
         )
 
         # Start polling
@@ -0,0 +1,263 @@
+"""Todo persistence shared by the API and the Telegram bot."""
+
+import re
+from datetime import datetime
+from itertools import groupby
+
+from sqlalchemy import bindparam, delete, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..models import Todo, todo_search
+from ..schemas import TodoBatchResult, TodoBatchUpdateItem, TodoCreate, TodoResponse
+from .change_log import record_todo_changes
+from .versioning import mark_todos_changed
+
+
+CONFLICT_DETAIL = "Todo was changed by someone else; reload it and try again"
+
+
+def fts_match(text: str) -> str | None:
+    """Turn search text into an FTS5 query matching a prefix of every word.
+
+    Returns None when text has no words to search for.
+    """
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return None
+    # Quoted so words like AND or NEAR aren't read as operators
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+class TodoNotFoundError(LookupError):
+    """Raised when a todo does not exist."""
+
+
+class TodoVersionConflictError(Exception):
+    """Raised when a todo changed since the version the caller last saw."""
+
+    def __init__(self, current: TodoResponse):
+        super().__init__(f"Todo #{current.id} is at version {current.version}")
+        self.current = current
+
+
+class TodoRepository:
+    """Reads and single-statement writes of todos over one session.
+
+    Writes use INSERT/UPDATE/DELETE ... RETURNING, so a successful write is
+    one round trip. They leave committing to the caller, normally the write
+    queue, and return TodoResponse snapshots so nothing is reloaded after
+    the commit. Every write bumps the todo's version; callers that pass the
+    version they last saw get TodoVersionConflictError if someone else got
+    there first, instead of overwriting their change. A write that raises
+    leaves the transaction for the caller to roll back.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, todo_id: int) -> Todo | None:
+        return self.db.get(Todo, todo_id)
+
+    def query_page(
+        self,
+        completed: bool | None = None,
+        limit: int | None = None,
+        after: tuple[datetime, int] | None = None,
+        columns: tuple | None = None,
+    ) -> tuple[list[Todo], bool]:
+        """Get todos newest first, resuming after a keyset position.
+
+        Returns the page and whether more todos follow it. Served from the
+        (completed, created_at, id) or (created_at, id) index, so a page
+        costs the same however deep into the list it is. Pass columns to
+        get plain rows of them instead of ORM instances; they must include
+        created_at and id for the page to be resumed after.
+        """
+        query = self.db.query(*columns) if columns else self.db.query(Todo)
+        if completed is not None:
+            query = query.filter(Todo.completed == completed)
+        if after is not None:
+            created_at, todo_id = after
+            # The first condition gives the index a range to seek to; the
+            # second breaks ties between todos created at the same instant
+            query = query.filter(
+                Todo.created_at <= created_at,
+                or_(Todo.created_at < created_at, Todo.id < todo_id),
+            )
+        query = query.order_by(Todo.created_at.desc(), Todo.id.desc())
+        if limit is None:
+            return query.all(), False
+
+        todos = query.limit(limit + 1).all()
+        return todos[:limit], len(todos) > limit
+
+    def search(
+        self,
+        text: str,
+        completed: bool | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[list[Todo], bool]:
+        """Find todos with a title word starting with each word of text.
+
+        Best matches come first, then newest. Returns the page and whether
+        more matches follow it. Served from the FTS5 index on SQLite; other
+        databases fall back to substring matching.
+        """
+        match = fts_match(text)
+        if match is None:
+            return [], False
+
+        query = self.db.query(Todo)
+        if self.db.get_bind().dialect.name == "sqlite":
+            query = (
+                query.join(todo_search, todo_search.c.rowid == Todo.id)
+                .filter(todo_search.c.title.match(match))
+                .order_by(todo_search.c.rank)
+            )
+        else:
+            query = query.filter(*(Todo.title.ilike(f"%{term}%") for term in re.findall(r"\w+", text)))
+        if completed is not None:
+            query = query.filter(Todo.completed == completed)
+        todos = (
+            query.order_by(Todo.created_at.desc(), Todo.id.desc())
+            .offset(offset)
+            .limit(limit + 1)
+            .all()
+        )
+        return todos[:limit], len(todos) > limit
+
+    def create(self, title: str, created_by: str = "web") -> TodoResponse:
+        todo = self.db.scalars(
+            insert(Todo).values(title=title, created_by=created_by).returning(Todo)
+        ).one()
+        record_todo_changes(self.db, "insert", [todo.id])
+        return TodoResponse.model_validate(todo)
+
+    def update(self, todo_id: int, values: dict, expected_version: int | None = None) -> TodoResponse:
+        """Set column values on a todo and bump its version."""
+        if not values:
+            current = self._current(todo_id)
+            if expected_version is not None and current.version != expected_version:
+                raise TodoVersionConflictError(current)
+            return current
+
+        statement = update(Todo).where(Todo.id == todo_id)
+        if expected_version is not None:
+            statement = statement.where(Todo.version == expected_version)
+        todo = self.db.scalars(
+            statement.values(**values, version=Todo.version + 1)
+            .returning(Todo)
+            .execution_options(synchronize_session=False)
+        ).one_or_none()
+        if todo is None:
+            # Only the failure path pays for a second query
+            raise TodoVersionConflictError(self._current(todo_id))
+
+        record_todo_changes(self.db, "update", [todo.id])
+        return TodoResponse.model_validate(todo)
+
+    def delete(self, todo_id: int, expected_version: int | None = None):
+        statement = delete(Todo).where(Todo.id == todo_id)
+        if expected_version is not None:
+            statement = statement.where(Todo.version == expected_version)
+        deleted = self.db.scalars(
+            statement.returning(Todo.id).execution_options(synchronize_session=False)
+        ).one_or_none()
+        if deleted is None:
+            raise TodoVersionConflictError(self._current(todo_id))
+
+        record_todo_changes(self.db, "delete", [todo_id])
+
+    def _current(self, todo_id: int) -> TodoResponse:
+        """Load a todo as it is now, after a write matched nothing."""
+        todo = self.db.get(Todo, todo_id, populate_existing=True)
+        if todo is None:
+            raise TodoNotFoundError(todo_id)
+        return TodoResponse.model_validate(todo)
+
+    def create_many(self, items: list[TodoCreate]) -> list[TodoResponse]:
+        """Create todos with one INSERT, in order."""
+        todos = self.db.scalars(
+            insert(Todo).returning(Todo, sort_by_parameter_order=True),
+            [{"title": item.title, "created_by": item.created_by} for item in items],
+        ).all()
+        record_todo_changes(self.db, "insert", [todo.id for todo in todos])
+        return [TodoResponse.model_validate(todo) for todo in todos]
+
+    def update_many(self, items: list[TodoBatchUpdateItem]) -> list[TodoBatchResult]:
+        """Apply updates in one transaction, returning a result per item.
+
+        Rows setting the same columns go out as one executemany UPDATE,
+        each guarded by the version read at the start, so an edit that
+        lands in between shows up as a 409 rather than being overwritten.
+        """
+        table = Todo.__table__
+        ids = {item.id for item in items}
+        versions = dict(self.db.execute(select(Todo.id, Todo.version).where(Todo.id.in_(ids))).all())
+
+        # index -> (status, detail) for items decided without writing
+        outcomes: dict[int, tuple[int, str | None]] = {}
+        rows = []
+        seen = set()
+        for index, item in enumerate(items):
+            values = item.model_dump(exclude_none=True, exclude={"id", "version"})
+            if item.id not in versions:
+                outcomes[index] = (404, "Todo not found")
+            elif item.version is not None and item.version != versions[item.id]:
+                outcomes[index] = (409, CONFLICT_DETAIL)
+            elif not values:
+                outcomes[index] = (200, None)
+            elif item.id in seen:
+                outcomes[index] = (409, "Todo is updated earlier in this batch")
+            else:
+                seen.add(item.id)
+                rows.append((index, item.id, values))
+
+        def columns(row):
+            return sorted(row[2])
+
+        connection = self.db.connection()
+        for keys, group in groupby(sorted(rows, key=columns), key=columns):
+            statement = (
+                update(table)
+                .where(table.c.id == bindparam("b_id"), table.c.version == bindparam("b_version"))
+                .values({**{key: bindparam(f"b_{key}") for key in keys}, "version": table.c.version + 1})
+            )
+            connection.execute(statement, [
+                {"b_id": todo_id, "b_version": versions[todo_id], **{f"b_{k}": v for k, v in values.items()}}
+                for _, todo_id, values in group
+            ])
+
+        todos = {
+            todo.id: TodoResponse.model_validate(todo)
+            for todo in self.db.query(Todo).filter(Todo.id.in_(versions)).populate_existing()
+        }
+        # A guarded row that didn't move to the next version was changed by
+        # someone else in between
+        applied = []
+        for index, todo_id, _ in rows:
+            if todos[todo_id].version == versions[todo_id] + 1:
+                outcomes[index] = (200, None)
+                applied.append(todo_id)
+            else:
+                outcomes[index] = (409, CONFLICT_DETAIL)
+        if applied:
+            mark_todos_changed(self.db)
+            record_todo_changes(self.db, "update", applied)
+
+        return [
+            TodoBatchResult(id=item.id, status=status, todo=todos.get(item.id), detail=detail)
+            for item, (status, detail) in ((item, outcomes[index]) for index, item in enumerate(items))
+        ]
+
+    def delete_many(self, ids: list[int]) -> set[int]:
+        """Delete todos with one DELETE, returning the IDs that existed."""
+        deleted = set(self.db.scalars(
+            delete(Todo)
+            .where(Todo.id.in_(set(ids)))
+            .returning(Todo.id)
+            .execution_options(synchronize_session=False)
+        ))
+        record_todo_changes(self.db, "delete", sorted(deleted))
+        return deleted
@@ -0,0 +1,89 @@
+"""Version-based ETags for the polled dashboard endpoints."""
+
+import threading
+import uuid
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..models import Todo
+
+# Versions restart from zero with the process, so ETags carry a per-process
+# token to keep a restarted server from matching an old client copy
+BOOT_ID = uuid.uuid4().hex[:8]
+
+
+def make_etag(scope: str, version: int) -> str:
+    """Build a weak ETag for a version of some scope's data."""
+    return f'W/"{scope}-{BOOT_ID}-{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag, using weak comparison."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+class ChangeCounter:
+    """Monotonically increasing count of committed writes to some data."""
+
+    def __init__(self, scope: str):
+        self.scope = scope
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def bump(self):
+        with self._lock:
+            self.value += 1
+
+    def etag(self) -> str:
+        return make_etag(self.scope, self.value)
+
+
+todo_changes = ChangeCounter("todos")
+
+_TODOS_CHANGED = "todos_changed"
+
+
+def mark_todos_changed(session: Session):
+    """Count a write the hooks below can't see once the session commits.
+
+    Needed for Core statements run on session.connection().
+    """
+    session.info[_TODOS_CHANGED] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _note_todo_flush(session, flush_context):
+    if any(isinstance(obj, Todo) for obj in (*session.new, *session.dirty, *session.deleted)):
+        mark_todos_changed(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_todo_statement(orm_execute_state):
+    # Bulk INSERT/UPDATE/DELETE statements bypass the flush
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if any(mapper.class_ is Todo for mapper in orm_execute_state.all_mappers):
+        mark_todos_changed(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _count_todo_commit(session):
+    # Releasing a savepoint also fires this; wait for the real commit
+    if session.in_nested_transaction():
+        return
+    if session.info.pop(_TODOS_CHANGED, False):
+        todo_changes.bump()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_todo_changes(session, previous_transaction):
+    # A savepoint rollback leaves the rest of the transaction to commit;
+    # counting a change that got undone is harmless, missing one is not
+    if not previous_transaction.nested:
+        session.info.pop(_TODOS_CHANGED, None)
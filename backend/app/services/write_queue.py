@@ -0,0 +1,151 @@
+"""Single database writer that serializes and group-commits writes."""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..database import BEGIN_IMMEDIATE, SessionLocal
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+# Tries at taking the write lock before a batch is failed, and the pause
+# before the first retry in seconds, doubling after each. Every try already
+# waits out busy_timeout, so these only cover a lock held longer than that,
+# say by a backup or the sqlite3 shell.
+BEGIN_ATTEMPTS = 3
+BEGIN_BACKOFF = 0.5
+
+
+class WriteQueue:
+    """Runs write jobs one after another on a dedicated thread.
+
+    SQLite allows one writer at a time, so rather than have request threads,
+    the bot and background jobs fight over the lock, every write the app
+    makes is queued here: todos, calendar syncs and channel bookkeeping. Jobs
+    that pile up while a commit is in flight are applied together and
+    committed once, each inside its own savepoint so a job that raises only
+    undoes its own changes. A job's result is delivered after the commit
+    that made it durable.
+    """
+
+    def __init__(self, session_factory=SessionLocal, max_batch: int = settings.database_write_batch_size):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable[[Session], Any]) -> Future:
+        """Queue func(session) for the writer and return its future.
+
+        func runs in a copy of the submitter's context variables.
+        """
+        future = Future()
+        job = functools.partial(contextvars.copy_context().run, func)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+            self._queue.put((job, future))
+        return future
+
+    async def run(self, func: Callable[[Session], Any]) -> Any:
+        """Run func(session) on the writer and wait until it is committed.
+
+        Exceptions raised by func are re-raised here, with its changes
+        rolled back.
+        """
+        return await asyncio.wrap_future(self.submit(func))
+
+    def stop(self, timeout: float = 5.0):
+        """Apply the writes already queued, then stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            batch = [job]
+            while len(batch) < self.max_batch:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is _STOP:
+                    stopping = True
+                    break
+                batch.append(job)
+            self._apply(batch)
+
+    def _apply(self, batch: list[tuple[Callable[[Session], Any], Future]]):
+        outcomes = []
+        db = self.session_factory()
+        try:
+            self._begin(db)
+            for func, future in batch:
+                # Skip jobs whose caller gave up while they were queued
+                if not future.set_running_or_notify_cancel():
+                    continue
+                savepoint = db.begin_nested()
+                try:
+                    result = func(db)
+                    savepoint.commit()
+                    outcomes.append((future, result, None))
+                except Exception as e:
+                    savepoint.rollback()
+                    outcomes.append((future, None, e))
+            db.commit()
+        except Exception as e:
+            logger.error(f"Commit of {len(batch)} queued writes failed: {e}")
+            db.rollback()
+            outcomes = [(future, None, e) for _, future in batch if not future.done()]
+        finally:
+            db.close()
+
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def _begin(self, db: Session):
+        """Take the write lock up front rather than on the first write.
+
+        A lock held by another process past busy_timeout is retried with
+        backoff, so it fails the batch only if it outlasts every attempt.
+        """
+        for attempt in range(BEGIN_ATTEMPTS):
+            try:
+                db.connection(execution_options={BEGIN_IMMEDIATE: True})
+                return
+            except OperationalError as e:
+                if attempt == BEGIN_ATTEMPTS - 1 or "locked" not in str(e.orig):
+                    raise
+                delay = BEGIN_BACKOFF * 2 ** attempt
+                logger.warning(f"Database locked, retrying the write batch in {delay:g} s")
+                db.rollback()
+                time.sleep(delay)
+
+
+# Global instance
+write_queue = WriteQueue()
@@ -0,0 +1,67 @@
+"""Latency of the Telegram bot's command handlers with stand-in updates.
+
+Part of the suite; run it with:
+
+    python -m benchmarks.suite --only bot
+
+Handlers run exactly as python-telegram-bot would call them, with fake
+Update and context objects whose replies are discarded, against a seeded
+database. Nothing talks to Telegram.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from benchmarks.bench_todo_http import reset_database
+from benchmarks.timing import measure_async
+
+BOT_USER_ID = 1
+
+
+class _Message:
+    def __init__(self, text: str = ""):
+        self.text = text
+
+    async def reply_text(self, text: str):
+        pass
+
+
+def _update(text: str = "") -> SimpleNamespace:
+    user = SimpleNamespace(id=BOT_USER_ID, username="bench", first_name="Bench")
+    return SimpleNamespace(effective_user=user, message=_Message(text))
+
+
+def _context(*args: str) -> SimpleNamespace:
+    return SimpleNamespace(args=list(args))
+
+
+async def _run(rows: int, iterations: int) -> dict:
+    from app.services.telegram_bot import telegram_bot
+
+    # Each /done and /delete gets a todo of its own
+    done_ids = iter(range(1, rows + 1, 2))
+    delete_ids = iter(range(2, rows + 1, 2))
+    commands = (
+        ("/list", lambda: telegram_bot.list_command(_update(), _context())),
+        ("/all", lambda: telegram_bot.all_command(_update(), _context())),
+        ("/find milk", lambda: telegram_bot.find_command(_update(), _context("milk"))),
+        ("/add", lambda: telegram_bot.add_command(_update(), _context("Benchmark", "todo"))),
+        ("/done <id>", lambda: telegram_bot.done_command(_update(), _context(str(next(done_ids))))),
+        ("/delete <id>", lambda: telegram_bot.delete_command(_update(), _context(str(next(delete_ids))))),
+        ("message 'todo ...'", lambda: telegram_bot.handle_message(_update("todo buy milk"), _context())),
+    )
+
+    return {f"bot[{rows}] {name}": await measure_async(handler, iterations) for name, handler in commands}
+
+
+def run(rows: int, iterations: int) -> dict:
+    """Time each handler iterations times in a row against rows seeded todos."""
+    from app.config import get_settings
+    from app.services.write_queue import write_queue
+
+    # Authorize the stand-in user; settings are read per call
+    get_settings().authorized_users = str(BOT_USER_ID)
+    reset_database(rows)
+    results = asyncio.run(_run(rows, min(iterations, rows // 2)))
+    write_queue.stop()
+    return results
@@ -0,0 +1,51 @@
+"""Throughput of Google event parsing over the recorded calendar fixture.
+
+Part of the suite; run it with:
+
+    python -m benchmarks.suite --only calendar
+
+The Google client is replaced by a stub that serves the fixture's items
+as events().list pages, so a full sync runs offline from raw items to
+rows in an in-memory store. Throughput is in events per second.
+"""
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from benchmarks.seeding import memory_calendar_store
+from benchmarks.stubs import StubCalendarClient
+from benchmarks.timing import measure
+
+FIXTURE = Path(__file__).parent / "fixtures" / "household_calendar.json"
+
+
+def run(min_seconds: float) -> dict:
+    """Time parsing, page conversion and a stubbed full sync of the fixture."""
+    from app.services.google_calendar import GoogleCalendarService
+
+    items = json.loads(FIXTURE.read_text())["items"]
+    live = [item for item in items if item.get("status") != "cancelled"]
+
+    service = GoogleCalendarService()
+    service.store = memory_calendar_store()
+    service._get_service = lambda: StubCalendarClient(items)
+    window_end = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=90)
+
+    def parse():
+        for item in live:
+            service._parse_event(item)
+
+    results = {
+        f"calendar _parse_event ({len(live)} fixture events)": measure(
+            parse, min_seconds=min_seconds, ops_per_call=len(live)
+        ),
+        f"calendar _to_synced_events ({len(items)} fixture items)": measure(
+            lambda: service._to_synced_events(items), min_seconds=min_seconds, ops_per_call=len(items)
+        ),
+        f"calendar full sync, stubbed client ({len(items)} items)": measure(
+            lambda: service._full_sync("primary", window_end), min_seconds=min_seconds, ops_per_call=len(items)
+        ),
+    }
+    service.store.writes.stop()
+    return results
@@ -0,0 +1,90 @@
+"""Benchmark the interval index against scanning the event list.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_interval_index
+
+The scan path is what answering free/busy and conflict questions from
+get_upcoming_events would cost: a linear pass per overlap query and a
+pairwise comparison for conflicts.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from app.schemas import CalendarEvent
+from app.services.interval_index import IntervalIndex, event_bounds
+from benchmarks.timing import timed_call
+
+SIZES = (10_000, 50_000)
+QUERIES = 200
+CONFLICT_WINDOW = timedelta(days=30)
+
+
+def _events(count: int, rng: random.Random) -> list[CalendarEvent]:
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    events = []
+    for i in range(count):
+        if i % 50 == 0:
+            day = (base + timedelta(days=rng.randrange(365))).replace(tzinfo=None)
+            events.append(CalendarEvent(
+                id=f"e{i}", title="All day", start=day, end=day + timedelta(days=1), all_day=True,
+            ))
+            continue
+        start = base + timedelta(minutes=15 * rng.randrange(4 * 24 * 365))
+        duration = timedelta(minutes=rng.choice((15, 30, 60, 90, 120)))
+        events.append(CalendarEvent(id=f"e{i}", title="Event", start=start, end=start + duration))
+    return events
+
+
+def _scan_overlapping(bounds, start, end):
+    return [event for event, (s, e) in bounds if s < end and e > start]
+
+
+def _scan_conflicts(bounds, start, end):
+    window = [(event, s, e) for event, (s, e) in bounds if s < end and e > start]
+    pairs = []
+    for i, (a, a_start, a_end) in enumerate(window):
+        for b, b_start, b_end in window[i + 1:]:
+            if max(a_start, b_start, start) < min(a_end, b_end, end):
+                pairs.append((a, b))
+    return pairs
+
+
+def main():
+    rng = random.Random(7)
+    print(f"{'events':>7} {'build ms':>9} {'scan overlap us':>16} {'index overlap us':>17} "
+          f"{'scan conflicts ms':>18} {'index conflicts ms':>19}")
+    for size in SIZES:
+        events = _events(size, rng)
+        build_time, index = timed_call(IntervalIndex, events)
+        bounds = [(event, event_bounds(event, timezone.utc)) for event in events]
+
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        queries = []
+        for _ in range(QUERIES):
+            start = base + timedelta(hours=rng.randrange(24 * 365))
+            queries.append((start, start + timedelta(hours=4)))
+
+        scan = index_time = 0.0
+        for start, end in queries:
+            elapsed, expected = timed_call(_scan_overlapping, bounds, start, end)
+            scan += elapsed
+            elapsed, got = timed_call(index.overlapping, start, end)
+            index_time += elapsed
+            assert {e.id for e in expected} == {e.id for e in got}
+
+        window = (base, base + CONFLICT_WINDOW)
+        scan_conflicts, expected = timed_call(_scan_conflicts, bounds, *window)
+        index_conflicts, got = timed_call(index.conflicts, *window)
+        assert len(expected) == len(got)
+
+        print(
+            f"{size:>7} {build_time * 1000:>9.1f} {scan / QUERIES * 1e6:>16.1f} "
+            f"{index_time / QUERIES * 1e6:>17.1f} {scan_conflicts * 1000:>18.1f} "
+            f"{index_conflicts * 1000:>19.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
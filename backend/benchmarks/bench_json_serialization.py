@@ -0,0 +1,109 @@
+"""Benchmark list responses with and without fast_json_responses.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_json_serialization
+
+Requests GET /api/todos and GET /api/calendar/events through the app at
+10k and 100k items, once on the response_model path and once with
+fast_json_responses on, and checks both give the same bytes. Todos come
+from a fresh SQLite file; events from a stand-in calendar service, so the
+event timings are serialization only.
+
+On the response_model path FastAPI dumps each ORM row or event model to a
+dict, validates it against the schema, and encodes the result with the
+json module. The fast path selects plain column tuples and hands them to
+orjson, or serializes the already validated events once in pydantic-core.
+"""
+
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import text
+
+from benchmarks.seeding import insert_todos
+from benchmarks.timing import best_of
+
+SIZES = (10_000, 100_000)
+REPEAT = 5
+
+# Titles exercising escaping and non-ASCII output
+TITLES = ("Buy milk", 'Call "Mom"', "Fix tap\tin the kitchen", "Café au lait ☕", "Line\nbreak", "Plain todo")
+
+
+def _seed(engine, size: int):
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    rows = []
+    for i in range(size):
+        created_at = start + timedelta(seconds=i, microseconds=rng.choice((0, rng.randrange(1_000_000))))
+        rows.append((f"{TITLES[i % len(TITLES)]} {i}", i % 3 == 0, "web", str(created_at), str(created_at)))
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM todos"))
+    insert_todos(engine, rows, analyze=False)
+
+
+def _events(size: int):
+    from app.schemas import CalendarEvent
+
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        CalendarEvent(
+            id=f"event{i}",
+            title=TITLES[i % len(TITLES)],
+            start=start + timedelta(minutes=30 * i),
+            end=start + timedelta(minutes=30 * i + 45),
+            all_day=i % 10 == 0,
+            location="Kitchen" if i % 2 else None,
+            calendar_id="primary",
+        )
+        for i in range(size)
+    ]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        # Settings are read at import, so configure before touching the app
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'json.db'}"
+        os.environ["TELEGRAM_BOT_TOKEN"] = ""
+
+        from fastapi.testclient import TestClient
+
+        from app.config import get_settings
+        from app.database import engine, init_db
+        from app.main import app
+        from app.routers.calendar import calendar_service
+
+        settings = get_settings()
+        init_db()
+        client = TestClient(app)
+
+        events = []
+        calendar_service.is_authenticated = lambda: True
+        calendar_service.upcoming_events_generation = lambda days: None
+        calendar_service.get_upcoming_events = lambda days: events
+
+        print(f"{'response':<24} {'items':>7} {'MB':>6} {'model ms':>9} {'fast ms':>8} {'speedup':>8}  identical")
+        for size in SIZES:
+            _seed(engine, size)
+            events[:] = _events(size)
+            for label, path in (("GET /api/todos", "/api/todos"), ("GET /api/calendar/events", "/api/calendar/events")):
+                settings.fast_json_responses = False
+                model = best_of(lambda: client.get(path), REPEAT)
+                model_body = client.get(path).content
+                settings.fast_json_responses = True
+                fast = best_of(lambda: client.get(path), REPEAT)
+                fast_body = client.get(path).content
+                print(
+                    f"{label:<24} {size:>7} {len(model_body) / 1e6:>6.1f} {model * 1000:>9.1f} "
+                    f"{fast * 1000:>8.1f} {model / fast:>7.1f}x  {model_body == fast_body}"
+                )
+        settings.fast_json_responses = False
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark local recurrence expansion against server-side singleEvents.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_recurrence
+
+The "singleEvents" path decodes and parses the payload Google would send
+when it expands every series itself (rebuilt here from the recorded
+fixture, since the fixture stores masters). The "local" path answers the
+same window from masters already synced into the store. Network time is
+excluded from both, so the singleEvents numbers are a lower bound.
+"""
+
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from app.services.google_calendar import GoogleCalendarService
+from benchmarks.seeding import memory_calendar_store
+from benchmarks.timing import best_of
+
+FIXTURE = Path(__file__).parent / "fixtures" / "household_calendar.json"
+WINDOWS = (30, 90, 365)
+REPEAT = 20
+
+
+def _as_google_item(event) -> dict:
+    """Render an expanded event the way singleEvents=True returns it."""
+    if event.all_day:
+        start, end = {"date": event.start.date().isoformat()}, {"date": event.end.date().isoformat()}
+    else:
+        start, end = {"dateTime": event.start.isoformat()}, {"dateTime": event.end.isoformat()}
+    item = {
+        "kind": "calendar#event",
+        "etag": '"3391234567890000"',
+        "id": event.id,
+        "status": "confirmed",
+        "htmlLink": f"https://www.google.com/calendar/event?eid={event.id}",
+        "summary": event.title,
+        "creator": {"email": "household@example.com"},
+        "organizer": {"email": "household@example.com", "self": True},
+        "start": start,
+        "end": end,
+        "iCalUID": f"{event.id.split('_')[0]}@google.com",
+        "sequence": 0,
+        "reminders": {"useDefault": True},
+        "eventType": "default",
+    }
+    if event.location:
+        item["location"] = event.location
+    return item
+
+
+def main():
+    items = json.loads(FIXTURE.read_text())["items"]
+    service = GoogleCalendarService()
+    store = memory_calendar_store()
+
+    upserts, _ = service._to_synced_events(items)
+
+    def load(writer):
+        writer.apply_page(upserts, [])
+        writer.finish("fixture", full=True)
+
+    store.write("primary", load)
+    store.writes.stop()
+
+    time_min = datetime(2026, 10, 18)
+    print(f"{'days':>5} {'events':>7} {'singleEvents KB':>16} {'singleEvents ms':>16} {'local ms':>9}")
+    for days in WINDOWS:
+        time_max = time_min + timedelta(days=days)
+        expanded = store.query("primary", time_min, time_max)
+        payload = json.dumps({"items": [_as_google_item(event) for event in expanded]})
+
+        def single_events_path():
+            return [service._parse_event(item) for item in json.loads(payload)["items"]]
+
+        def local_path():
+            return store.query("primary", time_min, time_max)
+
+        remote = best_of(single_events_path, REPEAT)
+        local = best_of(local_path, REPEAT)
+        print(
+            f"{days:>5} {len(expanded):>7} {len(payload) / 1024:>16.1f} "
+            f"{remote * 1000:>16.2f} {local * 1000:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
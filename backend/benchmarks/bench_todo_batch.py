@@ -0,0 +1,94 @@
+"""Benchmark batch todo routes against one request per todo.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_todo_batch
+
+Both paths go through the app in-process with TestClient against a fresh
+SQLite file. Sent one after another, each per-item request makes its own
+trip through the write queue and pays for its own commit, as it would in
+production. Network latency is excluded, which favours the per-item
+routes.
+"""
+
+import tempfile
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, apply_sqlite_profile
+from app.main import app
+from app.services.write_queue import write_queue
+from benchmarks.timing import timed_call
+
+BATCH_SIZE = 1000
+
+
+def _client(db_path: Path) -> TestClient:
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    apply_sqlite_profile(engine)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    write_queue.session_factory = session_factory
+    # Not entered as a context manager, so the app's lifespan (bot, Google
+    # refresher) never starts
+    return TestClient(app)
+
+
+def _per_item(client: TestClient) -> dict[str, float]:
+    ids = []
+
+    def create():
+        for i in range(BATCH_SIZE):
+            ids.append(client.post("/api/todos", json={"title": f"Todo {i}"}).json()["id"])
+
+    def complete():
+        for todo_id in ids:
+            client.put(f"/api/todos/{todo_id}", json={"completed": True})
+
+    def remove():
+        for todo_id in ids:
+            client.delete(f"/api/todos/{todo_id}")
+
+    return {"create": timed_call(create)[0], "complete": timed_call(complete)[0], "delete": timed_call(remove)[0]}
+
+
+def _batched(client: TestClient) -> dict[str, float]:
+    ids = []
+
+    def create():
+        response = client.post(
+            "/api/todos/batch", json={"items": [{"title": f"Todo {i}"} for i in range(BATCH_SIZE)]}
+        )
+        ids.extend(result["id"] for result in response.json()["results"])
+
+    def complete():
+        client.patch(
+            "/api/todos/batch", json={"items": [{"id": todo_id, "completed": True} for todo_id in ids]}
+        )
+
+    def remove():
+        client.request("DELETE", "/api/todos/batch", json={"ids": ids})
+
+    return {"create": timed_call(create)[0], "complete": timed_call(complete)[0], "delete": timed_call(remove)[0]}
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        per_item = _per_item(_client(Path(tmp) / "per_item.db"))
+        batched = _batched(_client(Path(tmp) / "batched.db"))
+    write_queue.stop()
+
+    print(f"{BATCH_SIZE} todos")
+    print(f"{'operation':>10} {'per-item ms':>12} {'batch ms':>9} {'speedup':>8}")
+    for operation in ("create", "complete", "delete"):
+        print(
+            f"{operation:>10} {per_item[operation] * 1000:>12.1f} "
+            f"{batched[operation] * 1000:>9.1f} {per_item[operation] / batched[operation]:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""HTTP load test of the todo routes against seeded SQLite databases.
+
+Part of the suite; run it with:
+
+    python -m benchmarks.suite --only todos
+
+Each size gets a fresh database file with the full schema, indexes, FTS
+table and triggers. Requests go through the ASGI app in-process with
+httpx, so the numbers cover routing, validation, the read pool, the
+write queue and serialization, but no network. Concurrent clients send
+each route a fixed number of requests, or as many as fit in
+ROUTE_TIME_LIMIT. DATABASE_URL must point at a scratch file before app
+is first imported; the suite sees to that.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmarks.results import summarize
+from benchmarks.seeding import insert_todos
+
+# Seconds a route is loaded for at most, so slow routes on big tables
+# (common-word search at 1M rows takes seconds) don't stretch the run
+ROUTE_TIME_LIMIT = 10.0
+WORDS = "buy call fix clean book pay milk bread eggs dentist taxes garden laundry tickets invoice".split()
+START = datetime(2024, 1, 1)
+
+
+def reset_database(rows: int):
+    """Replace the app's database with a fresh one holding rows todos.
+
+    Todo n (IDs from 1) was created n seconds after START, so the newest
+    comes first in listings and cursors can be computed without a query.
+    """
+    from app.database import engine, init_db, read_engine
+
+    engine.dispose()
+    read_engine.dispose()
+    path = Path(engine.url.database)
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    init_db()
+
+    rng = random.Random(rows)
+
+    def seed_rows():
+        for i in range(rows):
+            created_at = str(START + timedelta(seconds=i + 1))
+            title = " ".join(rng.sample(WORDS, 3)).capitalize()
+            yield title, i % 3 == 0, "web", created_at, created_at
+
+    insert_todos(engine, seed_rows())
+
+
+def _operations(rows: int) -> list[tuple[str, callable]]:
+    """(name, request factory) pairs; factories take the client and a random generator."""
+    from app.routers.todos import encode_cursor
+
+    middle = SimpleNamespace(id=rows // 2, created_at=START + timedelta(seconds=rows // 2))
+    middle_cursor = encode_cursor(middle)
+    return [
+        ("GET /api/todos?limit=50", lambda client, rng: client.get("/api/todos", params={"limit": 50})),
+        (
+            "GET /api/todos?limit=50&cursor=<middle>",
+            lambda client, rng: client.get("/api/todos", params={"limit": 50, "cursor": middle_cursor}),
+        ),
+        (
+            "GET /api/todos?completed=false&limit=50",
+            lambda client, rng: client.get("/api/todos", params={"completed": False, "limit": 50}),
+        ),
+        (
+            "GET /api/todos/search?q=<word>",
+            lambda client, rng: client.get("/api/todos/search", params={"q": rng.choice(WORDS)}),
+        ),
+        ("GET /api/todos/{id}", lambda client, rng: client.get(f"/api/todos/{rng.randint(1, rows)}")),
+        ("GET /api/todos/stats", lambda client, rng: client.get("/api/todos/stats")),
+        ("POST /api/todos", lambda client, rng: client.post("/api/todos", json={"title": "Benchmark todo"})),
+        (
+            "PUT /api/todos/{id}",
+            lambda client, rng: client.put(
+                f"/api/todos/{rng.randint(1, rows)}", json={"completed": rng.random() < 0.5}
+            ),
+        ),
+    ]
+
+
+async def _load(client, request, requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+    deadline = time.perf_counter() + ROUTE_TIME_LIMIT
+
+    async def worker(seed: int):
+        nonlocal errors
+        rng = random.Random(seed)
+        for _ in remaining:
+            if time.perf_counter() > deadline:
+                return
+            start = time.perf_counter()
+            response = await request(client, rng)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(seed) for seed in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+async def _run_size(rows: int, requests: int, concurrency: int) -> dict:
+    import httpx
+
+    from app.main import app
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for name, request in _operations(rows):
+            # One untimed request warms the pools and statement caches
+            await request(client, random.Random(0))
+            results[f"todos[{rows}] {name}"] = await _load(client, request, requests, concurrency)
+    return results
+
+
+def run(sizes: tuple[int, ...], requests: int, concurrency: int) -> dict:
+    """Load each route at each table size; returns results keyed by size and route."""
+    from app.services.write_queue import write_queue
+
+    # One log line per request would dominate the run
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    results = {}
+    for rows in sizes:
+        start = time.perf_counter()
+        reset_database(rows)
+        print(f"Seeded {rows} todos in {time.perf_counter() - start:.1f} s")
+        results.update(asyncio.run(_run_size(rows, requests, concurrency)))
+        # Let queued writes land before the file is replaced
+        write_queue.stop()
+    return results
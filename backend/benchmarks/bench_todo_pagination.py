@@ -0,0 +1,89 @@
+"""Benchmark keyset pagination of GET /api/todos as the table grows.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_todo_pagination
+
+Each size gets a fresh SQLite file with the current schema. Pages are
+timed at the head, the middle and the tail of the list; with the listing
+indexes all three should stay flat from 1k to 1M todos. The "all rows"
+column is the old unpaginated listing, only run while it is bearable.
+"""
+
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Todo
+from app.services.todo_repository import TodoRepository
+from benchmarks.seeding import insert_todos
+from benchmarks.timing import best_of
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+FULL_LISTING_MAX = 100_000
+PAGE_SIZE = 50
+REPEAT = 20
+
+
+def _populate(engine, count: int):
+    base = datetime(2024, 1, 1)
+    insert_todos(engine, (
+        (
+            f"Todo {i}",
+            i % 3 == 0,
+            "web",
+            # Several todos per second, so paging has ties to break
+            (base + timedelta(seconds=i // 4)).isoformat(" "),
+            (base + timedelta(seconds=i // 4)).isoformat(" "),
+        )
+        for i in range(count)
+    ))
+
+
+def main():
+    print(f"{'todos':>9} {'head ms':>8} {'middle ms':>10} {'tail ms':>8} "
+          f"{'open-only ms':>13} {'all rows ms':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            engine = create_engine(f"sqlite:///{Path(tmp) / f'todos_{size}.db'}")
+            Base.metadata.create_all(bind=engine)
+            _populate(engine, size)
+            db = sessionmaker(bind=engine)()
+            list_todos = TodoRepository(db).query_page
+
+            def cursor_at(position: int):
+                todo = (
+                    db.query(Todo)
+                    .order_by(Todo.created_at.desc(), Todo.id.desc())
+                    .offset(position)
+                    .first()
+                )
+                return todo.created_at, todo.id
+
+            middle, tail = cursor_at(size // 2), cursor_at(size - PAGE_SIZE - 1)
+            head_time = best_of(lambda: list_todos(limit=PAGE_SIZE), REPEAT)
+            middle_time = best_of(lambda: list_todos(limit=PAGE_SIZE, after=middle), REPEAT)
+            tail_time = best_of(lambda: list_todos(limit=PAGE_SIZE, after=tail), REPEAT)
+            open_time = best_of(lambda: list_todos(completed=False, limit=PAGE_SIZE, after=middle), REPEAT)
+
+            full = "-"
+            if size <= FULL_LISTING_MAX:
+                start = time.perf_counter()
+                list_todos()
+                full = f"{(time.perf_counter() - start) * 1000:.1f}"
+
+            print(
+                f"{size:>9} {head_time * 1000:>8.2f} {middle_time * 1000:>10.2f} "
+                f"{tail_time * 1000:>8.2f} {open_time * 1000:>13.2f} {full:>12}"
+            )
+            db.close()
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
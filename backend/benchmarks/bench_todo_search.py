@@ -0,0 +1,110 @@
+"""Benchmark todo search with the FTS5 index against LIKE scans.
+
+Run from the backend directory:
+
+    python -m benchmarks.bench_todo_search
+
+Builds a fresh SQLite file with the full schema, including the FTS5 table
+and its triggers, and fills it with 100k todos, so the index is built the
+way the app builds it: row by row through the insert trigger. Each query
+is timed for a first page of matches and for counting every match.
+
+LIKE '%q%' can't use an index: it walks todos newest first until a page
+is full, so it is quick when the words are common and has to scan the
+whole table when they are rare or absent. FTS5 finds matches directly but
+ranks all of them before returning the best page, so very common words
+cost more there.
+"""
+
+import random
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, apply_sqlite_profile
+from app.migrations import run_migrations
+from app.models import Todo, todo_search
+from app.services.todo_repository import TodoRepository, fts_match
+from benchmarks.seeding import insert_todos
+from benchmarks.timing import best_of
+
+SIZE = 100_000
+PAGE_SIZE = 20
+REPEAT = 10
+
+WORDS = (
+    "buy call fix clean book pay return pick order renew water paint sort "
+    "wash check email plan cancel schedule print groceries milk bread eggs "
+    "dentist doctor plumber car insurance taxes garden gutters laundry "
+    "passport library birthday present tickets vet school invoice filter"
+).split()
+RARE = "zanzibar"
+
+# (label, query); the LIKE side looks for the query as typed
+QUERIES = (
+    ("common word", "milk"),
+    ("prefix", "gro"),
+    ("two words", "pay taxes"),
+    ("rare word", RARE),
+    ("no match", "xylophone"),
+)
+
+
+def _populate(engine):
+    rng = random.Random(42)
+    now = str(datetime.utcnow())
+    rows = []
+    for i in range(SIZE):
+        words = rng.sample(WORDS, rng.randint(2, 5))
+        if i % 10_000 == 0:
+            words.append(RARE)
+        rows.append((" ".join(words).capitalize(), i % 3 == 0, "web", now, now))
+    insert_todos(engine, rows)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'search.db'}")
+        apply_sqlite_profile(engine)
+        Base.metadata.create_all(bind=engine)
+        run_migrations(engine)
+        start = time.perf_counter()
+        _populate(engine)
+        print(f"{SIZE} todos inserted and indexed in {time.perf_counter() - start:.1f} s")
+
+        db = sessionmaker(bind=engine)()
+        repository = TodoRepository(db)
+
+        def like(q):
+            return db.query(Todo).filter(Todo.title.like(f"%{q}%"))
+
+        def fts_count(q):
+            return (
+                db.query(func.count())
+                .select_from(todo_search)
+                .filter(todo_search.c.title.match(fts_match(q)))
+                .scalar()
+            )
+
+        print(f"{'query':<14} {'matches':>8} {'FTS page ms':>12} {'LIKE page ms':>13} "
+              f"{'FTS count ms':>13} {'LIKE count ms':>14}")
+        for label, q in QUERIES:
+            fts_page = best_of(lambda: repository.search(q, limit=PAGE_SIZE), REPEAT)
+            like_page = best_of(lambda: like(q).order_by(Todo.created_at.desc(), Todo.id.desc()).limit(PAGE_SIZE).all(), REPEAT)
+            matches = fts_count(q)
+            fts_all = best_of(lambda: fts_count(q), REPEAT)
+            like_all = best_of(lambda: like(q).with_entities(func.count()).scalar(), REPEAT)
+            print(
+                f"{label:<14} {matches:>8} {fts_page * 1000:>12.2f} {like_page * 1000:>13.2f} "
+                f"{fts_all * 1000:>13.2f} {like_all * 1000:>14.2f}"
+            )
+        db.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
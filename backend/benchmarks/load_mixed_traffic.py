@@ -0,0 +1,159 @@
+"""Load test mixing dashboard requests with Telegram bot commands.
+
+Run from the backend directory:
+
+    python -m benchmarks.load_mixed_traffic [--seconds 10] [--inline-bot-reads]
+
+Web clients hit the todo routes through the ASGI app in-process while bot
+users drive the real command handlers with stand-in Telegram updates, all
+on one event loop as in production. A probe task measures how late the
+loop wakes it, which is what a query run on the loop shows up as.
+--inline-bot-reads runs the bot's listing query on the loop, as the bot
+used to, for comparison.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmarks.results import summarize
+from benchmarks.seeding import insert_todos
+
+SEED_TODOS = 5_000
+WEB_CLIENTS = 20
+BOT_USERS = 5
+BOT_USER_ID = 1
+# Pauses between a client's requests; clients that never pause would only
+# measure how deep the queue in front of a saturated CPU gets
+WEB_THINK_TIME = 0.2
+BOT_THINK_TIME = 0.5
+PROBE_INTERVAL = 0.005
+
+
+class _Message:
+    async def reply_text(self, text: str):
+        pass
+
+
+def _update() -> SimpleNamespace:
+    user = SimpleNamespace(id=BOT_USER_ID, username="loadtest", first_name="Load")
+    return SimpleNamespace(effective_user=user, message=_Message())
+
+
+def _seed(engine):
+    now = str(datetime.utcnow())
+    insert_todos(engine, ((f"Todo {i}", i % 2 == 0, "web", now, now) for i in range(SEED_TODOS)), analyze=False)
+
+
+async def _run(seconds: float, inline_bot_reads: bool):
+    import httpx
+
+    from app.database import ReadSessionLocal
+    from app.main import app
+    from app.services.telegram_bot import telegram_bot
+    from app.services.todo_repository import TodoRepository
+
+    if inline_bot_reads:
+        async def inline_get_todos(completed=None):
+            db = ReadSessionLocal()
+            try:
+                return TodoRepository(db).query_page(completed)[0]
+            finally:
+                db.close()
+
+        telegram_bot._get_todos = inline_get_todos
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    deadline = time.perf_counter() + seconds
+
+    async def timed(name: str, awaitable):
+        start = time.perf_counter()
+        await awaitable
+        latencies[name].append(time.perf_counter() - start)
+
+    async def web_client(client: httpx.AsyncClient):
+        while time.perf_counter() < deadline:
+            roll = random.random()
+            if roll < 0.8:
+                await timed("web GET /api/todos", client.get("/api/todos", params={"limit": 50}))
+            elif roll < 0.9:
+                await timed("web POST /api/todos", client.post("/api/todos", json={"title": "From the web"}))
+            else:
+                todo_id = random.randint(1, SEED_TODOS)
+                await timed("web PUT /api/todos/{id}", client.put(f"/api/todos/{todo_id}", json={"completed": True}))
+            await asyncio.sleep(random.uniform(0, 2 * WEB_THINK_TIME))
+
+    async def bot_user():
+        while time.perf_counter() < deadline:
+            roll = random.random()
+            if roll < 0.5:
+                context = SimpleNamespace(args=[])
+                await timed("bot /list", telegram_bot.list_command(_update(), context))
+            elif roll < 0.8:
+                context = SimpleNamespace(args=["From", "the", "bot"])
+                await timed("bot /add", telegram_bot.add_command(_update(), context))
+            else:
+                context = SimpleNamespace(args=[str(random.randint(1, SEED_TODOS))])
+                await timed("bot /done", telegram_bot.done_command(_update(), context))
+            await asyncio.sleep(random.uniform(0, 2 * BOT_THINK_TIME))
+
+    async def probe():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL)
+            latencies["event loop lag"].append(time.perf_counter() - start - PROBE_INTERVAL)
+
+    # One log line per request would dominate the run
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        await asyncio.gather(
+            probe(),
+            *(web_client(client) for _ in range(WEB_CLIENTS)),
+            *(bot_user() for _ in range(BOT_USERS)),
+        )
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--inline-bot-reads", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Settings are read at import, so configure before touching the app
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'load.db'}"
+        os.environ["AUTHORIZED_USERS"] = str(BOT_USER_ID)
+        os.environ["TELEGRAM_BOT_TOKEN"] = ""
+
+        from app.database import engine, init_db
+        from app.services.write_queue import write_queue
+
+        init_db()
+        _seed(engine)
+        latencies = asyncio.run(_run(args.seconds, args.inline_bot_reads))
+        write_queue.stop()
+        engine.dispose()
+
+    mode = "bot reads on the event loop" if args.inline_bot_reads else "bot reads on the database executor"
+    print(f"{SEED_TODOS} todos, {WEB_CLIENTS} web clients, {BOT_USERS} bot users, {args.seconds:g} s, {mode}")
+    print(f"{'operation':<26} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for name in sorted(latencies):
+        result = summarize(latencies[name], args.seconds)
+        print(
+            f"{name:<26} {result['count']:>7} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+            f"{result['p99_ms']:>8.2f} {result['max_ms']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark results: summaries, JSON files and baseline comparison."""
+
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Metrics compared against a baseline, and whether a larger value is better
+COMPARED_METRICS = (("p50_ms", False), ("ops_per_sec", True))
+
+
+def summarize(samples: list[float], elapsed: float, errors: int = 0) -> dict:
+    """Latency percentiles in ms and throughput for operations timed in seconds."""
+    count = len(samples)
+    # quantiles needs two points; one sample is every percentile by itself.
+    # Inclusive, so small samples don't extrapolate past the slowest call
+    cuts = (
+        statistics.quantiles(samples, n=100, method="inclusive")
+        if count >= 2
+        else [samples[0] if samples else 0.0] * 99
+    )
+    return {
+        "count": count,
+        "errors": errors,
+        "p50_ms": round(cuts[49] * 1000, 4),
+        "p95_ms": round(cuts[94] * 1000, 4),
+        "p99_ms": round(cuts[98] * 1000, 4),
+        "max_ms": round(max(samples, default=0.0) * 1000, 4),
+        "ops_per_sec": round(count / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def environment() -> dict:
+    """What the numbers depend on besides the code."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def save(results: dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def load(path: Path) -> dict:
+    return json.loads(path.read_text())
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[dict]:
+    """Compare benchmarks present in both runs.
+
+    A metric regressed when it is more than tolerance (a fraction) worse
+    than the baseline, and improved when it is that much better.
+    """
+    rows = []
+    for name, result in current["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            gain = ratio if higher_is_better else 1 / ratio if ratio else float("inf")
+            if gain < 1 / (1 + tolerance):
+                status = "regressed"
+            elif gain > 1 + tolerance:
+                status = "improved"
+            else:
+                status = ""
+            rows.append({"name": name, "metric": metric, "baseline": old, "current": new, "ratio": ratio, "status": status})
+    return rows
+
+
+def print_results(results: dict):
+    print(f"{'benchmark':<58} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>10}")
+    for name, result in results["benchmarks"].items():
+        errors = f"  {result['errors']} errors" if result.get("errors") else ""
+        print(
+            f"{name:<58} {result['count']:>6} {result['p50_ms']:>9.3f} {result['p95_ms']:>9.3f} "
+            f"{result['p99_ms']:>9.3f} {result['ops_per_sec']:>10.1f}{errors}"
+        )
+
+
+def print_comparison(rows: list[dict], baseline: dict):
+    meta = baseline.get("environment", {})
+    print(f"\nAgainst baseline from {meta.get('created_at')} (commit {meta.get('commit')}):")
+    print(f"{'benchmark':<58} {'metric':<12} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for row in rows:
+        print(
+            f"{row['name']:<58} {row['metric']:<12} {row['baseline']:>10.3f} {row['current']:>10.3f} "
+            f"{row['ratio']:>6.2f}x {row['status']}"
+        )
@@ -0,0 +1,54 @@
+"""Database setup shared by the benchmarks."""
+
+from typing import Iterable
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Rows inserted per transaction
+SEED_CHUNK = 50_000
+
+INSERT_TODO = (
+    "INSERT INTO todos (title, completed, created_by, created_at, updated_at) VALUES (?, ?, ?, ?, ?)"
+)
+
+
+def insert_todos(engine: Engine, rows: Iterable[tuple], analyze: bool = True):
+    """Bulk insert (title, completed, created_by, created_at, updated_at) rows.
+
+    Goes through the driver directly, so the FTS triggers still index every
+    row but the ORM and change log are skipped. Timestamps are strings as
+    SQLAlchemy stores them, e.g. str(datetime).
+    """
+    rows = iter(rows)
+    connection = engine.raw_connection()
+    try:
+        while True:
+            chunk = [row for _, row in zip(range(SEED_CHUNK), rows)]
+            if not chunk:
+                break
+            connection.execute("BEGIN")
+            connection.executemany(INSERT_TODO, chunk)
+            connection.execute("COMMIT")
+        if analyze:
+            connection.execute("ANALYZE")
+    finally:
+        connection.close()
+
+
+def memory_calendar_store():
+    """A calendar event store on an in-memory database, with a writer of its own.
+
+    Stop its writes queue when done with it.
+    """
+    from app.database import Base
+    from app.services.calendar_store import CalendarEventStore
+    from app.services.write_queue import WriteQueue
+
+    # One connection, so the store's writer thread sees the same in-memory database
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    return CalendarEventStore(session_factory, WriteQueue(session_factory))
@@ -0,0 +1,42 @@
+"""Stand-ins for the Google Calendar client, shared with the tests."""
+
+from typing import Callable
+
+# Items per events().list page served by StubCalendarClient
+STUB_PAGE_SIZE = 25
+
+
+class StubRequest:
+    """An API request whose execute() returns respond()."""
+
+    def __init__(self, respond: Callable[[], dict]):
+        self.respond = respond
+
+    def execute(self):
+        return self.respond()
+
+
+class StubCalendarClient:
+    """Answers events().list like the Calendar API, from a list of items.
+
+    Pages follow nextPageToken and the last one carries a nextSyncToken;
+    override page to delay or fail one of them.
+    """
+
+    def __init__(self, items: list[dict], page_size: int = STUB_PAGE_SIZE):
+        self.pages = [items[i:i + page_size] for i in range(0, len(items), page_size)] or [[]]
+
+    def events(self):
+        return self
+
+    def list(self, pageToken=None, **params):
+        index = int(pageToken or 0)
+        return StubRequest(lambda: self.page(index))
+
+    def page(self, index: int) -> dict:
+        result = {"items": self.pages[index]}
+        if index + 1 < len(self.pages):
+            result["nextPageToken"] = str(index + 1)
+        else:
+            result["nextSyncToken"] = "stub-sync-token"
+        return result
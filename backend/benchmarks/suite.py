@@ -0,0 +1,115 @@
+"""Offline benchmark suite for the todo routes, calendar parsing and the bot.
+
+Run from the backend directory:
+
+    python -m benchmarks.suite [--quick] [--only todos,calendar,bot]
+    python -m benchmarks.suite --save-baseline      # record a baseline
+    python -m benchmarks.suite                      # compare against it
+
+Results are written as JSON to benchmarks/results/latest.json (--output).
+When a baseline file exists (benchmarks/results/baseline.json, or
+--baseline), every benchmark in both runs is compared on p50 latency and
+throughput, and the exit status is 1 if any got worse by more than
+--tolerance. Baselines only mean something on the machine that recorded
+them; latest.json is git-ignored, a baseline may be committed for a
+reference machine.
+
+Nothing touches the network: the todo and bot benchmarks use a scratch
+SQLite file, and the calendar benchmark a stubbed Google client.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import results as result_files
+
+RESULTS_DIR = Path(__file__).parent / "results"
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+QUICK_SIZES = (1_000, 10_000)
+WORKLOADS = ("todos", "calendar", "bot")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", default=",".join(WORKLOADS), help="comma-separated workloads to run")
+    parser.add_argument("--sizes", help="comma-separated todo table sizes (default 1k to 1M)")
+    parser.add_argument("--quick", action="store_true", help="1k and 10k todos and fewer requests")
+    parser.add_argument("--requests", type=int, help="requests per route and size (default 200, quick 50)")
+    parser.add_argument("--concurrency", type=int, default=4, help="concurrent HTTP clients")
+    parser.add_argument("--bot-rows", type=int, default=1_000, help="todos seeded for the bot benchmark")
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "latest.json")
+    parser.add_argument("--baseline", type=Path, default=RESULTS_DIR / "baseline.json")
+    parser.add_argument("--save-baseline", action="store_true", help="also write the results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="fraction a metric may worsen (default 0.2)")
+    args = parser.parse_args()
+
+    workloads = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = set(workloads) - set(WORKLOADS)
+    if unknown:
+        parser.error(f"unknown workloads: {', '.join(sorted(unknown))}")
+    if args.sizes:
+        sizes = tuple(int(size) for size in args.sizes.split(","))
+    else:
+        sizes = QUICK_SIZES if args.quick else SIZES
+    requests = args.requests or (50 if args.quick else 200)
+
+    benchmarks = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Settings are read at import, so configure before touching the app
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ["TELEGRAM_BOT_TOKEN"] = ""
+        os.environ["METRICS_ENABLED"] = "false"
+
+        started = time.perf_counter()
+        if "todos" in workloads:
+            from benchmarks import bench_todo_http
+
+            benchmarks.update(bench_todo_http.run(sizes, requests, args.concurrency))
+        if "calendar" in workloads:
+            from benchmarks import bench_calendar_parsing
+
+            benchmarks.update(bench_calendar_parsing.run(min_seconds=0.5 if args.quick else 2.0))
+        if "bot" in workloads:
+            from benchmarks import bench_bot_handlers
+
+            benchmarks.update(bench_bot_handlers.run(args.bot_rows, 20 if args.quick else 100))
+
+        from app.database import engine, read_engine
+
+        engine.dispose()
+        read_engine.dispose()
+
+    environment = result_files.environment()
+    environment["duration_s"] = round(time.perf_counter() - started, 1)
+    current = {
+        "environment": environment,
+        "settings": {"sizes": list(sizes), "requests": requests, "concurrency": args.concurrency},
+        "benchmarks": benchmarks,
+    }
+    result_files.print_results(current)
+    result_files.save(current, args.output)
+    print(f"\nWrote {args.output}")
+
+    if args.save_baseline:
+        result_files.save(current, args.baseline)
+        print(f"Saved baseline {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print("No baseline to compare with; record one with --save-baseline.")
+        return 0
+
+    rows = result_files.compare(current, result_files.load(args.baseline), args.tolerance)
+    result_files.print_comparison(rows, result_files.load(args.baseline))
+    regressed = [row for row in rows if row["status"] == "regressed"]
+    if regressed:
+        print(f"\n{len(regressed)} metrics regressed by more than {args.tolerance:.0%}.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
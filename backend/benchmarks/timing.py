@@ -0,0 +1,66 @@
+"""Timing loops shared by the benchmarks."""
+
+import time
+from typing import Any, Awaitable, Callable
+
+from benchmarks.results import summarize
+
+
+def best_of(func: Callable[[], Any], repeat: int) -> float:
+    """Seconds taken by the fastest of repeat calls of func."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def timed_call(func: Callable[..., Any], *args) -> tuple[float, Any]:
+    """Call func once; returns the seconds it took and its result."""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def measure(
+    func: Callable[[], Any],
+    iterations: int | None = None,
+    min_seconds: float = 0.0,
+    ops_per_call: int = 1,
+) -> dict:
+    """Call func iterations times, or until min_seconds have passed, and summarize.
+
+    With ops_per_call, throughput counts that many operations per call,
+    e.g. events parsed rather than calls made.
+    """
+    latencies: list[float] = []
+    start = time.perf_counter()
+    while True:
+        call_start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - call_start)
+        if iterations is not None:
+            if len(latencies) >= iterations:
+                break
+        elif time.perf_counter() - start >= min_seconds:
+            break
+    return _summarize_ops(latencies, time.perf_counter() - start, ops_per_call)
+
+
+async def measure_async(func: Callable[[], Awaitable[Any]], iterations: int, ops_per_call: int = 1) -> dict:
+    """Await func() iterations times in a row and summarize."""
+    latencies: list[float] = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter()
+        await func()
+        latencies.append(time.perf_counter() - call_start)
+    return _summarize_ops(latencies, time.perf_counter() - start, ops_per_call)
+
+
+def _summarize_ops(latencies: list[float], elapsed: float, ops_per_call: int) -> dict:
+    result = summarize(latencies, elapsed)
+    if ops_per_call != 1 and elapsed:
+        result["ops_per_sec"] = round(len(latencies) * ops_per_call / elapsed, 1)
+    return result
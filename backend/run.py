@@ -1,16 +1,113 @@
 #!/usr/bin/env python3
-"""Entry point for running the backend server."""
+"""Entry point for running the backend server.
+
+    python run.py                    # serve with auto-reload
+    python run.py --profile-startup  # report where startup time goes, then exit
+"""
+
+import argparse
+import asyncio
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
 
 import uvicorn
 from app.config import get_settings
 
 settings = get_settings()
 
+# Libraries the app imports on first use rather than at startup
+DEFERRED_IMPORTS = {
+    "Google client (first calendar use)": (
+        "google.oauth2.credentials",
+        "google_auth_oauthlib.flow",
+        "googleapiclient.discovery",
+        "google_auth_httplib2",
+    ),
+    "python-telegram-bot (bot start)": ("telegram.ext",),
+}
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+def _import_breakdown() -> tuple[dict[str, float], float]:
+    """Seconds spent importing app.main in a fresh interpreter, by top-level package."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).parent,
+    )
+    by_package: dict[str, float] = defaultdict(float)
+    total = 0.0
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        own, cumulative, _, module = match.groups()
+        package = module.split(".")[0]
+        if package == "app":
+            package = ".".join(module.split(".")[:3])
+        by_package[package] += int(own) / 1e6
+        if module == "app.main":
+            total = int(cumulative) / 1e6
+    return by_package, total
+
+
+def profile_startup(top: int = 15):
+    """Print import time by package, lifespan phases and first-use costs."""
+    by_package, total = _import_breakdown()
+    print(f"Importing app.main: {total * 1000:.0f} ms in a fresh interpreter")
+    for package, seconds in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {package:<40} {seconds * 1000:>8.1f} ms")
+
+    start = time.perf_counter()
+    from app.main import app, lifespan, startup_timings
+    print(f"\nImporting app.main in this process: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    async def run_lifespan() -> tuple[float, float]:
+        start = time.perf_counter()
+        async with lifespan(app):
+            started = time.perf_counter() - start
+            start = time.perf_counter()
+        return started, time.perf_counter() - start
+
+    started, stopped = asyncio.run(run_lifespan())
+    print(f"\nLifespan startup: {started * 1000:.1f} ms")
+    for phase, seconds in startup_timings.items():
+        print(f"  {phase:<40} {seconds * 1000:>8.1f} ms")
+    print(f"Lifespan shutdown: {stopped * 1000:.1f} ms")
+
+    print("\nDeferred until first use, in the background:")
+    for label, modules in DEFERRED_IMPORTS.items():
+        if any(module in sys.modules for module in modules):
+            print(f"  {label:<40} {'loaded during startup':>20}")
+            continue
+        start = time.perf_counter()
+        for module in modules:
+            __import__(module)
+        print(f"  {label:<40} {(time.perf_counter() - start) * 1000:>8.1f} ms")
+
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host=settings.backend_host,
-        port=settings.backend_port,
-        reload=True,
-        log_level="info"
+    parser = argparse.ArgumentParser(description="Run the dashboard backend.")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="time imports and the lifespan's startup phases, starting and stopping the app once",
     )
+    args = parser.parse_args()
+
+    if args.profile_startup:
+        profile_startup()
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host=settings.backend_host,
+            port=settings.backend_port,
+            reload=True,
+            log_level="info"
+        )
@@ -0,0 +1,52 @@
+"""Shared test setup.
+
+Settings are read when app is first imported, so the app is pointed at a
+scratch database, without the Telegram bot or push channels, before any
+test module imports it.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+_scratch = Path(tempfile.mkdtemp(prefix="dashboard-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{_scratch / 'test.db'}"
+os.environ["TELEGRAM_BOT_TOKEN"] = ""
+os.environ["CALENDAR_WEBHOOK_URL"] = ""
+os.environ["GOOGLE_CALENDAR_ID"] = "primary"
+os.environ["GOOGLE_CALENDAR_IDS"] = ""
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the schema once; tests run without the app's lifespan tasks."""
+    from app.database import init_db
+
+    init_db()
+
+
+@pytest.fixture
+def calendar_service(monkeypatch):
+    """The routers' calendar service, signed in and with nothing cached."""
+    from google.oauth2.credentials import Credentials
+
+    from app.config import get_settings
+    from app.routers.calendar import calendar_service
+
+    # A token that never expires unless a test sets its expiry; the stub
+    # clients tests install never send it anywhere
+    credentials = Credentials(token="test-token", refresh_token="test-refresh-token")
+    monkeypatch.setattr(calendar_service.credential_manager, "credentials", credentials)
+    monkeypatch.setattr(calendar_service.credential_manager, "_loaded", True)
+    calendar_service.cache.invalidate()
+    calendar_service._last_sync.clear()
+    calendar_service.sync_errors.clear()
+    yield calendar_service
+    calendar_service.cache.invalidate()
+    calendar_service.pushed_calendars.clear()
+    # Leave the next test a store that has never synced
+    for calendar_id in get_settings().calendar_ids:
+        calendar_service.store.write(calendar_id, lambda writer: writer.clear())
+        calendar_service.store.clear_sync_token(calendar_id)
@@ -0,0 +1,115 @@
+"""A slow Google Calendar must not hold up todo requests."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+import httpx
+
+from benchmarks.stubs import StubCalendarClient
+
+# Longest a todo request may take while the calendar is stuck
+TODO_DEADLINE = 1.0
+# Longest the test waits on the stub before giving up
+STUB_TIMEOUT = 10.0
+
+EVENT = {
+    "id": "stub-event",
+    "summary": "Dentist",
+    "start": {"dateTime": "2030-01-01T09:00:00Z"},
+    "end": {"dateTime": "2030-01-01T10:00:00Z"},
+}
+
+
+class BlockingCalendarClient(StubCalendarClient):
+    """Answers events().list with two pages, the second once release is set.
+
+    Blocking on a later page catches a sync that holds its transaction
+    open between pages, not just before the first.
+    """
+
+    def __init__(self):
+        super().__init__([EVENT])
+        self.pages.append([])
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def page(self, index: int) -> dict:
+        if index == len(self.pages) - 1:
+            self.entered.set()
+            self.release.wait(STUB_TIMEOUT)
+        return super().page(index)
+
+
+async def _todos_while_calendar_blocks(client: BlockingCalendarClient):
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as http:
+        events = asyncio.create_task(http.get("/api/calendar/events"))
+        try:
+            assert await asyncio.to_thread(client.entered.wait, STUB_TIMEOUT), "calendar stub never called"
+
+            start = time.perf_counter()
+            todos = await http.get("/api/todos")
+            elapsed = time.perf_counter() - start
+            calendar_pending = not events.done()
+        finally:
+            client.release.set()
+        return todos, elapsed, calendar_pending, await events
+
+
+def test_todos_are_served_while_calendar_is_slow(calendar_service, monkeypatch):
+    client = BlockingCalendarClient()
+    monkeypatch.setattr(calendar_service, "_get_service", lambda: client)
+
+    todos, elapsed, calendar_pending, events = asyncio.run(_todos_while_calendar_blocks(client))
+
+    assert todos.status_code == 200
+    assert elapsed < TODO_DEADLINE
+    assert calendar_pending
+    assert events.status_code == 200
+    assert events.json()["events"] == []
+
+
+def test_calendar_sync_does_not_hold_the_write_lock(calendar_service, monkeypatch):
+    from app.services.todo_repository import TodoRepository
+    from app.services.write_queue import write_queue
+
+    client = BlockingCalendarClient()
+    monkeypatch.setattr(calendar_service, "_get_service", lambda: client)
+    sync = threading.Thread(target=calendar_service.sync, args=("primary",), kwargs={"force": True})
+    sync.start()
+    try:
+        assert client.entered.wait(STUB_TIMEOUT), "calendar stub never called"
+        todo = write_queue.submit(lambda db: TodoRepository(db).create("Written mid-sync", "test"))
+        assert todo.result(timeout=TODO_DEADLINE).title == "Written mid-sync"
+    finally:
+        client.release.set()
+        sync.join(STUB_TIMEOUT)
+
+
+def test_full_sync_swaps_events_in_at_the_end(calendar_service, monkeypatch):
+    previous = {**EVENT, "id": "previous-event"}
+    monkeypatch.setattr(calendar_service, "_get_service", lambda: StubCalendarClient([previous]))
+    calendar_service.sync("primary", force=True)
+
+    def stored_ids():
+        window = (datetime(2030, 1, 1), datetime(2030, 1, 2))
+        return [event.id for event in calendar_service.store.query("primary", *window)]
+
+    client = BlockingCalendarClient()
+    monkeypatch.setattr(calendar_service, "_get_service", lambda: client)
+    calendar_service.store.clear_sync_token("primary")
+    sync = threading.Thread(target=calendar_service.sync, args=("primary",), kwargs={"force": True})
+    sync.start()
+    try:
+        assert client.entered.wait(STUB_TIMEOUT), "calendar stub never called"
+        # The first page is staged, not yet visible
+        assert stored_ids() == ["previous-event"]
+    finally:
+        client.release.set()
+        sync.join(STUB_TIMEOUT)
+
+    assert stored_ids() == ["stub-event"]
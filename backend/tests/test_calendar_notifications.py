@@ -0,0 +1,171 @@
+"""The push notification receiver, driven by a stub posting Google's headers."""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.stubs import StubRequest
+
+# Longest the test waits on a resync scheduled in the background
+RESYNC_TIMEOUT = 5.0
+
+
+class StubWatchClient:
+    """Answers events().watch and channels().stop like the Calendar API."""
+
+    def __init__(self):
+        self.watched: list[dict] = []
+        self.stopped: list[str] = []
+
+    def events(self):
+        return self
+
+    def channels(self):
+        return self
+
+    def watch(self, calendarId: str, body: dict):
+        self.watched.append({"calendar_id": calendarId, **body})
+        expiration = datetime.utcnow() + timedelta(days=7)
+        return StubRequest(lambda: {
+            "resourceId": f"resource-{body['id']}",
+            "expiration": str(int((expiration - datetime(1970, 1, 1)).total_seconds() * 1000)),
+        })
+
+    def stop(self, body: dict):
+        self.stopped.append(body["id"])
+        return StubRequest(dict)
+
+
+@pytest.fixture
+def google(calendar_service, monkeypatch):
+    client = StubWatchClient()
+    monkeypatch.setattr(calendar_service, "_get_service", lambda: client)
+    return client
+
+
+class Published:
+    """Events the watch manager published, and a flag set by the first."""
+
+    def __init__(self):
+        self.events: list[dict] = []
+        self.any = threading.Event()
+
+    def publish(self, type, data=None):
+        self.events.append({"type": type, **(data or {})})
+        self.any.set()
+
+
+@pytest.fixture
+def published(monkeypatch):
+    from app.services import calendar_watch
+
+    published = Published()
+    monkeypatch.setattr(calendar_watch.event_bus, "publish", published.publish)
+    return published
+
+
+@pytest.fixture
+def manager(calendar_service, google, monkeypatch):
+    """A fresh watch manager behind the receiver route, with one open channel."""
+    from app.routers import calendar
+    from app.services.calendar_watch import CalendarWatchManager
+
+    manager = CalendarWatchManager(calendar_service)
+    monkeypatch.setattr(calendar, "watch_manager", manager)
+    manager._open_channel("primary")
+    # Forget it in memory, so the receiver has to find it in the database
+    manager._channels.clear()
+    return manager
+
+
+@pytest.fixture
+def channel(manager, google) -> dict:
+    """The body the manager opened its channel with."""
+    return google.watched[0]
+
+
+@pytest.fixture
+def client():
+    from app.main import app
+
+    return TestClient(app)
+
+
+def _headers(channel: dict, state: str = "exists", token: str | None = None) -> dict:
+    return {
+        "X-Goog-Channel-ID": channel["id"],
+        "X-Goog-Channel-Token": channel["token"] if token is None else token,
+        "X-Goog-Resource-State": state,
+        "X-Goog-Resource-ID": f"resource-{channel['id']}",
+    }
+
+
+def test_unknown_channel_is_rejected(client, manager):
+    response = client.post("/api/calendar/notifications", headers={"X-Goog-Channel-ID": "unknown"})
+    assert response.status_code == 404
+
+
+def test_wrong_token_is_rejected(client, channel):
+    response = client.post("/api/calendar/notifications", headers=_headers(channel, token="forged"))
+    assert response.status_code == 403
+
+
+def test_sync_message_does_not_resync(client, channel, calendar_service, monkeypatch, published):
+    synced = []
+    monkeypatch.setattr(calendar_service, "sync", lambda calendar_id, force=False: synced.append(calendar_id))
+
+    response = client.post("/api/calendar/notifications", headers=_headers(channel, state="sync"))
+
+    assert response.status_code == 204
+    assert not published.any.wait(0.2)
+    assert synced == []
+
+
+def test_change_resyncs_the_calendar(client, channel, calendar_service, monkeypatch, published):
+    synced = []
+    monkeypatch.setattr(calendar_service, "sync", lambda calendar_id, force=False: synced.append((calendar_id, force)))
+
+    response = client.post("/api/calendar/notifications", headers=_headers(channel))
+
+    assert response.status_code == 204
+    assert published.any.wait(RESYNC_TIMEOUT)
+    assert synced == [("primary", True)]
+    assert published.events == [{"type": "calendar.changed", "calendar_id": "primary"}]
+
+
+def test_failed_resync_is_not_published(client, channel, calendar_service, monkeypatch, published):
+    attempted = threading.Event()
+
+    def sync(calendar_id, force=False):
+        attempted.set()
+        raise RuntimeError("Google is down")
+
+    monkeypatch.setattr(calendar_service, "sync", sync)
+
+    response = client.post("/api/calendar/notifications", headers=_headers(channel))
+
+    assert response.status_code == 204
+    assert attempted.wait(RESYNC_TIMEOUT)
+    assert not published.any.wait(0.2)
+    assert calendar_service.sync_errors["primary"] == "Google is down"
+
+
+def test_failing_channel_stop_does_not_abort_renewal(manager, calendar_service, google, monkeypatch):
+    from app.services import calendar_watch
+
+    monkeypatch.setattr(calendar_watch.settings, "calendar_webhook_url", "https://example.test/notify")
+    monkeypatch.setattr(calendar_watch.settings, "google_calendar_ids", "work")
+    monkeypatch.setattr(calendar_service, "sync", lambda calendar_id, force=False: None)
+
+    def stop(body):
+        raise OSError("connection reset")
+
+    monkeypatch.setattr(google, "stop", stop)
+
+    # primary is no longer configured, so its channel is stopped and fails
+    manager.ensure_channels()
+
+    assert [watch["calendar_id"] for watch in google.watched] == ["primary", "work"]
+    assert calendar_service.pushed_calendars == {"work"}
@@ -0,0 +1,40 @@
+"""Stored events are served while the Google token cannot be refreshed."""
+
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from benchmarks.stubs import StubCalendarClient
+
+EVENT = {
+    "id": "offline-event",
+    "summary": "Dentist",
+    "start": {"dateTime": f"{datetime.utcnow() + timedelta(days=1):%Y-%m-%dT%H:%M:%S}Z"},
+    "end": {"dateTime": f"{datetime.utcnow() + timedelta(days=1, hours=1):%Y-%m-%dT%H:%M:%S}Z"},
+}
+
+
+def test_expired_token_serves_stored_events(calendar_service, monkeypatch):
+    from app.main import app
+
+    client = TestClient(app)
+    monkeypatch.setattr(calendar_service, "_get_service", lambda: StubCalendarClient([EVENT]))
+    assert [event["id"] for event in client.get("/api/calendar/events").json()["events"]] == ["offline-event"]
+
+    # The access token expires and Google can't be reached to refresh it
+    monkeypatch.delattr(calendar_service, "_get_service")
+    monkeypatch.setattr(calendar_service.credentials, "expiry", datetime.utcnow() - timedelta(minutes=1))
+
+    def refresh_if_needed():
+        raise OSError("Google is unreachable")
+
+    monkeypatch.setattr(calendar_service.credential_manager, "refresh_if_needed", refresh_if_needed)
+    calendar_service.cache.invalidate()
+    calendar_service._last_sync.clear()
+
+    response = client.get("/api/calendar/events")
+
+    assert response.status_code == 200
+    assert response.json()["calendar_connected"]
+    assert [event["id"] for event in response.json()["events"]] == ["offline-event"]
+    assert calendar_service.sync_errors["primary"] == "Google is unreachable"
@@ -0,0 +1,84 @@
+"""The dashboard snapshot, built from a stub calendar through DashboardService.get."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import orjson
+
+from benchmarks.stubs import StubCalendarClient
+
+
+def _timed(when: datetime) -> dict:
+    return {"dateTime": f"{when:%Y-%m-%dT%H:%M:%S}Z"}
+
+
+def _items(now: datetime) -> list[dict]:
+    return [
+        {
+            "id": "dashboard-timed",
+            "summary": "Standup",
+            "start": _timed(now - timedelta(minutes=30)),
+            "end": _timed(now + timedelta(minutes=30)),
+        },
+        {
+            "id": "dashboard-all-day",
+            "summary": "Holiday",
+            "start": {"date": f"{now:%Y-%m-%d}"},
+            "end": {"date": f"{now + timedelta(days=1):%Y-%m-%d}"},
+        },
+        {
+            "id": "dashboard-daily",
+            "summary": "Walk",
+            "start": {**_timed(now - timedelta(days=10, hours=1)), "timeZone": "UTC"},
+            "end": {**_timed(now - timedelta(days=10) + timedelta(hours=1)), "timeZone": "UTC"},
+            "recurrence": ["RRULE:FREQ=DAILY"],
+        },
+    ]
+
+
+def test_snapshot_holds_timed_all_day_and_recurring_events(calendar_service, monkeypatch):
+    from app.services.dashboard import DashboardService
+
+    client = StubCalendarClient(_items(datetime.utcnow()))
+    monkeypatch.setattr(calendar_service, "_get_service", lambda: client)
+
+    body, _ = asyncio.run(DashboardService(calendar_service).get())
+    snapshot = orjson.loads(body)
+
+    today = {event["id"] for event in snapshot["today"]}
+    upcoming = {event["id"] for event in snapshot["upcoming"]}
+    assert snapshot["calendar_connected"]
+    assert {"dashboard-timed", "dashboard-all-day"} <= today
+    assert "dashboard-timed" in upcoming
+    assert any(event_id.startswith("dashboard-daily_") for event_id in today)
+    assert any(event_id.startswith("dashboard-daily_") for event_id in upcoming)
+
+
+def test_calendar_rebuild_is_announced(calendar_service, monkeypatch):
+    from app.services import dashboard
+    from app.services.todo_repository import TodoRepository
+    from app.services.write_queue import write_queue
+
+    published = []
+    monkeypatch.setattr(dashboard.event_bus, "publish", lambda type, data=None: published.append(type))
+    client = StubCalendarClient(_items(datetime.utcnow())[:1])
+    monkeypatch.setattr(calendar_service, "_get_service", lambda: client)
+    service = dashboard.DashboardService(calendar_service)
+
+    async def rebuilds():
+        await service.get()
+        # Clients apply todo changes from the bus themselves
+        await write_queue.run(lambda db: TodoRepository(db).create("Dashboard todo"))
+        body, _ = await service.get()
+        assert b"Dashboard todo" in body
+        assert published == []
+
+        # The calendar changed behind a sync that already happened
+        client.pages[0][0]["summary"] = "Retro"
+        calendar_service._last_sync.clear()
+        calendar_service.store.clear_sync_token("primary")
+        await service.refresh(reload_events=True)
+
+    asyncio.run(rebuilds())
+
+    assert published == ["dashboard.changed"]
@@ -0,0 +1,65 @@
+"""The single writer against a database locked by someone else."""
+
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+# Milliseconds the writer's connections wait on a lock before giving up
+BUSY_TIMEOUT = 100
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """A write queue on the test database that gives up on locks quickly."""
+    from app.database import apply_sqlite_profile, engine
+    from app.services import write_queue
+
+    monkeypatch.setattr(write_queue.settings, "sqlite_busy_timeout", BUSY_TIMEOUT)
+    monkeypatch.setattr(write_queue, "BEGIN_BACKOFF", 0.1)
+    fast_engine = create_engine(engine.url, connect_args={"check_same_thread": False})
+    apply_sqlite_profile(fast_engine)
+    queue = write_queue.WriteQueue(sessionmaker(bind=fast_engine))
+    yield queue
+    queue.stop()
+    fast_engine.dispose()
+
+
+def _hold_lock(seconds: float) -> threading.Thread:
+    """Hold the database write lock from another connection for seconds."""
+    from app.database import engine
+
+    locked = threading.Event()
+
+    def hold():
+        connection = sqlite3.connect(engine.url.database, isolation_level=None)
+        connection.execute("BEGIN IMMEDIATE")
+        locked.set()
+        threading.Event().wait(seconds)
+        connection.execute("ROLLBACK")
+        connection.close()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    locked.wait()
+    return thread
+
+
+def test_batch_waits_out_a_lock_longer_than_busy_timeout(writes):
+    holder = _hold_lock(0.25)
+    try:
+        result = writes.submit(lambda db: db.execute(text("SELECT 1")).scalar()).result(timeout=5)
+    finally:
+        holder.join()
+    assert result == 1
+
+
+def test_batch_fails_once_retries_run_out(writes):
+    holder = _hold_lock(2.0)
+    try:
+        with pytest.raises(Exception, match="locked"):
+            writes.submit(lambda db: db.execute(text("SELECT 1")).scalar()).result(timeout=5)
+    finally:
+        holder.join()
@@ -1,5 +1,3 @@
-import { useCalendarEvents, useTodayEvents } from '../hooks/useApi';
-
 function formatTime(dateStr) {
   const date = new Date(dateStr);
   return date.toLocaleTimeString('en-US', {
@@ -107,8 +105,8 @@ function DaySection({ dateLabel, events }) {
   );
 }
 
-export default function Calendar() {
-  const { events, calendarConnected, loading, error } = useCalendarEvents();
+export default function Calendar({ dashboard }) {
+  const { upcoming: events, calendarConnected, loading, error } = dashboard;
 
   // Group events by date
   const groupedEvents = events.reduce((groups, event) => {
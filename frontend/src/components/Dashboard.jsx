@@ -1,4 +1,5 @@
 import { useState, useEffect } from 'react';
+import { useDashboard } from '../hooks/useApi';
 import Calendar from './Calendar';
 import TodoList from './TodoList';
 
@@ -81,6 +82,9 @@ function StatusIndicator() {
 }
 
 export default function Dashboard() {
+  // One poll feeds both panels
+  const dashboard = useDashboard();
+
   return (
     <div className="min-h-screen bg-slate-950 p-6">
       <div className="max-w-7xl mx-auto">
@@ -94,12 +98,12 @@ export default function Dashboard() {
         <div className="grid grid-cols-1 lg:grid-cols-2 gap-6" style={{ height: 'calc(100vh - 180px)' }}>
           {/* Calendar Panel */}
           <div className="min-h-[400px]">
-            <Calendar />
+            <Calendar dashboard={dashboard} />
           </div>
 
           {/* Todo Panel */}
           <div className="min-h-[400px]">
-            <TodoList />
+            <TodoList dashboard={dashboard} />
           </div>
         </div>
 
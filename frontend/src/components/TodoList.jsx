@@ -99,8 +99,8 @@ function AddTodoForm({ onAdd }) {
   );
 }
 
-export default function TodoList() {
-  const { todos, loading, error, createTodo, toggleComplete, deleteTodo } = useTodos();
+export default function TodoList({ dashboard }) {
+  const { todos, loading, error, createTodo, toggleComplete, deleteTodo } = useTodos(dashboard);
   const [showCompleted, setShowCompleted] = useState(false);
 
   const pendingTodos = todos.filter((t) => !t.completed);
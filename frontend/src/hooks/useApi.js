@@ -1,11 +1,64 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 
 const API_BASE = '/api';
 
+/**
+ * One shared Server-Sent Events connection for every hook on the page
+ */
+const streamListeners = new Set();
+let streamSource = null;
+
+function openStream() {
+  if (streamSource || typeof EventSource === 'undefined') return;
+  streamSource = new EventSource(`${API_BASE}/stream`);
+  const dispatch = (event) => {
+    const data = event.data ? JSON.parse(event.data) : {};
+    streamListeners.forEach((listener) => listener(event.type, data));
+  };
+  [
+    'todo.created',
+    'todo.updated',
+    'todo.deleted',
+    'calendar.changed',
+    'dashboard.changed',
+    'resync',
+  ].forEach((type) => streamSource.addEventListener(type, dispatch));
+  // Reconnects send Last-Event-ID, and the server answers with a resync
+  // if it no longer holds everything that was missed
+}
+
+function isStreaming() {
+  return streamSource?.readyState === EventSource.OPEN;
+}
+
+/**
+ * Hook for receiving change events pushed by the backend
+ */
+export function useChangeStream(onChange) {
+  const handler = useRef(onChange);
+  handler.current = onChange;
+
+  useEffect(() => {
+    const listener = (type, data) => handler.current(type, data);
+    streamListeners.add(listener);
+    openStream();
+    return () => {
+      streamListeners.delete(listener);
+      if (streamListeners.size === 0 && streamSource) {
+        streamSource.close();
+        streamSource = null;
+      }
+    };
+  }, []);
+}
+
 /**
  * Custom hook for fetching data with auto-refresh
+ *
+ * With pauseWhileStreaming, polls are skipped while the change stream is
+ * connected, since pushed events keep the data current.
  */
-export function useApiData(endpoint, refreshInterval = 60000) {
+export function useApiData(endpoint, refreshInterval = 60000, { pauseWhileStreaming = false } = {}) {
   const [data, setData] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
@@ -30,19 +83,63 @@ export function useApiData(endpoint, refreshInterval = 60000) {
     fetchData();
 
     // Set up auto-refresh
-    const interval = setInterval(fetchData, refreshInterval);
+    const interval = setInterval(() => {
+      if (pauseWhileStreaming && isStreaming()) return;
+      fetchData();
+    }, refreshInterval);
 
     return () => clearInterval(interval);
-  }, [fetchData, refreshInterval]);
+  }, [fetchData, refreshInterval, pauseWhileStreaming]);
+
+  return { data, loading, error, refetch: fetchData, setData };
+}
+
+/**
+ * Hook for the whole dashboard in one poll: todos and upcoming events
+ *
+ * Todo changes pushed over the stream are applied in place; resyncs and
+ * dashboard.changed, sent whenever the server rebuilds the calendar part
+ * (on push notifications, at midnight and when stale events are
+ * reloaded), refetch the snapshot. Polling stops while the stream is
+ * connected.
+ */
+export function useDashboard() {
+  const { data, loading, error, refetch, setData } = useApiData('/dashboard', 60000, {
+    pauseWhileStreaming: true,
+  });
+
+  const setTodos = useCallback(
+    (update) => setData((current) => current && { ...current, todos: update(current.todos) }),
+    [setData]
+  );
+
+  useChangeStream((type, payload) => {
+    if (type === 'resync' || type === 'dashboard.changed') {
+      refetch();
+    } else if (type === 'todo.created') {
+      setTodos((todos) => [payload, ...todos.filter((t) => t.id !== payload.id)]);
+    } else if (type === 'todo.updated') {
+      setTodos((todos) => todos.map((t) => (t.id === payload.id ? payload : t)));
+    } else if (type === 'todo.deleted') {
+      setTodos((todos) => todos.filter((t) => t.id !== payload.id));
+    }
+  });
 
-  return { data, loading, error, refetch: fetchData };
+  return {
+    todos: data?.todos || [],
+    upcoming: data?.upcoming || [],
+    calendarConnected: data?.calendar_connected ?? false,
+    loading,
+    error,
+    refetch,
+  };
 }
 
 /**
- * Hook for todos with CRUD operations
+ * Hook for todos with CRUD operations, over the dashboard's data
  */
-export function useTodos() {
-  const { data: todos, loading, error, refetch } = useApiData('/todos');
+export function useTodos(dashboard) {
+  const { todos, loading, error, refetch } = dashboard;
 
   const createTodo = async (title) => {
     try {
@@ -67,6 +164,11 @@ export function useTodos() {
         headers: { 'Content-Type': 'application/json' },
         body: JSON.stringify(updates),
       });
+      if (response.status === 409) {
+        // Changed elsewhere (e.g. from Telegram) since we loaded it
+        refetch();
+        return false;
+      }
       if (!response.ok) throw new Error('Failed to update todo');
       refetch();
       return true;
@@ -91,11 +193,12 @@ export function useTodos() {
   };
 
   const toggleComplete = async (id, currentStatus) => {
-    return updateTodo(id, { completed: !currentStatus });
+    const todo = todos.find((t) => t.id === id);
+    return updateTodo(id, { completed: !currentStatus, version: todo?.version });
   };
 
   return {
-    todos: todos || [],
+    todos,
     loading,
     error,
     refetch,
@@ -105,33 +208,3 @@ export function useTodos() {
     toggleComplete,
   };
 }
-
-/**
- * Hook for calendar events
- */
-export function useCalendarEvents() {
-  const { data, loading, error, refetch } = useApiData('/calendar/events');
-
-  return {
-    events: data?.events || [],
-    calendarConnected: data?.calendar_connected ?? false,
-    loading,
-    error,
-    refetch,
-  };
-}
-
-/**
- * Hook for today's calendar events
- */
-export function useTodayEvents() {
-  const { data, loading, error, refetch } = useApiData('/calendar/today');
-
-  return {
-    events: data?.events || [],
-    calendarConnected: data?.calendar_connected ?? false,
-    loading,
-    error,
-    refetch,
-  };
-}